@@ -0,0 +1,349 @@
+# ============================================================================
+# benchmarks/codeintelligence_suite.py - Code Intelligence scaling suite
+# ============================================================================
+
+"""
+Headless benchmark suite for the Code Intelligence plugin.
+
+Generates a synthetic repository (size and language mix configurable,
+Python modules importing and calling each other) and measures, on a fresh
+ShardedSymbolDatabase:
+
+- index_cold_s: IndexingThread.run() on an empty index
+- memory_bytes: in-memory search structures after indexing (plus the
+  database file size and the process peak RSS)
+- fuzzy_p50_ms / fuzzy_p99_ms: fuzzy_search latency over random queries
+- references_<frequent|medium|rare>_ms: ReferenceTracker.find_all_references
+  for a name used everywhere, a common base class and a single helper
+- cache_save_s / cache_load_s: save_to_cache(), then reopening the
+  index and load_from_cache() until it is ready
+- index_warm_s: IndexingThread.run() again on the reopened index (nothing
+  changed, every file is skipped by the manifest)
+
+Results are written as JSON (with the git commit) so runs of different
+commits can be compared with --compare.
+
+Usage (from the repository root):
+    python benchmarks/codeintelligence_suite.py [--files 2000] [--mix py=3,php=1,go=1,js=1]
+        [--queries 1000] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ide" / "plugins"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from Codeintelligence.ShardedSymbolDatabase import ShardedSymbolDatabase
+from Codeintelligence.SymbolIndexer import SymbolIndexer
+from Codeintelligence.ReferenceTracker import ReferenceTracker
+
+
+# The plugin module shares its name with the Codeintelligence package
+_spec = importlib.util.spec_from_file_location(
+    "codeintelligence_plugin", ROOT / "ide" / "plugins" / "Codeintelligence.py")
+_plugin = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_plugin)
+IndexingThread = _plugin.IndexingThread
+
+
+# Extension -> (file header, chunk); {n} numbers the chunk, {dep} is the
+# Python module the file imports and {dep_n} its first chunk
+TEMPLATES = {
+    'py': (
+        "from pkg{dep_pkg}.module{dep} import Service{dep_n}, helper_{dep_n}\n\n",
+        "class Service{n}(Base):\n"
+        "    \"\"\"Service number {n}\"\"\"\n"
+        "\n"
+        "    def start(self, timeout=10):\n"
+        "        return self.run(timeout)\n"
+        "\n"
+        "    def run(self, timeout):\n"
+        "        return helper_{dep_n}(timeout, Service{dep_n}().start())\n"
+        "\n"
+        "def helper_{n}(a, b):\n"
+        "    return a + b\n"
+        "\n"
+    ),
+    'php': (
+        "<?php\n",
+        "class Controller{n} {{\n"
+        "    public function index($request) {{ return $this->run($request); }}\n"
+        "    private function run($request) {{ return $request; }}\n"
+        "}}\n"
+        "function route_{n}($path) {{ return $path; }}\n"
+    ),
+    'go': (
+        "package main\n\n",
+        "type Store{n} struct {{\n"
+        "    items []string\n"
+        "}}\n"
+        "func (s *Store{n}) Add(item string) {{ s.items = append(s.items, item) }}\n"
+        "func NewStore{n}() *Store{n} {{ return &Store{n}{{}} }}\n"
+    ),
+    'js': (
+        "",
+        "class Widget{n} extends Base {{\n"
+        "  render() {{\n"
+        "    return this.run(this.props.value);\n"
+        "  }}\n"
+        "}}\n"
+        "\n"
+        "function helper{n}(a, b) {{\n"
+        "  return a + b;\n"
+        "}}\n"
+        "const arrow{n} = async (x) => x * 2;\n"
+    ),
+    'c': (
+        "#include <stdio.h>\n\n",
+        "typedef struct point_{n} {{\n"
+        "    int x;\n"
+        "    int y;\n"
+        "}} point_{n};\n"
+        "\n"
+        "static int run_{n}(int a, int b) {{\n"
+        "    return a + b;\n"
+        "}}\n"
+    ),
+}
+
+FILES_PER_PACKAGE = 100
+
+
+def parse_mix(text: str) -> list:
+    """'py=3,go=1' -> ['py', 'py', 'py', 'go'] (one entry per weight unit)"""
+    kinds = []
+    for part in text.split(','):
+        ext, _, weight = part.partition('=')
+        ext = ext.strip().lstrip('.')
+        if ext not in TEMPLATES:
+            raise SystemExit(f"Unknown language {ext!r} (known: {', '.join(TEMPLATES)})")
+        kinds.extend([ext] * int(weight or 1))
+    return kinds
+
+
+def generate_repo(root: Path, files: int, mix: list, chunks_per_file: int = 20, seed: int = 0) -> list:
+    """
+    Write a synthetic repository
+
+    Args:
+        root: Directory to create it in
+        files: Number of source files
+        mix: Extensions, repeated by weight (see parse_mix)
+        chunks_per_file: Template chunks per file
+        seed: Seed choosing the module each Python file imports
+
+    Returns:
+        Paths of the files written
+    """
+    rng = random.Random(seed)
+    python_modules = [i for i in range(files) if mix[i % len(mix)] == 'py']
+    paths = []
+    for i in range(files):
+        ext = mix[i % len(mix)]
+        header, chunk = TEMPLATES[ext]
+        dep = rng.choice(python_modules) if python_modules else i
+        names = dict(dep=dep, dep_pkg=dep // FILES_PER_PACKAGE, dep_n=dep * chunks_per_file)
+        directory = root / f"pkg{i // FILES_PER_PACKAGE}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"module{i}.{ext}"
+        body = ''.join(chunk.format(n=i * chunks_per_file + k, **names) for k in range(chunks_per_file))
+        path.write_text(header.format(**names) + body, encoding='utf-8')
+        paths.append(str(path))
+    for directory in root.iterdir():
+        (directory / "__init__.py").touch()
+    return paths
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the progress prints of the indexer and database"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def open_database(cache_dir: Path, project: Path) -> ShardedSymbolDatabase:
+    database = ShardedSymbolDatabase(cache_dir)
+    database.set_projects([project])
+    return database
+
+
+def run_indexing(project: Path, database: ShardedSymbolDatabase) -> float:
+    thread = IndexingThread([project], SymbolIndexer(), database)
+    elapsed, _ = timed(thread.run)
+    return elapsed
+
+
+def fuzzy_queries(database: ShardedSymbolDatabase, count: int, seed: int) -> list:
+    """Substrings and initials of random indexed symbol names"""
+    rng = random.Random(seed)
+    names = sorted({s.name for path in database.get_indexed_files()[:200]
+                    for s in database.get_file_symbols(path)})
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        if rng.random() < 0.5 and len(name) > 3:
+            start = rng.randrange(len(name) - 2)
+            queries.append(name[start:start + rng.randint(3, 6)])
+        else:
+            queries.append(''.join(c for c in name if c.isupper() or c.isdigit())[:4] or name[:3])
+    return queries
+
+
+def measure_fuzzy(database: ShardedSymbolDatabase, queries: list) -> dict:
+    latencies = []
+    for query in queries:
+        elapsed, _ = timed(database.fuzzy_search, query, 50)
+        latencies.append(elapsed * 1000)
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'fuzzy_queries': len(latencies),
+        'fuzzy_p50_ms': round(percentiles[49], 4),
+        'fuzzy_p99_ms': round(percentiles[98], 4),
+    }
+
+
+def measure_references(database: ShardedSymbolDatabase, files: int, mix: list, chunks_per_file: int) -> dict:
+    """find_all_references for a frequent, a medium and a rare name"""
+    tracker = ReferenceTracker(database)
+    module = next((i for i in range(files // 2, files) if mix[i % len(mix)] == 'py'), files // 2)
+    names = {
+        'frequent': 'run',
+        'medium': 'Base',
+        'rare': f"helper_{module * chunks_per_file + 1}",
+    }
+    results = {}
+    for label, name in names.items():
+        elapsed, references = timed(tracker.find_all_references, name)
+        results[f'references_{label}_ms'] = round(elapsed * 1000, 3)
+        results[f'references_{label}_hits'] = len(references)
+    return results
+
+
+def directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_suite(args) -> dict:
+    mix = parse_mix(args.mix)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        project = tmp / "project"
+        cache_dir = tmp / "cache"
+        paths = generate_repo(project, args.files, mix, args.chunks, args.seed)
+
+        with quiet():
+            database = open_database(cache_dir, project)
+            database.load_from_cache()
+            results['index_cold_s'] = round(run_indexing(project, database), 3)
+
+        stats = database.get_statistics()
+        results['files_indexed'] = stats['files_indexed']
+        results['symbols'] = stats['total_symbols']
+        results['memory_bytes'] = stats['memory_bytes']
+
+        results.update(measure_fuzzy(database, fuzzy_queries(database, args.queries, args.seed)))
+        results.update(measure_references(database, args.files, mix, args.chunks))
+
+        with quiet():
+            elapsed, _ = timed(database.save_to_cache)
+            results['cache_save_s'] = round(elapsed, 4)
+            database.close()
+        results['database_bytes'] = directory_size(cache_dir)
+
+        with quiet():
+            start = time.perf_counter()
+            database = open_database(cache_dir, project)
+            database.load_from_cache()
+            database.wait_until_ready()
+            results['cache_load_s'] = round(time.perf_counter() - start, 4)
+            results['index_warm_s'] = round(run_indexing(project, database), 3)
+            database.close()
+
+    results['peak_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (
+        1 if sys.platform == 'darwin' else 1024)
+    return {
+        'suite': 'codeintelligence',
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'params': {'files': len(paths), 'mix': args.mix, 'chunks': args.chunks,
+                   'queries': args.queries, 'seed': args.seed},
+        'results': results,
+    }
+
+
+def print_report(report: dict, baseline: dict = None):
+    base = (baseline or {}).get('results', {})
+    header = f"{'metric':<26} {'value':>14}"
+    if baseline:
+        header += f" {'baseline':>14} {'ratio':>7}   (baseline {baseline.get('commit', '?')})"
+    print(header)
+    for key, value in report['results'].items():
+        line = f"{key:<26} {value:>14,}" if isinstance(value, int) else f"{key:<26} {value:>14}"
+        old = base.get(key)
+        if isinstance(old, (int, float)):
+            ratio = f"{value / old:.2f}x" if old else '-'
+            line += f" {old:>14} {ratio:>7}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--files', type=int, default=2000, help="Source files to generate")
+    parser.add_argument('--mix', default='py=3,php=1,go=1,js=1',
+                        help=f"Language weights ({', '.join(TEMPLATES)})")
+    parser.add_argument('--chunks', type=int, default=20, help="Template chunks per file")
+    parser.add_argument('--queries', type=int, default=1000, help="Fuzzy search queries")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='codeintelligence_results.json',
+                        help="JSON file to write the results to")
+    parser.add_argument('--compare', help="Results JSON of an earlier run to compare with")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
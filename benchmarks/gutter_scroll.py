@@ -0,0 +1,102 @@
+# ============================================================================
+# benchmarks/gutter_scroll.py - Gutter repaint throughput while scrolling
+# ============================================================================
+
+"""
+Scroll-FPS benchmark for the editor gutter.
+
+Loads a large synthetic Python file into a CodeEditor, then scrolls through
+it a few lines at a time, forcing a synchronous repaint of the gutter after
+every step. Runs twice:
+
+- cold: GutterRenderer cache is dropped before every frame, so every line
+  number and fold marker is rendered from text again (the pre-cache cost)
+- warm: normal operation, frames are mostly pixmap blits
+
+Usage (from the repository root):
+    QT_QPA_PLATFORM=offscreen python benchmarks/gutter_scroll.py [--lines N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from ide.core.CodeEditor import CodeEditor
+
+
+def make_source(lines: int) -> str:
+    """Synthetic Python module with a fold region every few lines"""
+    chunks = []
+    for i in range(lines // 6):
+        chunks.append(
+            f"class Item{i}:\n"
+            f"    def method_{i}(self, value):\n"
+            f"        if value > {i}:\n"
+            f"            return value - {i}\n"
+            f"        return value\n"
+            f"\n"
+        )
+    return "".join(chunks)
+
+
+def scroll_fps(editor: CodeEditor, frames: int, step: int, cold: bool) -> float:
+    """Scroll `frames` times by `step` lines, return gutter frames per second"""
+    scrollbar = editor.verticalScrollBar()
+    scrollbar.setValue(0)
+    QApplication.processEvents()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        if cold:
+            editor.gutter_renderer.invalidate()
+        scrollbar.setValue(scrollbar.value() + step)
+        editor.line_number_area.repaint()
+    elapsed = time.perf_counter() - start
+    return frames / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=60000)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--step", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(make_source(args.lines))
+        path = f.name
+
+    try:
+        editor = CodeEditor(path)
+        editor.set_code_folding_enabled(True)
+        editor.resize(1000, 900)
+        editor.show()
+        QApplication.processEvents()
+
+        regions = len(editor.folding_manager.regions)
+        print(f"lines={editor.blockCount()} fold_regions={regions} frames={args.frames} step={args.step}")
+
+        cold = scroll_fps(editor, args.frames, args.step, cold=True)
+        warm = scroll_fps(editor, args.frames, args.step, cold=False)
+
+        print(f"cold (re-render every frame): {cold:8.1f} fps")
+        print(f"warm (cached pixmaps)       : {warm:8.1f} fps")
+        print(f"speedup                     : {warm / cold:8.2f}x")
+    finally:
+        os.unlink(path)
+
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
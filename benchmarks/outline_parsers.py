@@ -0,0 +1,143 @@
+# ============================================================================
+# benchmarks/outline_parsers.py - Regex outline parser scaling
+# ============================================================================
+
+"""
+Scaling benchmark for the regex outline parsers.
+
+Parses synthetic C and JavaScript files of increasing size with:
+
+- legacy: one re.finditer() per pattern, line = content[:start].count('\\n')
+  (the pre-LineIndex algorithm, quadratic in file size)
+- current: OutlineParser (one scan per pattern + LineIndex bisect)
+
+Time per line should stay flat for "current" while "legacy" grows with the
+file size. Both must find the same symbols; the C and C++ sources include
+functions returning a struct, which match two overlapping patterns.
+
+Usage (from the repository root):
+    python benchmarks/outline_parsers.py [--sizes 2500,5000,10000,20000]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ide.core.OutlineParser import OutlineParser, CParser, CppParser, JavaScriptParser
+
+
+C_CHUNK = (
+    "typedef struct point_{n} {{\n"
+    "    int x;\n"
+    "    int y;\n"
+    "}} point_{n};\n"
+    "\n"
+    "static int add_{n}(int a, int b) {{\n"
+    "    return a + b;\n"
+    "}}\n"
+    "\n"
+    "struct point_{n} make_point_{n}(int x, int y) {{\n"
+    "    return (struct point_{n}){{x, y}};\n"
+    "}}\n"
+    "\n"
+    "int scale_{n}(point_{n} *p, int k) {{\n"
+)
+C_TAIL = "    return p->x * k;\n}\n\n"
+
+CPP_CHUNK = (
+    "struct Vec3_{n} {{\n"
+    "    float x, y, z;\n"
+    "}};\n"
+    "\n"
+    "class Mesh{n} : public Base {{\n"
+    "}};\n"
+    "\n"
+    "struct Vec3_{n} cross_{n}(const Vec3_{n}& a, const Vec3_{n}& b) {{\n"
+)
+CPP_TAIL = "    return a;\n}\n\n"
+
+JS_CHUNK = (
+    "class Widget{n} extends Base {{\n"
+    "  render() {{\n"
+    "    return this.props.value;\n"
+    "  }}\n"
+    "}}\n"
+    "\n"
+    "function helper{n}(a, b) {{\n"
+    "  return a + b;\n"
+    "}}\n"
+    "const arrow{n} = async (x) => x * 2;\n"
+)
+JS_TAIL = "let counter = 0;\n\n"
+
+
+def make_source(chunk: str, tail: str, lines: int) -> str:
+    """Repeat a template until the source has roughly `lines` lines"""
+    per_chunk = chunk.count("\n") + tail.count("\n")
+    return "".join(chunk.format(n=i) + tail for i in range(max(1, lines // per_chunk)))
+
+
+def legacy_parse(parser_class, content: str) -> list:
+    """Old algorithm: separate scan per pattern, prefix newline counting"""
+    symbols = []
+    for symbol_type, pattern in parser_class.PATTERNS:
+        for match in re.finditer(pattern, content, re.MULTILINE):
+            name = parser_class.symbol_name(symbol_type, match.groups())
+            if name:
+                symbols.append((content[:match.start()].count('\n') + 1, symbol_type, name))
+    return sorted(symbols)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="2500,5000,10000,20000")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    cases = [
+        ("C", "bench.c", CParser, C_CHUNK, C_TAIL),
+        ("C++", "bench.cpp", CppParser, CPP_CHUNK, CPP_TAIL),
+        ("JS", "bench.js", JavaScriptParser, JS_CHUNK, JS_TAIL),
+    ]
+
+    # Same symbols as the legacy algorithm, overlapping matches included
+    for label, file_name, parser_class, chunk, tail in cases:
+        content = make_source(chunk, tail, 100)
+        current = sorted((s.line, s.type, s.name) for s in OutlineParser.parse(file_name, content))
+        if current != legacy_parse(parser_class, content):
+            sys.exit(f"{label}: OutlineParser symbols differ from the legacy parser")
+    names = {s.name for s in OutlineParser.parse("check.c", C_CHUNK.format(n=0) + C_TAIL)}
+    if not {"point_0", "make_point_0"} <= names:
+        sys.exit("C: struct return type hides the function")
+
+
+    print(f"{'lang':<5}{'lines':>8}{'symbols':>9}{'legacy ms':>12}{'current ms':>12}"
+          f"{'legacy us/line':>16}{'current us/line':>17}")
+    for label, file_name, parser_class, chunk, tail in cases:
+        for size in sizes:
+            content = make_source(chunk, tail, size)
+            lines = content.count("\n")
+            symbols = len(OutlineParser.parse(file_name, content))
+
+            legacy = best_of(lambda: legacy_parse(parser_class, content))
+            current = best_of(lambda: OutlineParser.parse(file_name, content))
+
+            print(f"{label:<5}{lines:>8}{symbols:>9}{legacy * 1e3:>12.1f}{current * 1e3:>12.1f}"
+                  f"{legacy * 1e6 / lines:>16.2f}{current * 1e6 / lines:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# ============================================================================
+# benchmarks/parallel_indexing.py - Process-pool vs single-thread indexing
+# ============================================================================
+
+"""
+Throughput benchmark for workspace symbol indexing.
+
+Generates a synthetic Python/PHP/Go project and indexes it cold into a
+fresh SymbolDatabase with:
+
+- single: one file at a time on the calling thread (the pre-pool
+  IndexingThread loop: read, SymbolIndexer.index_file,
+  extract_identifiers, replace_file)
+- parallel: ParallelIndexer on a spawn process pool, chunked work and
+  batched database merges
+
+Run on a machine with several cores; with one core the pool can only add
+overhead.
+
+Usage (from the repository root):
+    python benchmarks/parallel_indexing.py [--files 5000] [--workers N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ide" / "plugins"))
+
+from Codeintelligence.SymbolDatabase import SymbolDatabase
+from Codeintelligence.SymbolIndexer import SymbolIndexer
+from Codeintelligence.IndexManifest import read_file_state
+from Codeintelligence.IdentifierIndex import extract_identifiers
+from Codeintelligence.ParallelIndexer import ParallelIndexer
+
+
+PY_CHUNK = (
+    "class Service{n}(Base):\n"
+    "    \"\"\"Service number {n}\"\"\"\n"
+    "\n"
+    "    def start(self, timeout=10):\n"
+    "        return self.run(timeout)\n"
+    "\n"
+    "    def stop(self, *args, **kwargs):\n"
+    "        pass\n"
+    "\n"
+    "def helper_{n}(a, b):\n"
+    "    return a + b\n"
+    "\n"
+)
+
+PHP_CHUNK = (
+    "class Controller{n} {{\n"
+    "    public function index($request) {{ return $request; }}\n"
+    "    private function guard() {{ return true; }}\n"
+    "}}\n"
+    "function route_{n}($path) {{ return $path; }}\n"
+)
+
+GO_CHUNK = (
+    "type Store{n} struct {{\n"
+    "    items []string\n"
+    "}}\n"
+    "func (s *Store{n}) Add(item string) {{ s.items = append(s.items, item) }}\n"
+    "func NewStore{n}() *Store{n} {{ return &Store{n}{{}} }}\n"
+)
+
+
+def generate_project(root: Path, files: int, chunks_per_file: int = 20):
+    """Write a project with a 3:1:1 mix of Python, PHP and Go files"""
+    kinds = [('.py', PY_CHUNK, ''), ('.py', PY_CHUNK, ''), ('.py', PY_CHUNK, ''),
+             ('.php', PHP_CHUNK, '<?php\n'), ('.go', GO_CHUNK, 'package main\n\n')]
+    paths = []
+    for i in range(files):
+        suffix, chunk, header = kinds[i % len(kinds)]
+        directory = root / f"pkg{i // 100}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"module{i}{suffix}"
+        body = ''.join(chunk.format(n=i * chunks_per_file + k) for k in range(chunks_per_file))
+        path.write_text(header + body, encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+
+def run_single(paths, cache_dir: Path) -> float:
+    database = SymbolDatabase(cache_dir)
+    indexer = SymbolIndexer()
+    start = time.perf_counter()
+    for path in paths:
+        content, state = read_file_state(path, SymbolIndexer.VERSION)
+        symbols, imports = indexer.parse_file(path, content)
+        database.replace_file(path, symbols, state, extract_identifiers(content), imports)
+    return time.perf_counter() - start
+
+
+def run_parallel(paths, cache_dir: Path, workers: int) -> float:
+    database = SymbolDatabase(cache_dir)
+    indexer = ParallelIndexer(database, SymbolIndexer.VERSION, max_workers=workers)
+    start = time.perf_counter()
+    indexer.run((path, None) for path in paths)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=ParallelIndexer.default_workers())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = generate_project(tmp / "project", args.files)
+        (tmp / "single").mkdir()
+        (tmp / "parallel").mkdir()
+
+        single = run_single(paths, tmp / "single")
+        parallel = run_parallel(paths, tmp / "parallel", args.workers)
+
+    print(f"{'mode':<10} {'files':>7} {'seconds':>9} {'files/s':>9}")
+    print(f"{'single':<10} {len(paths):>7} {single:>9.2f} {len(paths) / single:>9.0f}")
+    print(f"{'parallel':<10} {len(paths):>7} {parallel:>9.2f} {len(paths) / parallel:>9.0f}"
+          f"   ({args.workers} workers, {single / parallel:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# ============================================================================
+# benchmarks/symbol_memory.py - SymbolInfo memory per 100k symbols
+# ============================================================================
+
+"""
+Memory benchmark for SymbolInfo objects.
+
+Builds symbols the way SymbolDatabase does when it reads rows back (every
+row brings its own copy of the file path and parent strings) and measures
+the allocated bytes with tracemalloc:
+
+- legacy: the pre-__slots__ SymbolInfo (__dict__, fresh empty lists per
+  attribute, docstring held in memory, stored qualified_name)
+- current: SymbolInfo (__slots__, interned strings, shared empty tuples,
+  docstring deferred to the store)
+
+Usage (from the repository root):
+    python benchmarks/symbol_memory.py [--symbols 100000] [--files 1000]
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ide" / "plugins"))
+
+from Codeintelligence.SymbolInfo import SymbolInfo
+
+
+class LegacySymbolInfo:
+    """SymbolInfo as it was before the compact layout"""
+
+    def __init__(self, name, symbol_type, file_path, line, column=0, **kwargs):
+        self.name = name
+        self.type = symbol_type
+        self.file_path = file_path
+        self.line = line
+        self.column = column
+        self.parent = kwargs.get('parent')
+        self.children = kwargs.get('children', [])
+        self.parameters = kwargs.get('parameters', [])
+        self.decorators = kwargs.get('decorators', [])
+        self.docstring = kwargs.get('docstring')
+        self.bases = kwargs.get('bases', [])
+        self.references = []
+        self.qualified_name = f"{self.parent}.{self.name}" if self.parent else self.name
+
+
+def copy(text):
+    """A new string object with the same value, like a fresh database row"""
+    return (text + '.')[:-1] if text is not None else None
+
+
+def rows(count: int, files: int):
+    """Synthetic rows: a class per 10 symbols, methods with parameters"""
+    per_file = max(1, count // files)
+    for i in range(count):
+        file_path = f"/home/user/projects/app/src/package{i // per_file // 50}/module{i // per_file}.py"
+        if i % 10 == 0:
+            yield dict(name=f"Service{i}", symbol_type='class', file_path=copy(file_path),
+                       line=i % per_file + 1, column=0, parent=None, children=None,
+                       parameters=None, decorators=None, bases=['Base'],
+                       docstring=f"Service number {i}.\n\nHandles requests for the module.")
+        else:
+            yield dict(name=f"handle_{i % 40}", symbol_type=copy('method'),
+                       file_path=copy(file_path), line=i % per_file + 1, column=4,
+                       parent=copy(f"Service{i - i % 10}"), children=None,
+                       parameters=['self', 'request'] if i % 2 else ['self'],
+                       decorators=None, bases=None,
+                       docstring="Handle a request." if i % 3 == 0 else None)
+
+
+def measure(factory, count: int, files: int):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    symbols = [factory(**row) for row in rows(count, files)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, symbols
+
+
+def build_legacy(**row):
+    for key in ('children', 'parameters', 'decorators', 'bases'):
+        if row[key] is None:
+            row[key] = []
+    return LegacySymbolInfo(**row)
+
+
+def build_current(**row):
+    docstring = row.pop('docstring')
+    symbol = SymbolInfo(**row)
+    if docstring:
+        # SymbolDatabase defers the load to the store
+        symbol.defer_docstring(lambda: docstring)
+    return symbol
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--symbols', type=int, default=100_000)
+    parser.add_argument('--files', type=int, default=1000)
+    args = parser.parse_args()
+
+    results = []
+    for label, factory in (('legacy', build_legacy), ('current', build_current)):
+        size, symbols = measure(factory, args.symbols, args.files)
+        results.append((label, size))
+        del symbols
+
+    scale = 100_000 / args.symbols
+    legacy = results[0][1]
+    print(f"{'layout':<10} {'symbols':>9} {'MB/100k':>9} {'bytes/symbol':>13}")
+    for label, size in results:
+        print(f"{label:<10} {args.symbols:>9} {size * scale / 1e6:>9.1f} "
+              f"{size / args.symbols:>13.0f}   ({size / legacy:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,12 +12,14 @@ from PyQt6.QtGui import (
     QFontMetricsF,
     QTextCursor
 )
-from PyQt6.QtCore import Qt, QRect, QSize
+from PyQt6.QtCore import Qt, QRect, QSize, pyqtSignal
 
 from ide.core.SyntaxHighlighter import PythonHighlighter, PhpHighlighter, IniHighlighter
 from ide.core.SettingDescriptor import SettingsProvider, SettingDescriptor, SettingType
 from ide.core.CodeFolding import CodeFoldingManager
+from ide.core.GutterRenderer import GutterRenderer
 from ide.core.FileMonitor import FileMonitor
+from ide.core.CompletionPopup import CompletionPopup
 
 """
 Main Code Editor Class
@@ -28,6 +30,11 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
     Main Code Editor Class
     A custom QTextEdit widget with enhanced features for code editing.
     """
+
+    # Ctrl+click on a word / typing an identifier (connected to the plugin
+    # hooks by Workspace)
+    definition_requested = pyqtSignal()
+    completion_requested = pyqtSignal()
     
     # =============================================================================
     # Settings Descriptors - Define what settings CodeEditor uses
@@ -138,12 +145,16 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
         self.show_line_numbers = show_line_numbers
         self.gutter_width      = gutter_width
         self.tab_width         = tab_width
+        self.folding_enabled   = True
+        self.show_column_marker     = True
+        self.column_marker_position = 80
     
         # Track extra selections separately to avoid conflicts
         self.current_line_selection = None
         self.find_replace_selections = []
     
         # Line number area
+        self.gutter_renderer = GutterRenderer(self)
         self.line_number_area = LineNumberArea(self) if show_line_numbers else None
     
         # Column marker (NEW!)
@@ -151,6 +162,9 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
         self.column_marker.setGeometry(self.viewport().geometry())
         self.column_marker.show()
     
+        # Completions offered by plugins while typing
+        self.completion_popup = CompletionPopup(self)
+    
         # Connect signals
         if self.line_number_area:
             self.blockCountChanged.connect(self.update_line_number_area_width)
@@ -190,6 +204,45 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
         # This allows plugins to hook into typing
         pass
 
+    # =============================================================================
+    # Settings
+    # =============================================================================
+
+    # Setting key -> setter, applied only when that key actually changes
+    SETTING_HANDLERS = {
+        'editor_font_size': 'set_font_size',
+        'tab_width': 'set_tab_width',
+        'show_line_numbers': 'set_show_line_numbers',
+        'gutter_width': 'set_gutter_width',
+        'enable_code_folding': 'set_code_folding_enabled',
+        'show_column_marker': 'set_show_column_marker',
+        'column_marker_position': 'set_column_marker_position',
+    }
+
+    def bind_settings(self, settings_manager):
+        """
+        Apply the current settings and follow later changes.
+
+        The connection is dropped automatically when the editor is destroyed.
+
+        Args:
+            settings_manager: SettingsManager publishing settings snapshots
+        """
+        settings_manager.settings_changed.connect(self.apply_settings_snapshot)
+        self.apply_settings_snapshot(settings_manager.snapshot)
+
+    def apply_settings_snapshot(self, snapshot, changed=None):
+        """
+        Update local fields from a settings snapshot.
+
+        Args:
+            snapshot: SettingsSnapshot
+            changed: Keys that changed (None = apply everything present)
+        """
+        for key, setter in self.SETTING_HANDLERS.items():
+            if key in snapshot and (changed is None or key in changed):
+                getattr(self, setter)(snapshot[key])
+
     # =============================================================================
     # Line Number Area
     # =============================================================================
@@ -265,6 +318,8 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
 
     def set_gutter_width(self, width):
         """Set the gutter width and update display"""
+        if width == self.gutter_width:
+            return
         self.gutter_width = width
         self.update_line_number_area_width(0)
         if self.line_number_area:
@@ -272,6 +327,8 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
 
     def set_show_line_numbers(self, show):
         """Toggle line numbers display"""
+        if show == self.show_line_numbers:
+            return
         self.show_line_numbers = show
 
         if show and not self.line_number_area:
@@ -279,6 +336,8 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
             self.blockCountChanged.connect(self.update_line_number_area_width)
             self.updateRequest.connect(self.update_line_number_area)
             self.line_number_area.show()
+        elif show:
+            self.line_number_area.show()
         elif not show and self.line_number_area:
             self.line_number_area.hide()
 
@@ -287,6 +346,8 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
     def set_font_size(self, size):
         """Set font size and update display"""
         font = self.font()
+        if font.pointSize() == size:
+            return
         font.setPointSize(size)
         self.setFont(font)
 
@@ -296,12 +357,14 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
             QFontMetricsF(font).horizontalAdvance(' ') * tab_width
         )
 
+        self.gutter_renderer.invalidate()
         self.update_line_number_area_width(0)
         if self.line_number_area:
             self.line_number_area.update()
 
     def set_tab_width(self, width):
         """Set tab width and update display"""
+        self.tab_width = width
         self.setTabStopDistance(
             QFontMetricsF(self.font()).horizontalAdvance(' ') * width
         )
@@ -339,6 +402,7 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
         Args:
             show: Boolean to show/hide the marker
         """
+        self.show_column_marker = show
         if hasattr(self, 'column_marker'):
             if show:
                 self.column_marker.show()
@@ -352,6 +416,7 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
         Args:
             position: Column number (e.g., 80, 100, 120)
         """
+        self.column_marker_position = position
         if hasattr(self, 'column_marker'):
             self.column_marker.update()  # Trigger repaint
 
@@ -362,47 +427,9 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
     def line_number_area_paint_event(self, event):
         """
         Paint line numbers and fold markers.
-        Now with proper width calculation for any number of digits.
+        Delegates to the GutterRenderer, which blits cached pixmaps.
         """
-        painter = QPainter(self.line_number_area)
-        painter.fillRect(event.rect(), QColor("#313335"))
-        
-        block = self.firstVisibleBlock()
-        
-        while block.isValid():
-            where_to_draw = self.blockBoundingGeometry(block).translated(self.contentOffset())
-            
-            if where_to_draw.top() > event.rect().bottom():
-                break
-            
-            if block.isVisible():
-                line_number = block.blockNumber() + 1
-                
-                # Draw line number
-                painter.setPen(QColor("#606366"))
-                
-                # Calculate available width for text (total width - fold marker space - padding)
-                available_width = self.line_number_area.width() - 16 - 3
-                
-                painter.drawText(
-                    16,  # Start after fold markers (16px)
-                    int(where_to_draw.top()),
-                    available_width,  # Use all available space
-                    self.fontMetrics().height(),
-                    Qt.AlignmentFlag.AlignRight,
-                    str(line_number)
-                )
-                
-                # Draw fold marker
-                if self._is_folding_enabled():
-                    self.folding_manager.draw_fold_marker(
-                        painter,
-                        block.blockNumber(),
-                        int(where_to_draw.top()),
-                        self.fontMetrics().height()
-                    )
-            
-            block = block.next()
+        self.gutter_renderer.paint(event)
 
     def highlight_current_line(self):
         """Highlight the current line - works with extra selections"""
@@ -822,7 +849,26 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
 
         cursor.endEditBlock()
 
+    def mouseReleaseEvent(self, event):
+        """Ctrl+click asks plugins for the definition of the clicked word"""
+        super().mouseReleaseEvent(event)
+        if (event.button() == Qt.MouseButton.LeftButton
+                and event.modifiers() & Qt.KeyboardModifier.ControlModifier
+                and not self.textCursor().hasSelection()):
+            self.definition_requested.emit()
+
+    def mousePressEvent(self, event):
+        self.hide_completions()
+        super().mousePressEvent(event)
+
+    def focusOutEvent(self, event):
+        self.hide_completions()
+        super().focusOutEvent(event)
+
     def keyPressEvent(self, event: QKeyEvent):
+        if self.completion_popup.isVisible() and self._completion_key(event):
+            return
+
         if event.key() == Qt.Key.Key_Tab and not event.modifiers():
             cursor = self.textCursor()
 
@@ -843,6 +889,74 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
             return
 
         super().keyPressEvent(event)
+        self._update_completion(event)
+
+    # =============================================================================
+    # Completion
+    # =============================================================================
+
+    def _completion_key(self, event: QKeyEvent) -> bool:
+        """Handle a key meant for the completion popup; True if consumed"""
+        key = event.key()
+        if key in (Qt.Key.Key_Up, Qt.Key.Key_Down):
+            self.completion_popup.move_selection(-1 if key == Qt.Key.Key_Up else 1)
+            return True
+        if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter, Qt.Key.Key_Tab) and not event.modifiers():
+            self.accept_completion()
+            return True
+        if key == Qt.Key.Key_Escape:
+            self.hide_completions()
+            return True
+        return False
+
+    def _update_completion(self, event: QKeyEvent):
+        """Ask plugins for completions after typing part of an identifier"""
+        text = event.text()
+        modifiers = event.modifiers() & ~Qt.KeyboardModifier.ShiftModifier
+        typed = bool(text) and (text.isalnum() or text in '_.')
+        if not modifiers and (typed or (event.key() == Qt.Key.Key_Backspace
+                                        and self.completion_popup.isVisible())):
+            self.completion_requested.emit()
+        elif text or event.key() not in (Qt.Key.Key_Shift, Qt.Key.Key_Control, Qt.Key.Key_Alt):
+            self.hide_completions()
+
+    def _word_before_cursor(self) -> str:
+        cursor = self.textCursor()
+        text = cursor.block().text()[:cursor.positionInBlock()]
+        start = len(text)
+        while start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+            start -= 1
+        return text[start:]
+
+    def show_completions(self, prefix: str, items):
+        """
+        Show completions for the identifier before the cursor
+
+        Args:
+            prefix: Typed text the items complete; ignored if the user has
+                typed on since
+            items: (name, kind) pairs, best first
+        """
+        if not items or prefix != self._word_before_cursor() or not self.hasFocus():
+            self.hide_completions()
+            return
+        self.completion_popup.show_items(prefix, items)
+
+    def hide_completions(self):
+        """Close the completion popup"""
+        self.completion_popup.hide()
+
+    def accept_completion(self):
+        """Replace the identifier before the cursor with the selected completion"""
+        name = self.completion_popup.current_name()
+        self.hide_completions()
+        if not name:
+            return
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.Left, QTextCursor.MoveMode.KeepAnchor,
+                            len(self._word_before_cursor()))
+        cursor.insertText(name)
+        self.setTextCursor(cursor)
 
     # =============================================================================
     # Duplicate Line
@@ -916,14 +1030,23 @@ class CodeEditor(QPlainTextEdit, SettingsProvider):
                 self.line_number_area.update()
     
     def _is_folding_enabled(self):
-        """Check if code folding is enabled in settings"""
-        # Walk up parent tree to find settings
-        parent = self.parent()
-        while parent is not None:
-            if hasattr(parent, 'settings_manager'):
-                return parent.settings_manager.get('enable_code_folding', True)
-            parent = parent.parent()
-        return True
+        """Check if code folding is enabled (pushed in by bind_settings)"""
+        return self.folding_enabled
+
+    def set_code_folding_enabled(self, enabled):
+        """Enable/disable code folding and refresh the gutter"""
+        enabled = bool(enabled)
+        if enabled == self.folding_enabled:
+            return
+
+        self.folding_enabled = enabled
+        if enabled:
+            self.folding_manager.update_regions()
+        else:
+            self.folding_manager.unfold_all()
+
+        if self.line_number_area:
+            self.line_number_area.update()
     
 
 
@@ -1035,13 +1158,11 @@ class ColumnMarker(QWidget):
         Args:
             event: The QPaintEvent
         """
-        # Get settings from editor's parent workspace
-        settings = self._get_settings()
-        
-        if not settings.get('show_column_marker', True):
+        # Settings are kept on the editor by bind_settings()
+        if not self.editor.show_column_marker:
             return
         
-        column_position = settings.get('column_marker_position', 80)
+        column_position = self.editor.column_marker_position
         
         # Calculate x position based on font metrics
         font_metrics = QFontMetricsF(self.editor.font())
@@ -1061,23 +1182,3 @@ class ColumnMarker(QWidget):
             x_position,
             self.editor.viewport().height()
         )
-    
-    def _get_settings(self):
-        """
-        Get settings from the workspace.
-        
-        Returns:
-            dict: Settings dictionary
-        """
-        # Walk up parent tree to find workspace with settings_manager
-        parent = self.editor.parent()
-        while parent is not None:
-            if hasattr(parent, 'settings_manager'):
-                return parent.settings_manager.settings
-            parent = parent.parent()
-        
-        # Fallback to defaults
-        return {
-            'show_column_marker': True,
-            'column_marker_position': 80
-        }
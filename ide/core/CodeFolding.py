@@ -17,10 +17,13 @@ FIXES:
 - Fixed line number painting to skip hidden blocks
 """
 
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Tuple, Set, Optional
+from typing import Dict, Iterable, List, Tuple, Set, Optional
 import re
 
+from ide.core.ParseCache import get_parse_cache
+
 
 @dataclass
 class FoldRegion:
@@ -36,6 +39,106 @@ class FoldRegion:
         return self.start_line < line <= self.end_line
 
 
+class _IntervalNode:
+    """
+    Node of a centered interval tree over fold regions.
+
+    Each node keeps the regions that span its center point twice: sorted by
+    start line (ascending) and by end line (descending), so a stabbing query
+    only touches the regions that actually contain the line plus one
+    comparison per tree level.
+    """
+
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+    def __init__(self, regions: List[FoldRegion]):
+        endpoints = sorted(p for r in regions for p in (r.start_line, r.end_line))
+        self.center = endpoints[len(endpoints) // 2]
+
+        here, left, right = [], [], []
+        for region in regions:
+            if region.end_line < self.center:
+                left.append(region)
+            elif region.start_line > self.center:
+                right.append(region)
+            else:
+                here.append(region)
+
+        self.by_start = sorted(here, key=lambda r: r.start_line)
+        self.by_end = sorted(here, key=lambda r: r.end_line, reverse=True)
+        self.left = _IntervalNode(left) if left else None
+        self.right = _IntervalNode(right) if right else None
+
+    def stab(self, line: int, out: List[FoldRegion]):
+        """Collect every region whose body contains line"""
+        node = self
+        while node is not None:
+            if line <= node.center:
+                # All regions here end at or after center >= line
+                for region in node.by_start:
+                    if region.start_line >= line:
+                        break
+                    out.append(region)
+                node = node.left if line < node.center else None
+            else:
+                # All regions here start at or before center < line
+                for region in node.by_end:
+                    if region.end_line < line:
+                        break
+                    out.append(region)
+                node = node.right
+
+
+class FoldRegionIndex:
+    """
+    Lookup structure over the fold regions of one document.
+
+    - start-line dict for the gutter (marker painting and hit testing)
+    - centered interval tree for "which regions contain this line"
+    - level-sorted list for fold_level()
+
+    The index is rebuilt once per parse; every query afterwards is
+    independent of the total number of regions in the file.
+    """
+
+    def __init__(self, regions: Iterable[FoldRegion] = ()):
+        regions = list(regions)
+
+        # Several brace regions may open on the same line - the parser's
+        # first one wins, matching the old linear scan.
+        self.by_start: Dict[int, FoldRegion] = {}
+        for region in regions:
+            self.by_start.setdefault(region.start_line, region)
+
+        self._by_level = sorted(regions, key=lambda r: r.level)
+        self._levels = [r.level for r in self._by_level]
+        self._tree = _IntervalNode(regions) if regions else None
+
+    def at_line(self, line: int) -> Optional[FoldRegion]:
+        """Region that starts at the given line, if any"""
+        return self.by_start.get(line)
+
+    def containing(self, line: int) -> List[FoldRegion]:
+        """Regions whose body contains line, outermost first"""
+        found: List[FoldRegion] = []
+        if self._tree is not None:
+            self._tree.stab(line, found)
+        found.sort(key=lambda r: (r.start_line, -r.end_line))
+        return found
+
+    def innermost(self, line: int) -> Optional[FoldRegion]:
+        """Region starting at line, or else the closest one enclosing it"""
+        region = self.at_line(line)
+        if region:
+            return region
+        enclosing = self.containing(line)
+        return enclosing[-1] if enclosing else None
+
+    def up_to_level(self, level: int) -> List[FoldRegion]:
+        """Regions with level <= the given level"""
+        return self._by_level[:bisect_right(self._levels, level)]
+
+
 class CodeFoldingParser:
     """
     Parses code to detect foldable regions.
@@ -273,6 +376,7 @@ class CodeFoldingManager:
     def __init__(self, editor):
         self.editor = editor
         self.regions: List[FoldRegion] = []
+        self.index = FoldRegionIndex()
         self.folded_regions: Set[Tuple[int, int]] = set()
         self.parser = None
         self.fold_marker_width = 14
@@ -301,9 +405,13 @@ class CodeFoldingManager:
             language = 'python'
         
         self.parser = CodeFoldingParser(language)
-        text = self.editor.toPlainText()
-        self.regions = self.parser.parse(text)
-        
+        result = get_parse_cache().for_editor(self.editor)
+        self.set_regions(result.fold_regions(language))
+
+    def set_regions(self, regions: List[FoldRegion]):
+        """Install a freshly parsed region list and rebuild the lookup index"""
+        self.regions = regions
+        self.index = FoldRegionIndex(regions)
         self._restore_fold_state()
     
     def toggle_fold_at_line(self, line_number: int):
@@ -321,6 +429,22 @@ class CodeFoldingManager:
             else:
                 self.fold_region(region)
     
+    def toggle_fold_around_line(self, line_number: int):
+        """
+        Toggle the region starting at a line, or the innermost region
+        enclosing it (used for keyboard folding from anywhere in a block).
+
+        Args:
+            line_number: Line number (0-based)
+        """
+        region = self.index.innermost(line_number)
+
+        if region:
+            if region.is_folded:
+                self.unfold_region(region)
+            else:
+                self.fold_region(region)
+
     def fold_region(self, region: FoldRegion):
         """Fold a region (hide its contents)"""
         if region.is_folded:
@@ -377,73 +501,17 @@ class CodeFoldingManager:
     
     def fold_level(self, level: int):
         """Fold all regions at or above a certain level"""
-        for region in self.regions:
-            if region.level <= level and not region.is_folded:
+        for region in self.index.up_to_level(level):
+            if not region.is_folded:
                 self.fold_region(region)
     
     def _find_region_at_line(self, line_number: int) -> Optional[FoldRegion]:
         """Find a region that starts at the given line"""
-        for region in self.regions:
-            if region.start_line == line_number:
-                return region
-        return None
+        return self.index.at_line(line_number)
     
     def _restore_fold_state(self):
         """Restore fold state after reparsing"""
         for region in self.regions:
             key = (region.start_line, region.end_line)
             if key in self.folded_regions:
-                region.is_folded = True
-    
-    def get_fold_marker_rect(self, line_number: int, top: int, height: int) -> Optional[Tuple[int, int, int, int]]:
-        """
-        Get the rectangle for a fold marker at a line.
-        
-        Returns:
-            Tuple of (x, y, width, height) or None if no marker at this line
-        """
-        region = self._find_region_at_line(line_number)
-        if not region:
-            return None
-        
-        x = 2
-        y = top + (height - 12) // 2
-        return (x, y, 12, 12)
-    
-    def draw_fold_marker(self, painter, line_number: int, top: int, height: int):
-        """
-        Draw a fold marker for a line.
-        
-        Args:
-            painter: QPainter instance
-            line_number: Line number (0-based)
-            top: Y position of the line
-            height: Height of the line
-        """
-        from PyQt6.QtGui import QColor, QPen
-        from PyQt6.QtCore import QRect
-        
-        region = self._find_region_at_line(line_number)
-        if not region:
-            return
-        
-        rect_info = self.get_fold_marker_rect(line_number, top, height)
-        if not rect_info:
-            return
-        
-        x, y, w, h = rect_info
-        
-        # Draw fold marker box
-        painter.setPen(QPen(QColor("#808080")))
-        painter.drawRect(x, y, w, h)
-        
-        # Draw minus/plus sign
-        mid_x = x + w // 2
-        mid_y = y + h // 2
-        
-        # Horizontal line (always present)
-        painter.drawLine(x + 3, mid_y, x + w - 3, mid_y)
-        
-        # Vertical line (only if folded - makes it a plus sign)
-        if region.is_folded:
-            painter.drawLine(mid_x, y + 3, mid_x, y + h - 3)
\ No newline at end of file
+                region.is_folded = True
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Completion popup for CodeEditor
+
+A list of completions drawn inside the editor viewport under the cursor.
+It never takes focus: the editor keeps receiving the keystrokes and routes
+Up/Down/Enter/Tab/Escape to the popup while it is visible. The items come
+from plugins (see CodeEditor.show_completions).
+"""
+
+from typing import List, Tuple
+
+from PyQt6.QtWidgets import QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt
+
+
+class CompletionPopup(QListWidget):
+    """List of completions shown under the cursor of a CodeEditor"""
+
+    MAX_VISIBLE_ROWS = 10
+
+    def __init__(self, editor):
+        super().__init__(editor.viewport())
+        self.editor = editor
+        self.prefix = ''
+
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setStyleSheet("""
+            QListWidget {
+                background-color: #313335;
+                color: #CCC;
+                border: 1px solid #555;
+                font-size: 12px;
+            }
+            QListWidget::item {
+                padding: 2px 6px;
+            }
+            QListWidget::item:selected {
+                background-color: #4A9EFF;
+                color: white;
+            }
+        """)
+        self.itemClicked.connect(lambda item: self.editor.accept_completion())
+        self.hide()
+
+    def show_items(self, prefix: str, items: List[Tuple[str, str]]):
+        """
+        Fill the list and show it under the cursor
+
+        Args:
+            prefix: Typed text the items complete
+            items: (name, kind) pairs, best first
+        """
+        self.prefix = prefix
+        self.clear()
+        for name, kind in items:
+            item = QListWidgetItem(f"{name}    {kind}")
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            self.addItem(item)
+        self.setCurrentRow(0)
+
+        rows = min(len(items), self.MAX_VISIBLE_ROWS)
+        row_height = self.sizeHintForRow(0) if items else 0
+        width = max(self.sizeHintForColumn(0) + 24, 200)
+        height = rows * row_height + 2 * self.frameWidth()
+
+        # Below the cursor, or above it when there is no room
+        rect = self.editor.cursorRect()
+        viewport = self.editor.viewport().rect()
+        x = min(rect.left(), max(0, viewport.width() - width))
+        y = rect.bottom() + 2
+        if y + height > viewport.height() and rect.top() - height - 2 >= 0:
+            y = rect.top() - height - 2
+        self.setGeometry(x, y, width, height)
+        self.show()
+        self.raise_()
+
+    def current_name(self) -> str:
+        """Name of the selected completion"""
+        item = self.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else ''
+
+    def move_selection(self, delta: int):
+        """Move the selection, wrapping around"""
+        if self.count():
+            self.setCurrentRow((self.currentRow() + delta) % self.count())
@@ -4,6 +4,18 @@ from pathlib import Path
 from PyQt6.QtCore import QThread, pyqtSignal
 
 
+# Directories never descended into (hidden directories are skipped too)
+IGNORE_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv',
+    'workspace-env', '.idea', '.vscode', 'dist', 'build',
+    '.pytest_cache', '.mypy_cache', 'eggs', '.eggs', 'env',
+    'site-packages', '.tox',
+})
+
+IGNORE_EXTS = ('.pyc', '.pyo', '.so', '.dylib', '.dll', '.exe', '.o', '.a',
+               '.class', '.jar', '.war', '.log', '.tmp', '.cache')
+
+
 class FileScannerThread(QThread):
     """Background thread to scan workspace files"""
     files_found = pyqtSignal(list)
@@ -18,14 +30,6 @@ class FileScannerThread(QThread):
         """Scan files in background"""
         files = []
 
-        ignore_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv',
-                      'workspace-env', '.idea', '.vscode', 'dist', 'build',
-                      '.pytest_cache', '.mypy_cache', 'eggs', '.eggs', 'env',
-                      'site-packages', '.tox'}
-
-        ignore_exts = {'.pyc', '.pyo', '.so', '.dylib', '.dll', '.exe', '.o', '.a',
-                      '.class', '.jar', '.war', '.log', '.tmp', '.cache'}
-
         for project_path in self.project_paths:
             project_path = Path(project_path)
             if not project_path.exists():
@@ -40,10 +44,10 @@ class FileScannerThread(QThread):
                     self.files_found.emit(files)
                     return
 
-                dirs[:] = [d for d in dirs if d not in ignore_dirs and not d.startswith('.')]
+                dirs[:] = [d for d in dirs if d not in IGNORE_DIRS and not d.startswith('.')]
 
                 for file in filenames:
-                    if file.startswith('.') or any(file.endswith(ext) for ext in ignore_exts):
+                    if file.startswith('.') or file.endswith(IGNORE_EXTS):
                         continue
 
                     full_path = Path(root) / file
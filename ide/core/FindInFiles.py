@@ -0,0 +1,354 @@
+# ============================================================================
+# FindInFiles.py (Workspace-wide search engine)
+# ============================================================================
+
+"""
+Find in Files - search every file of the active projects
+
+The projects are walked with the FileScanner ignore rules plus the simple
+patterns of each project's .gitignore, pruning ignored directories before
+descending. Files are searched on a thread pool, memory-mapped:
+
+- a plain case-sensitive search is a bytes.find loop (memchr speed)
+- everything else is one compiled byte regex over the whole file
+
+Files with a NUL byte in their first block are treated as binary and
+skipped; only the lines with a match are decoded. Results come back per
+file, in walk order, while later files are still being searched, and the
+search stops when cancelled or when the hit cap is reached.
+"""
+
+import fnmatch
+import mmap
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ide.core.FileScanner import IGNORE_DIRS, IGNORE_EXTS
+
+
+# Larger files are generated or data files (the FileScanner limit)
+MAX_FILE_SIZE = 10_000_000
+# Bytes sniffed for a NUL to detect binary files
+BINARY_SNIFF = 8192
+# Characters of a matching line kept for display
+MAX_CONTEXT = 300
+
+
+class SearchHit(NamedTuple):
+    """One match"""
+    file_path: str
+    line: int       # 1-based
+    column: int     # Characters from the start of the line
+    length: int     # Characters matched on that line
+    context: str    # The line, stripped of its end of line
+
+
+class SearchQuery:
+    """
+    What to search for, compiled for byte-level matching
+
+    Raises:
+        ValueError: The text is empty or not a valid regex
+    """
+
+    def __init__(self, text: str, regex: bool = False, case_sensitive: bool = False,
+                 whole_word: bool = False, include: str = ''):
+        """
+        Args:
+            text: Text or regular expression
+            regex: Treat text as a regular expression
+            case_sensitive: Match case (ASCII case folding otherwise)
+            whole_word: Only matches not touching other word characters
+            include: Comma-separated file name globs ('*.py, *.js'); empty
+                searches every file
+        """
+        if not text:
+            raise ValueError("Nothing to search for")
+        self.text = text
+        self.include = [p.strip() for p in include.split(',') if p.strip()]
+
+        # Fast path: a literal needle found with bytes.find
+        self.literal: Optional[bytes] = None
+        self.pattern: Optional[re.Pattern] = None
+        if not regex and case_sensitive and not whole_word:
+            self.literal = text.encode('utf-8')
+            return
+
+        source = text.encode('utf-8') if regex else re.escape(text.encode('utf-8'))
+        if whole_word:
+            source = rb'\b(?:' + source + rb')\b'
+        try:
+            # The whole file is one buffer: ^ and $ must match at each line
+            self.pattern = re.compile(source, re.MULTILINE | (0 if case_sensitive else re.IGNORECASE))
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}") from e
+
+    def wants(self, file_name: str) -> bool:
+        """True if a file name passes the include globs"""
+        return not self.include or any(fnmatch.fnmatch(file_name, p) for p in self.include)
+
+    def spans(self, data) -> Iterator[tuple]:
+        """(start, end) byte offsets of the matches in a buffer"""
+        if self.literal is not None:
+            needle, size = self.literal, len(self.literal)
+            pos = data.find(needle)
+            while pos != -1:
+                yield pos, pos + size
+                pos = data.find(needle, pos + size)
+        else:
+            for match in self.pattern.finditer(data):
+                if match.end() > match.start():
+                    yield match.start(), match.end()
+
+
+class IgnoreRules:
+    """
+    Names skipped below a project: the FileScanner rules, hidden entries,
+    and the patterns of the project's .gitignore (negations are not
+    supported and simply not applied)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.patterns = []      # (glob, directories only, anchored to the root)
+        try:
+            with open(os.path.join(root, '.gitignore'), encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith(('#', '!')):
+                        continue
+                    dir_only = line.endswith('/')
+                    line = line.rstrip('/')
+                    anchored = '/' in line
+                    self.patterns.append((line.lstrip('/'), dir_only, anchored))
+        except OSError:
+            pass
+
+    def ignores(self, path: str, name: str, is_dir: bool) -> bool:
+        """
+        Args:
+            path: Full path of the entry
+            name: Its name
+            is_dir: The entry is a directory
+        """
+        if name.startswith('.'):
+            return True
+        if is_dir and name in IGNORE_DIRS:
+            return True
+        if not is_dir and name.endswith(IGNORE_EXTS):
+            return True
+        relative = None
+        for pattern, dir_only, anchored in self.patterns:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                if relative is None:
+                    relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+                if fnmatch.fnmatch(relative, pattern):
+                    return True
+            elif fnmatch.fnmatch(name, pattern):
+                return True
+        return False
+
+
+def iter_workspace_files(roots: Iterable, query: Optional[SearchQuery] = None) -> Iterator[str]:
+    """
+    Stream the searchable files below the project directories
+
+    Args:
+        roots: Project directories
+        query: Its include globs filter the files (None: every file)
+
+    Yields:
+        File paths, each directory in name order; symlinked directories
+        are not followed
+    """
+    for root in roots:
+        root = os.path.normpath(str(root))
+        if not os.path.isdir(root):
+            continue
+        rules = IgnoreRules(root)
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if rules.ignores(entry.path, entry.name, is_dir):
+                        continue
+                    if is_dir:
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and (query is None or query.wants(entry.name)):
+                        yield entry.path
+                except OSError:
+                    continue
+            stack.extend(reversed(subdirs))
+
+
+def search_file(file_path: str, query: SearchQuery,
+                stop: Optional[threading.Event] = None) -> List[SearchHit]:
+    """
+    Search one file
+
+    Args:
+        file_path: File to search
+        query: Compiled query
+        stop: Event that ends the scan early when set
+
+    Returns:
+        Matches in file order; [] for empty, oversized, binary or
+        unreadable files
+    """
+    hits = []
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > MAX_FILE_SIZE:
+                return hits
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data.find(b'\0', 0, BINARY_SNIFF) != -1:
+                    return hits
+                line_num = 1
+                counted = 0
+                for start, end in query.spans(data):
+                    if stop is not None and stop.is_set():
+                        break
+                    line_num += data[counted:start].count(b'\n')
+                    counted = start
+
+                    line_start = data.rfind(b'\n', 0, start) + 1
+                    line_end = data.find(b'\n', start)
+                    if line_end == -1:
+                        line_end = len(data)
+                    line = data[line_start:line_end].decode('utf-8', 'replace').rstrip('\r')
+                    column = len(data[line_start:start].decode('utf-8', 'replace'))
+                    length = len(data[start:min(end, line_end)].decode('utf-8', 'replace'))
+                    hits.append(SearchHit(file_path, line_num, column, length, line.strip()[:MAX_CONTEXT]))
+    except (OSError, ValueError) as e:
+        print(f"[FindInFiles] Cannot search {file_path}: {e}")
+    return hits
+
+
+def iter_search(query: SearchQuery, files: Iterable[str],
+                cancel: Optional[threading.Event] = None,
+                max_hits: Optional[int] = None,
+                workers: int = 4) -> Iterator[List[SearchHit]]:
+    """
+    Search files in parallel and stream the results in file order
+
+    Args:
+        query: Compiled query
+        files: Files to search (e.g. iter_workspace_files, consumed lazily)
+        cancel: Event that stops the search when set
+        max_hits: Stop after this many matches
+        workers: Threads searching files (the regex holds the GIL, so this
+            mostly overlaps file I/O)
+
+    Yields:
+        Non-empty lists of matches, one file per list
+    """
+    cancel = cancel or threading.Event()
+    # Ends the scans still running when the consumer is done
+    stop = threading.Event()
+    window = workers * 8
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='find-in-files')
+    pending = deque()
+    remaining = iter(files)
+    hits = 0
+
+    def fill():
+        for file_path in remaining:
+            pending.append(executor.submit(search_file, file_path, query, stop))
+            if len(pending) >= window:
+                break
+
+    try:
+        fill()
+        while pending and not cancel.is_set():
+            file_hits = pending.popleft().result()
+            fill()
+            if not file_hits or cancel.is_set():
+                continue
+            if max_hits is not None and hits + len(file_hits) >= max_hits:
+                yield file_hits[:max_hits - hits]
+                return
+            hits += len(file_hits)
+            yield file_hits
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FindInFilesThread(QThread):
+    """Background thread running one Find in Files search"""
+
+    # Lists of SearchHit lists (one per file), batched for the UI
+    matches_found = pyqtSignal(list)
+    # hits, files with hits, truncated, cancelled
+    finished_signal = pyqtSignal(int, int, bool, bool)
+
+    MAX_HITS = 10000
+    # Milliseconds between two matches_found signals
+    BATCH_MS = 50
+
+    def __init__(self, query: SearchQuery, roots: List[str], files: Optional[List[str]] = None):
+        """
+        Args:
+            query: Compiled query
+            roots: Project directories walked for files
+            files: Files to search instead of walking the roots
+        """
+        super().__init__()
+        self.query = query
+        self.roots = roots
+        self.files = files
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Stop searching (the files being read finish first)"""
+        self._cancel.set()
+
+    def run(self):
+        hits = matched_files = 0
+        truncated = False
+        batch = []
+        try:
+            if self.files is not None:
+                files = (f for f in self.files if self.query.wants(os.path.basename(f)))
+            else:
+                files = iter_workspace_files(self.roots, self.query)
+
+            last_emit = time.monotonic()
+            # One hit past the cap tells whether a hit was actually dropped
+            for file_hits in iter_search(self.query, files, self._cancel, self.MAX_HITS + 1):
+                if hits + len(file_hits) > self.MAX_HITS:
+                    file_hits = file_hits[:self.MAX_HITS - hits]
+                    truncated = True
+                    if not file_hits:
+                        break
+                hits += len(file_hits)
+                matched_files += 1
+                batch.append(file_hits)
+                if (time.monotonic() - last_emit) * 1000 >= self.BATCH_MS:
+                    self.matches_found.emit(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+        except Exception as e:
+            # An exception escaping run() aborts the application under PyQt6
+            print(f"[FindInFiles] Search failed: {e}")
+        finally:
+            if batch:
+                self.matches_found.emit(batch)
+            self.finished_signal.emit(hits, matched_files, truncated, self._cancel.is_set())
@@ -0,0 +1,250 @@
+# ============================================================================
+# FindInFilesPanel.py (Find in Files dock)
+# ============================================================================
+
+"""
+Dockable Find in Files panel
+
+Runs a FindInFilesThread over the active projects and appends the results,
+grouped by file, while the search is still going. Activating a match asks
+the workspace to open its file at the matching line (location_requested).
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from PyQt6.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel,
+    QPushButton, QCheckBox, QTreeWidget, QTreeWidgetItem,
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from ide.core.FindInFiles import FindInFilesThread, SearchHit, SearchQuery
+
+
+class FindInFilesPanel(QDockWidget):
+    """Search the active projects and browse the matches"""
+
+    # file path, line (1-based), column, length of the match
+    location_requested = pyqtSignal(str, int, int, int)
+
+    def __init__(self, get_roots: Callable[[], List[str]], parent=None):
+        """
+        Args:
+            get_roots: Returns the project directories to search
+            parent: Main window
+        """
+        super().__init__("Find in Files", parent)
+        self.setObjectName("FindInFilesPanel")
+        self.get_roots = get_roots
+        self.search_thread: Optional[FindInFilesThread] = None
+        # Results of earlier searches still queued are ignored
+        self._search_id = 0
+        self.hit_count = 0
+
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize UI"""
+        container = QWidget()
+        container.setStyleSheet("""
+            QWidget {
+                background-color: #2B2B2B;
+                color: #CCC;
+            }
+            QLineEdit {
+                background-color: #3C3F41;
+                border: 1px solid #555;
+                padding: 4px;
+                border-radius: 2px;
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+            }
+            QLineEdit:focus {
+                border: 1px solid #4A9EFF;
+            }
+            QPushButton {
+                background-color: #3C3F41;
+                border: 1px solid #555;
+                padding: 3px 8px;
+                border-radius: 2px;
+            }
+            QPushButton:hover {
+                background-color: #4A4A4A;
+            }
+            QTreeWidget {
+                border: none;
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+            }
+            QTreeWidget::item:selected {
+                background-color: #4A9EFF;
+            }
+            QTreeWidget::item:hover {
+                background-color: #3C3F41;
+            }
+        """)
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(4)
+
+        # Query row
+        query_row = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search in active projects")
+        self.search_input.returnPressed.connect(self.start_search)
+        query_row.addWidget(self.search_input, 3)
+
+        self.include_input = QLineEdit()
+        self.include_input.setPlaceholderText("Files to include (e.g. *.py, *.js)")
+        self.include_input.returnPressed.connect(self.start_search)
+        query_row.addWidget(self.include_input, 1)
+
+        self.search_btn = QPushButton("Search")
+        self.search_btn.clicked.connect(self.start_search)
+        query_row.addWidget(self.search_btn)
+
+        self.stop_btn = QPushButton("⏹")
+        self.stop_btn.setFixedWidth(30)
+        self.stop_btn.setToolTip("Stop searching")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop)
+        query_row.addWidget(self.stop_btn)
+        layout.addLayout(query_row)
+
+        # Options row
+        options_row = QHBoxLayout()
+        self.case_sensitive = QCheckBox("Match Case")
+        options_row.addWidget(self.case_sensitive)
+        self.whole_word = QCheckBox("Whole Word")
+        options_row.addWidget(self.whole_word)
+        self.regex = QCheckBox("Regex")
+        options_row.addWidget(self.regex)
+        options_row.addStretch()
+        self.stats_label = QLabel("No search")
+        self.stats_label.setStyleSheet("color: #888;")
+        options_row.addWidget(self.stats_label)
+        layout.addLayout(options_row)
+
+        # Results tree (file -> matches)
+        self.results_tree = QTreeWidget()
+        self.results_tree.setHeaderHidden(True)
+        self.results_tree.itemActivated.connect(self.on_item_activated)
+        self.results_tree.itemClicked.connect(self.on_item_activated)
+        layout.addWidget(self.results_tree)
+
+        self.setWidget(container)
+
+    def focus_search(self, text: str = ''):
+        """
+        Show the panel with the cursor in the search field
+
+        Args:
+            text: Text to search for (e.g. the editor selection); the
+                previous query is kept if empty
+        """
+        if text:
+            self.search_input.setText(text)
+        self.show()
+        self.raise_()
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+
+    # ========================================================================
+    # Searching
+    # ========================================================================
+
+    def start_search(self):
+        """Search the active projects for the current query"""
+        try:
+            query = SearchQuery(
+                self.search_input.text(),
+                regex=self.regex.isChecked(),
+                case_sensitive=self.case_sensitive.isChecked(),
+                whole_word=self.whole_word.isChecked(),
+                include=self.include_input.text(),
+            )
+        except ValueError as e:
+            self.stats_label.setText(str(e))
+            return
+
+        roots = self.get_roots()
+        if not roots:
+            self.stats_label.setText("No active projects")
+            return
+
+        self.stop()
+        self.results_tree.clear()
+        self.hit_count = 0
+        self.stats_label.setText("Searching...")
+        self.stop_btn.setEnabled(True)
+
+        self._search_id += 1
+        search_id = self._search_id
+        thread = FindInFilesThread(query, roots)
+        thread.matches_found.connect(
+            lambda batch: search_id == self._search_id and self.add_matches(batch))
+        thread.finished_signal.connect(
+            lambda *result: search_id == self._search_id and self.on_search_finished(*result))
+        self.search_thread = thread
+        thread.start()
+
+    def stop(self):
+        """Cancel the running search and wait for its thread"""
+        thread = self.search_thread
+        if thread is None or not thread.isRunning():
+            return
+        self._search_id += 1
+        thread.cancel()
+        thread.wait()
+        self.on_search_finished(self.hit_count, self.results_tree.topLevelItemCount(), False, True)
+
+    def add_matches(self, batch: List[List[SearchHit]]):
+        """
+        Append the matches of some files
+
+        Args:
+            batch: Matches grouped by file, one list per file
+        """
+        roots = self.get_roots()
+        for file_hits in batch:
+            file_path = file_hits[0].file_path
+            file_item = QTreeWidgetItem([f"📄 {self._display_path(file_path, roots)} ({len(file_hits)})"])
+            file_item.setToolTip(0, file_path)
+            file_item.setData(0, Qt.ItemDataRole.UserRole, file_hits[0])
+            self.results_tree.addTopLevelItem(file_item)
+
+            for hit in file_hits:
+                item = QTreeWidgetItem([f"{hit.line:>5}: {hit.context}"])
+                item.setData(0, Qt.ItemDataRole.UserRole, hit)
+                file_item.addChild(item)
+            file_item.setExpanded(True)
+            self.hit_count += len(file_hits)
+
+        self.stats_label.setText(
+            f"Searching... {self.hit_count} matches in {self.results_tree.topLevelItemCount()} files"
+        )
+
+    def on_search_finished(self, hits: int, files: int, truncated: bool, cancelled: bool):
+        """Show the final count"""
+        self.stop_btn.setEnabled(False)
+        text = f"{hits} matches in {files} files"
+        if truncated:
+            text += f" (limit of {FindInFilesThread.MAX_HITS} reached)"
+        elif cancelled:
+            text += " (stopped)"
+        self.stats_label.setText(text)
+
+    def on_item_activated(self, item, column):
+        """Open the file of a match (or of a file row) at the matching line"""
+        hit = item.data(0, Qt.ItemDataRole.UserRole)
+        if hit is not None:
+            self.location_requested.emit(hit.file_path, hit.line, hit.column, hit.length)
+
+    @staticmethod
+    def _display_path(file_path: str, roots: List[str]) -> str:
+        """File path relative to the parent of its project"""
+        for root in roots:
+            root = os.path.normpath(root)
+            if file_path.startswith(root + os.sep):
+                return os.path.relpath(file_path, os.path.dirname(root))
+        return Path(file_path).name
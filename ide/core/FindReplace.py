@@ -84,12 +84,9 @@ class FindReplaceWidget(QFrame, SettingsProvider):
             }
         """)
 
-        find_replace_contents_margins = self.settings_manager.get('find_replace_contents_margins', 5)
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(
-            find_replace_contents_margins, find_replace_contents_margins,
-            find_replace_contents_margins, find_replace_contents_margins
-        )
+        self._set_contents_margins(self.settings_manager.get('find_replace_contents_margins', 5))
+        self.settings_manager.settings_changed.connect(self._on_settings_changed)
         layout.setSpacing(5)  # ← Increased from 3
 
         # Find row
@@ -170,6 +167,15 @@ class FindReplaceWidget(QFrame, SettingsProvider):
 
         self.hide()
 
+    def _set_contents_margins(self, margin):
+        """Apply the layout margin setting"""
+        self.layout().setContentsMargins(margin, margin, margin, margin)
+
+    def _on_settings_changed(self, snapshot, changed):
+        """Follow settings changes published by the SettingsManager"""
+        if 'find_replace_contents_margins' in changed:
+            self._set_contents_margins(snapshot['find_replace_contents_margins'])
+
     def close_panel(self):
         """Close the find/replace panel"""
         self.clear_highlights()
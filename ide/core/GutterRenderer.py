@@ -0,0 +1,169 @@
+# ============================================================================
+# GutterRenderer.py - Cached painter for the editor gutter
+# ============================================================================
+
+"""
+Gutter Renderer for CodeEditor
+
+Paints line numbers and fold markers into the LineNumberArea.
+
+Everything that does not change between paints is cached:
+- background / text pens and the font metrics of the editor font
+- one pre-rendered pixmap per line number (LRU bounded)
+- two pre-rendered fold marker pixmaps (expanded / collapsed)
+
+Combined with QWidget.scroll() in CodeEditor.update_line_number_area, a
+scroll repaint only has to blit a few cached pixmaps for the newly exposed
+lines.
+"""
+
+from collections import OrderedDict
+
+from PyQt6.QtGui import QColor, QPainter, QPen, QPixmap, QFontMetrics
+from PyQt6.QtCore import Qt
+
+
+class GutterRenderer:
+    """
+    Paints the gutter of a CodeEditor from cached pixmaps.
+
+    The renderer is owned by the editor. Call invalidate() whenever the
+    editor font changes; width changes need no invalidation because the
+    line number pixmaps are right-aligned at paint time.
+    """
+
+    BACKGROUND_COLOR = "#313335"
+    LINE_NUMBER_COLOR = "#606366"
+    FOLD_MARKER_COLOR = "#808080"
+
+    FOLD_MARKER_SPACE = 16      # Left column reserved for fold markers
+    FOLD_MARKER_SIZE = 12
+    RIGHT_PADDING = 3
+
+    MAX_CACHED_NUMBERS = 4096   # Roughly 40 screens of line numbers
+
+    def __init__(self, editor):
+        self.editor = editor
+
+        self._background = QColor(self.BACKGROUND_COLOR)
+        self._number_pen = QPen(QColor(self.LINE_NUMBER_COLOR))
+        self._marker_pen = QPen(QColor(self.FOLD_MARKER_COLOR))
+
+        self._numbers: "OrderedDict[int, QPixmap]" = OrderedDict()
+        self._markers = {}
+        self._metrics = None
+        self._line_height = 0
+        self._pixel_ratio = 1.0
+
+        self.invalidate()
+
+    # ------------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------------
+
+    def invalidate(self):
+        """Drop all cached pixmaps and metrics (font or DPI changed)"""
+        self._metrics = QFontMetrics(self.editor.font())
+        self._line_height = self._metrics.height()
+        self._pixel_ratio = self.editor.devicePixelRatioF()
+        self._numbers.clear()
+        self._markers.clear()
+
+    def _new_pixmap(self, width: int, height: int) -> QPixmap:
+        ratio = self._pixel_ratio
+        pixmap = QPixmap(max(1, int(width * ratio)), max(1, int(height * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+    def _line_number_pixmap(self, number: int) -> QPixmap:
+        """Get (or render) the pixmap for a 1-based line number"""
+        pixmap = self._numbers.get(number)
+        if pixmap is not None:
+            self._numbers.move_to_end(number)
+            return pixmap
+
+        text = str(number)
+        pixmap = self._new_pixmap(self._metrics.horizontalAdvance(text), self._line_height)
+
+        painter = QPainter(pixmap)
+        painter.setFont(self.editor.font())
+        painter.setPen(self._number_pen)
+        painter.drawText(0, self._metrics.ascent(), text)
+        painter.end()
+
+        self._numbers[number] = pixmap
+        if len(self._numbers) > self.MAX_CACHED_NUMBERS:
+            self._numbers.popitem(last=False)
+        return pixmap
+
+    def _fold_marker_pixmap(self, folded: bool) -> QPixmap:
+        """Get (or render) the expanded/collapsed fold marker pixmap"""
+        pixmap = self._markers.get(folded)
+        if pixmap is not None:
+            return pixmap
+
+        size = self.FOLD_MARKER_SIZE
+        pixmap = self._new_pixmap(size + 1, size + 1)
+
+        painter = QPainter(pixmap)
+        painter.setPen(self._marker_pen)
+        painter.drawRect(0, 0, size, size)
+
+        mid = size // 2
+        # Horizontal line (always present)
+        painter.drawLine(3, mid, size - 3, mid)
+        # Vertical line (only if folded - makes it a plus sign)
+        if folded:
+            painter.drawLine(mid, 3, mid, size - 3)
+        painter.end()
+
+        self._markers[folded] = pixmap
+        return pixmap
+
+    # ------------------------------------------------------------------------
+    # Painting
+    # ------------------------------------------------------------------------
+
+    def paint(self, event):
+        """Paint the exposed part of the gutter (LineNumberArea.paintEvent)"""
+        editor = self.editor
+        area = editor.line_number_area
+
+        if editor.devicePixelRatioF() != self._pixel_ratio:
+            self.invalidate()
+
+        painter = QPainter(area)
+        exposed = event.rect()
+        painter.fillRect(exposed, self._background)
+
+        exposed_top = exposed.top()
+        exposed_bottom = exposed.bottom()
+        line_height = self._line_height
+        number_right = area.width() - self.RIGHT_PADDING
+        marker_offset = (line_height - self.FOLD_MARKER_SIZE) // 2
+        fold_index = editor.folding_manager.index if editor._is_folding_enabled() else None
+
+        block = editor.firstVisibleBlock()
+        top = editor.blockBoundingGeometry(block).translated(editor.contentOffset()).top()
+
+        while block.isValid() and top <= exposed_bottom:
+            bottom = top + editor.blockBoundingRect(block).height()
+
+            if block.isVisible() and bottom >= exposed_top:
+                y = int(top)
+                block_number = block.blockNumber()
+
+                pixmap = self._line_number_pixmap(block_number + 1)
+                x = max(self.FOLD_MARKER_SPACE, number_right - int(pixmap.width() / self._pixel_ratio))
+                painter.drawPixmap(x, y, pixmap)
+
+                if fold_index is not None:
+                    region = fold_index.at_line(block_number)
+                    if region is not None:
+                        painter.drawPixmap(2, y + marker_offset, self._fold_marker_pixmap(region.is_folded))
+
+            block = block.next()
+            top = bottom
+
+        painter.end()
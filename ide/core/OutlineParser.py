@@ -9,8 +9,9 @@ Extracts symbols (classes, functions, methods) from source code
 
 import ast
 import re
+from bisect import bisect_right
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 
 class Symbol:
@@ -55,6 +56,9 @@ class Symbol:
 class OutlineParser:
     """Factory class for creating language-specific parsers"""
     
+    # File extension -> parser class; filled in below the parser classes
+    PARSERS: Dict[str, type] = {}
+    
     @staticmethod
     def parse(file_path: str, content: str) -> List[Symbol]:
         """
@@ -69,30 +73,7 @@ class OutlineParser:
         """
         ext = Path(file_path).suffix.lower()
         
-        parsers = {
-            '.py': PythonParser,
-            '.php': PHPParser,
-            '.go': GoParser,
-            '.rs': RustParser,
-            '.html': HTMLParser,
-            '.htm': HTMLParser,
-            '.css': CSSParser,
-            '.scss': CSSParser,
-            '.sass': CSSParser,
-            '.json': JSONParser,
-            '.js': JavaScriptParser,
-            '.ts': JavaScriptParser,
-            '.jsx': JavaScriptParser,
-            '.tsx': JavaScriptParser,
-            '.java': JavaParser,
-            '.c': CParser,
-            '.cpp': CppParser,
-            '.h': CppParser,
-            '.rb': RubyParser,
-            '.ini': INIParser,         # NEW: INI file support
-        }
-        
-        parser_class = parsers.get(ext)
+        parser_class = OutlineParser.PARSERS.get(ext)
         if parser_class:
             try:
                 return parser_class.parse(content)
@@ -113,7 +94,19 @@ class PythonParser:
     @staticmethod
     def parse(content: str) -> List[Symbol]:
         try:
-            tree = ast.parse(content)
+            return PythonParser.from_tree(ast.parse(content))
+        
+        except SyntaxError as e:
+            print(f"Syntax error parsing Python: {e}")
+            return []
+        except Exception as e:
+            print(f"Error parsing Python: {e}")
+            return []
+    
+    @staticmethod
+    def from_tree(tree: ast.Module) -> List[Symbol]:
+        """Build outline symbols from an already parsed module"""
+        try:
             symbols = []
             
             # First pass: collect all classes with their methods
@@ -135,151 +128,157 @@ class PythonParser:
             
             return sorted(symbols, key=lambda s: s.line)
         
-        except SyntaxError as e:
-            print(f"Syntax error parsing Python: {e}")
-            return []
         except Exception as e:
             print(f"Error parsing Python: {e}")
             return []
 
 
+# ============================================================================
+# Shared regex parsing infrastructure
+# ============================================================================
+
+class LineIndex:
+    """
+    Maps character offsets to 1-based line numbers.
+
+    Built once per parse in O(n); each lookup is a bisect over the line
+    start offsets instead of re-counting newlines in the prefix.
+    """
+
+    __slots__ = ('starts',)
+
+    _NEWLINE = re.compile('\n')
+
+    def __init__(self, content: str):
+        self.starts = [0]
+        self.starts.extend(m.end() for m in self._NEWLINE.finditer(content))
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number containing the character offset"""
+        return bisect_right(self.starts, offset)
+
+
+class RegexParser:
+    """
+    Base class for regex based parsers.
+
+    Subclasses list (symbol_type, pattern) pairs in PATTERNS. Each pattern
+    is compiled once and scanned separately (patterns may overlap, e.g. a
+    C function returning a struct is both), the matches are merged by
+    position, and line numbers come from a shared LineIndex.
+    """
+
+    PATTERNS: List[Tuple[str, str]] = []
+    FLAGS = re.MULTILINE
+
+    # Per subclass: [(symbol type, compiled pattern)]
+    _scanners = None
+
+    @classmethod
+    def _get_scanners(cls):
+        if cls.__dict__.get('_scanners') is None:
+            cls._scanners = [(symbol_type, re.compile(pattern, cls.FLAGS))
+                             for symbol_type, pattern in cls.PATTERNS]
+        return cls._scanners
+
+    @classmethod
+    def symbol_name(cls, symbol_type: str, values: Tuple[Optional[str], ...]) -> Optional[str]:
+        """Build the display name from a pattern's groups (first non-empty)"""
+        for value in values:
+            if value:
+                return value
+        return None
+
+    @classmethod
+    def parse(cls, content: str) -> List[Symbol]:
+        lines = LineIndex(content)
+        found = []
+
+        for order, (symbol_type, scanner) in enumerate(cls._get_scanners()):
+            for match in scanner.finditer(content):
+                name = cls.symbol_name(symbol_type, match.groups())
+                if name:
+                    found.append((match.start(), order, name, symbol_type))
+
+        found.sort()
+        return [Symbol(name, symbol_type, lines.line_of(start))
+                for start, order, name, symbol_type in found]
+
+
 # ============================================================================
 # PHP Parser
 # ============================================================================
 
-class PHPParser:
+class PHPParser(RegexParser):
     """Parse PHP files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse classes
-        class_pattern = r'class\s+(\w+)'
-        for match in re.finditer(class_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'class', line))
-        
-        # Parse functions
-        func_pattern = r'function\s+(\w+)\s*\('
-        for match in re.finditer(func_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'function', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('class', r'class\s+(\w+)'),
+        ('function', r'function\s+(\w+)\s*\('),
+    ]
 
 
 # ============================================================================
 # Go Parser
 # ============================================================================
 
-class GoParser:
+class GoParser(RegexParser):
     """Parse Go files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse structs
-        struct_pattern = r'type\s+(\w+)\s+struct'
-        for match in re.finditer(struct_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'struct', line))
-        
-        # Parse interfaces
-        interface_pattern = r'type\s+(\w+)\s+interface'
-        for match in re.finditer(interface_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'interface', line))
-        
-        # Parse functions
-        func_pattern = r'func\s+(?:\(\w+\s+\*?\w+\)\s+)?(\w+)\s*\('
-        for match in re.finditer(func_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'function', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('struct', r'type\s+(\w+)\s+struct'),
+        ('interface', r'type\s+(\w+)\s+interface'),
+        ('function', r'func\s+(?:\(\w+\s+\*?\w+\)\s+)?(\w+)\s*\('),
+    ]
 
 
 # ============================================================================
 # Rust Parser
 # ============================================================================
 
-class RustParser:
+class RustParser(RegexParser):
     """Parse Rust files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse structs
-        struct_pattern = r'struct\s+(\w+)'
-        for match in re.finditer(struct_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'struct', line))
-        
-        # Parse enums
-        enum_pattern = r'enum\s+(\w+)'
-        for match in re.finditer(enum_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'enum', line))
-        
-        # Parse traits
-        trait_pattern = r'trait\s+(\w+)'
-        for match in re.finditer(trait_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'trait', line))
-        
-        # Parse functions
-        func_pattern = r'fn\s+(\w+)\s*(?:<[^>]*>)?\s*\('
-        for match in re.finditer(func_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'function', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('struct', r'struct\s+(\w+)'),
+        ('enum', r'enum\s+(\w+)'),
+        ('trait', r'trait\s+(\w+)'),
+        ('function', r'fn\s+(\w+)\s*(?:<[^>]*>)?\s*\('),
+    ]
 
 
 # ============================================================================
 # HTML Parser
 # ============================================================================
 
-class HTMLParser:
+class HTMLParser(RegexParser):
     """Parse HTML files - extract tags with IDs"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse tags with IDs
-        id_pattern = r'<(\w+)[^>]*\sid=["\']([^"\']+)["\']'
-        for match in re.finditer(id_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            tag_name = match.group(1)
-            id_value = match.group(2)
-            symbols.append(Symbol(f"#{id_value} ({tag_name})", 'id', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('id', r'<(\w+)[^>]*\sid=["\']([^"\']+)["\']'),
+    ]
+
+    @classmethod
+    def symbol_name(cls, symbol_type, values):
+        tag_name, id_value = values
+        return f"#{id_value} ({tag_name})"
 
 
 # ============================================================================
 # CSS Parser
 # ============================================================================
 
-class CSSParser:
+class CSSParser(RegexParser):
     """Parse CSS files - extract selectors"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse selectors (simplified)
-        selector_pattern = r'^([.#]?[\w-]+(?:\s*[>+~]\s*[\w-]+)*)\s*\{'
-        for match in re.finditer(selector_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            selector = match.group(1).strip()
-            symbols.append(Symbol(selector, 'selector', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        # Selectors (simplified)
+        ('selector', r'^([.#]?[\w-]+(?:\s*[>+~]\s*[\w-]+)*)\s*\{'),
+    ]
+
+    @classmethod
+    def symbol_name(cls, symbol_type, values):
+        return values[0].strip()
 
 
 # ============================================================================
@@ -288,7 +287,9 @@ class CSSParser:
 
 class JSONParser:
     """Parse JSON files - extract top-level keys"""
-    
+
+    _STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+
     @staticmethod
     def parse(content: str) -> List[Symbol]:
         import json
@@ -297,13 +298,21 @@ class JSONParser:
         try:
             data = json.loads(content)
             if isinstance(data, dict):
+                lines = LineIndex(content)
+
+                # First offset of every string literal, collected in one pass
+                first_seen = {}
+                for match in JSONParser._STRING.finditer(content):
+                    first_seen.setdefault(match.group(1), match.start())
+
                 for key in data.keys():
-                    # Find line number by searching for the key
-                    pattern = rf'"{re.escape(key)}"'
-                    match = re.search(pattern, content)
-                    if match:
-                        line = content[:match.start()].count('\n') + 1
-                        symbols.append(Symbol(key, 'key', line))
+                    offset = first_seen.get(key)
+                    if offset is None:
+                        # Key needs escaping in the source - search for it
+                        match = re.search(rf'"{re.escape(key)}"', content)
+                        offset = match.start() if match else None
+                    if offset is not None:
+                        symbols.append(Symbol(key, 'key', lines.line_of(offset)))
         except json.JSONDecodeError:
             pass
         
@@ -314,150 +323,70 @@ class JSONParser:
 # JavaScript/TypeScript Parser
 # ============================================================================
 
-class JavaScriptParser:
+class JavaScriptParser(RegexParser):
     """Parse JavaScript/TypeScript files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse classes
-        class_pattern = r'class\s+(\w+)'
-        for match in re.finditer(class_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'class', line))
-        
-        # Parse functions (including arrow functions)
-        func_pattern = r'(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>)'
-        for match in re.finditer(func_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            name = match.group(1) or match.group(2)
-            if name:
-                symbols.append(Symbol(name, 'function', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('class', r'class\s+(\w+)'),
+        # Functions (including arrow functions)
+        ('function', r'(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>)'),
+    ]
 
 
 # ============================================================================
 # Java Parser
 # ============================================================================
 
-class JavaParser:
+class JavaParser(RegexParser):
     """Parse Java files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse classes
-        class_pattern = r'(?:public\s+)?(?:abstract\s+)?class\s+(\w+)'
-        for match in re.finditer(class_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'class', line))
-        
-        # Parse interfaces
-        interface_pattern = r'(?:public\s+)?interface\s+(\w+)'
-        for match in re.finditer(interface_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'interface', line))
-        
-        # Parse methods
-        method_pattern = r'(?:public|private|protected)?\s+(?:static\s+)?(?:\w+(?:<[^>]+>)?)\s+(\w+)\s*\('
-        for match in re.finditer(method_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'method', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('class', r'(?:public\s+)?(?:abstract\s+)?class\s+(\w+)'),
+        ('interface', r'(?:public\s+)?interface\s+(\w+)'),
+        ('method', r'(?:public|private|protected)?\s+(?:static\s+)?(?:\w+(?:<[^>]+>)?)\s+(\w+)\s*\('),
+    ]
 
 
 # ============================================================================
 # C Parser
 # ============================================================================
 
-class CParser:
+class CParser(RegexParser):
     """Parse C files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse structs
-        struct_pattern = r'(?:typedef\s+)?struct\s+(\w+)'
-        for match in re.finditer(struct_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'struct', line))
-        
-        # Parse functions
-        func_pattern = r'^(?:\w+\s+)+(\w+)\s*\([^)]*\)\s*\{'
-        for match in re.finditer(func_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'function', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('struct', r'(?:typedef\s+)?struct\s+(\w+)'),
+        ('function', r'^(?:\w+\s+)+(\w+)\s*\([^)]*\)\s*\{'),
+    ]
 
 
 # ============================================================================
 # C++ Parser
 # ============================================================================
 
-class CppParser:
+class CppParser(RegexParser):
     """Parse C++ files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse classes
-        class_pattern = r'class\s+(\w+)'
-        for match in re.finditer(class_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'class', line))
-        
-        # Parse structs
-        struct_pattern = r'struct\s+(\w+)'
-        for match in re.finditer(struct_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'struct', line))
-        
-        # Parse functions/methods
-        func_pattern = r'(?:[\w:]+\s+)+(\w+)\s*\([^)]*\)\s*(?:const)?\s*\{'
-        for match in re.finditer(func_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'function', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('class', r'class\s+(\w+)'),
+        ('struct', r'struct\s+(\w+)'),
+        # Functions/methods
+        ('function', r'(?:[\w:]+\s+)+(\w+)\s*\([^)]*\)\s*(?:const)?\s*\{'),
+    ]
 
 
 # ============================================================================
 # Ruby Parser
 # ============================================================================
 
-class RubyParser:
+class RubyParser(RegexParser):
     """Parse Ruby files using regex"""
-    
-    @staticmethod
-    def parse(content: str) -> List[Symbol]:
-        symbols = []
-        
-        # Parse classes
-        class_pattern = r'class\s+(\w+)'
-        for match in re.finditer(class_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'class', line))
-        
-        # Parse modules
-        module_pattern = r'module\s+(\w+)'
-        for match in re.finditer(module_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'class', line))  # Use 'class' icon
-        
-        # Parse methods
-        def_pattern = r'def\s+(\w+)'
-        for match in re.finditer(def_pattern, content, re.MULTILINE):
-            line = content[:match.start()].count('\n') + 1
-            symbols.append(Symbol(match.group(1), 'function', line))
-        
-        return sorted(symbols, key=lambda s: s.line)
+
+    PATTERNS = [
+        ('class', r'class\s+(\w+)'),
+        ('class', r'module\s+(\w+)'),  # Use 'class' icon
+        ('function', r'def\s+(\w+)'),
+    ]
 
 
 # ============================================================================
@@ -502,4 +431,31 @@ class INIParser:
                     # Standalone key (no section)
                     symbols.append(key_symbol)
         
-        return symbols
\ No newline at end of file
+        return symbols
+
+# ============================================================================
+# Parser registry
+# ============================================================================
+
+OutlineParser.PARSERS.update({
+    '.py': PythonParser,
+    '.php': PHPParser,
+    '.go': GoParser,
+    '.rs': RustParser,
+    '.html': HTMLParser,
+    '.htm': HTMLParser,
+    '.css': CSSParser,
+    '.scss': CSSParser,
+    '.sass': CSSParser,
+    '.json': JSONParser,
+    '.js': JavaScriptParser,
+    '.ts': JavaScriptParser,
+    '.jsx': JavaScriptParser,
+    '.tsx': JavaScriptParser,
+    '.java': JavaParser,
+    '.c': CParser,
+    '.cpp': CppParser,
+    '.h': CppParser,
+    '.rb': RubyParser,
+    '.ini': INIParser,
+})
@@ -4,18 +4,73 @@
 
 """
 Outline navigator widget - shows code structure
+
+Parsing runs on an OutlineParseWorker thread. Results are applied to the
+tree as a keyed diff, so unchanged symbols keep their items (and with them
+expansion, selection and scroll position).
 """
 
+import threading
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem, 
     QLineEdit, QLabel, QHBoxLayout
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
-from ide.core.OutlineParser import OutlineParser, Symbol
+from ide.core.OutlineParser import Symbol
+from ide.core.ParseCache import get_parse_cache
 from ide.core.CodeEditor import CodeEditor
 
 
+# Item data role holding the symbol's diff key
+SYMBOL_KEY_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class OutlineParseWorker(QThread):
+    """
+    Background thread that parses outline symbols.
+
+    Only the most recent request is kept: if several edits arrive while a
+    parse is running, the intermediate ones are dropped.
+    """
+
+    # (request key, list of Symbol)
+    parsed = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._pending = None
+        self._running = True
+
+    def request(self, key, file_path: str, content: str):
+        """Queue a parse, replacing any request that has not started yet"""
+        with self._condition:
+            self._pending = (key, file_path, content)
+            self._condition.notify()
+
+    def stop(self):
+        """Stop the thread and wait for it to finish"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                key, file_path, content = self._pending
+                self._pending = None
+
+            symbols = get_parse_cache().lookup(file_path, content).outline
+            self.parsed.emit(key, symbols)
+
+
 class OutlineWidget(QWidget):
     """
     Code outline/navigator widget
@@ -30,6 +85,14 @@ class OutlineWidget(QWidget):
         self.current_editor = None
         self.symbols = []
         
+        # (editor id, document revision, file path) of the last parse
+        # request sent to the worker and of the result shown in the tree
+        self._requested_key = None
+        self._applied_key = None
+        
+        self._parse_worker = OutlineParseWorker(self)
+        self._parse_worker.parsed.connect(self._on_parsed)
+        
         self.init_ui()
     
     def init_ui(self):
@@ -46,7 +109,7 @@ class OutlineWidget(QWidget):
         refresh_btn = QPushButton("🔄")
         refresh_btn.setFixedSize(24, 24)
         refresh_btn.setToolTip("Refresh outline")
-        refresh_btn.clicked.connect(self.refresh_outline)
+        refresh_btn.clicked.connect(lambda: self.refresh_outline(force=True))
         refresh_btn.setStyleSheet("""
             QPushButton {
                 background-color: #3C3F41;
@@ -175,69 +238,163 @@ class OutlineWidget(QWidget):
         self._refresh_timer.start(500)
     
 
-    def refresh_outline(self):
-        """Refresh the outline from current editor"""
-        self.tree.clear()
-        self.symbols = []
-        
+    def refresh_outline(self, force: bool = False):
+        """
+        Refresh the outline from current editor.
+
+        Parsing happens on the worker thread; nothing is done if the
+        document revision has not changed since the last parse.
+
+        Args:
+            force: Re-parse even if the document revision is unchanged
+        """
         if not self.current_editor or not self.current_editor.file_path:
+            self._requested_key = self._applied_key = None
+            self.symbols = []
+            self.tree.clear()
             self.info_label.setText("No file open")
             return
         
-        # Parse symbols
-        content = self.current_editor.toPlainText()
-        self.symbols = OutlineParser.parse(
-            self.current_editor.file_path,
-            content
-        )
+        editor = self.current_editor
+        key = (id(editor), editor.document().revision(), editor.file_path)
+        if not force and key in (self._requested_key, self._applied_key):
+            return
         
-        if not self.symbols:
-            self.info_label.setText("No symbols found")
+        self._requested_key = key
+        if not self._parse_worker.isRunning():
+            self._parse_worker.start()
+        self._parse_worker.request(key, editor.file_path, editor.toPlainText())
+
+    def _on_parsed(self, key, symbols):
+        """Apply a parse result from the worker (ignored if superseded)"""
+        if key != self._requested_key:
             return
         
-        # Populate tree
-        self.populate_tree(self.symbols)
-        self.info_label.setText(f"{len(self.symbols)} symbol(s)")
+        self._applied_key = key
+        self.symbols = symbols
+        self.populate_tree(symbols)
+        
+        if not symbols:
+            self.info_label.setText("No symbols found")
+        else:
+            self.info_label.setText(f"{len(symbols)} symbol(s)")
 
 
     def populate_tree(self, symbols):
         """
-        Populate tree widget with symbols
+        Bring the tree in line with symbols, touching only changed items.
+
+        Items are matched by key (type, name, occurrence among siblings);
+        matched items are updated in place, new ones inserted, vanished ones
+        removed and reordered ones moved. Expansion, selection and scroll
+        position survive the update.
         
         Args:
             symbols: List of Symbol objects
         """
+        current = self.tree.currentItem()
+        selected_path = self._item_path(current) if current else None
+        scroll_value = self.tree.verticalScrollBar().value()
+        
+        items_by_path = {}
+        self.tree.setUpdatesEnabled(False)
+        try:
+            self._sync_children(None, symbols, (), items_by_path)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+        
+        if selected_path in items_by_path:
+            item = items_by_path[selected_path]
+            if self.tree.currentItem() is not item:
+                self.tree.setCurrentItem(item)
+        self.tree.verticalScrollBar().setValue(scroll_value)
+        
+        if self.search_input.text():
+            self.filter_symbols(self.search_input.text())
+
+    @staticmethod
+    def _symbol_keys(symbols):
+        """Stable keys for a sibling list: (type, name, occurrence)"""
+        seen = {}
+        keys = []
         for symbol in symbols:
-            self.add_symbol_to_tree(symbol, None)
-        
-        # Expand all top-level items
-        for i in range(self.tree.topLevelItemCount()):
-            self.tree.topLevelItem(i).setExpanded(True)
+            base = (symbol.type, symbol.name)
+            occurrence = seen.get(base, 0)
+            seen[base] = occurrence + 1
+            keys.append(base + (occurrence,))
+        return keys
 
+    def _item_path(self, item: QTreeWidgetItem):
+        """Tuple of diff keys from the top level down to item"""
+        path = []
+        while item is not None:
+            path.append(item.data(0, SYMBOL_KEY_ROLE))
+            item = item.parent()
+        return tuple(reversed(path))
 
-    def add_symbol_to_tree(self, symbol: Symbol, parent_item: QTreeWidgetItem):
-        """
-        Add a symbol to the tree
-        
-        Args:
-            symbol: Symbol object
-            parent_item: Parent QTreeWidgetItem (None for top-level)
-        """
-        # Create item text with icon and line number
-        item_text = f"{symbol.get_icon()} {symbol.name}  (line {symbol.line})"
-        
-        if parent_item:
-            item = QTreeWidgetItem(parent_item, [item_text])
+    def _sync_children(self, parent_item, symbols, parent_path, items_by_path):
+        """Diff one level of the tree (parent_item None = top level)"""
+        if parent_item is None:
+            count = self.tree.topLevelItemCount
+            child = self.tree.topLevelItem
+            index_of = self.tree.indexOfTopLevelItem
+            take = self.tree.takeTopLevelItem
+            insert = self.tree.insertTopLevelItem
         else:
-            item = QTreeWidgetItem(self.tree, [item_text])
-        
-        # Store line number in item data
-        item.setData(0, Qt.ItemDataRole.UserRole, symbol.line)
-        
-        # Add children recursively
-        for child in symbol.children:
-            self.add_symbol_to_tree(child, item)
+            count = parent_item.childCount
+            child = parent_item.child
+            index_of = parent_item.indexOfChild
+            take = parent_item.takeChild
+            insert = parent_item.insertChild
+        
+        keys = self._symbol_keys(symbols)
+        wanted = set(keys)
+        
+        # Remove items whose symbol vanished (back to front keeps indexes valid)
+        existing = {}
+        for i in range(count() - 1, -1, -1):
+            item = child(i)
+            key = item.data(0, SYMBOL_KEY_ROLE)
+            if key in wanted and key not in existing:
+                existing[key] = item
+            else:
+                take(i)
+        
+        for position, (symbol, key) in enumerate(zip(symbols, keys)):
+            item = existing.get(key)
+            if item is None:
+                item = QTreeWidgetItem()
+                item.setData(0, SYMBOL_KEY_ROLE, key)
+                insert(position, item)
+                # New top-level symbols start expanded, like a fresh outline
+                item.setExpanded(parent_item is None)
+            elif index_of(item) != position:
+                expanded = self._expanded_state(item)
+                take(index_of(item))
+                insert(position, item)
+                self._restore_expanded_state(expanded)
+            
+            item_text = f"{symbol.get_icon()} {symbol.name}  (line {symbol.line})"
+            if item.text(0) != item_text:
+                item.setText(0, item_text)
+            if item.data(0, Qt.ItemDataRole.UserRole) != symbol.line:
+                item.setData(0, Qt.ItemDataRole.UserRole, symbol.line)
+            
+            path = parent_path + (key,)
+            items_by_path[path] = item
+            self._sync_children(item, symbol.children, path, items_by_path)
 
+    def _expanded_state(self, item: QTreeWidgetItem):
+        """Expansion flags of item and its descendants"""
+        state = [(item, item.isExpanded())]
+        for i in range(item.childCount()):
+            state.extend(self._expanded_state(item.child(i)))
+        return state
+
+    @staticmethod
+    def _restore_expanded_state(state):
+        for item, expanded in state:
+            item.setExpanded(expanded)
 
     def on_item_clicked(self, item: QTreeWidgetItem, column: int):
         """Handle item click - jump to symbol"""
@@ -368,6 +525,8 @@ class OutlineWidget(QWidget):
         if hasattr(self, '_refresh_timer'):
             self._refresh_timer.stop()
         
+        self._parse_worker.stop()
+        
         if self.current_editor:
             try:
                 self.current_editor.textChanged.disconnect(self.on_text_changed)
@@ -0,0 +1,216 @@
+# ============================================================================
+# ParseCache.py - Shared per-document parse results
+# ============================================================================
+
+"""
+Parse Cache
+
+The same buffer used to be parsed separately by the outline panel, the code
+folding manager, the symbol indexer and the Ollama context builder. The
+cache keeps one ParseResult per (file path, content) pair and computes each
+artefact lazily, at most once:
+
+- the Python AST
+- the outline symbols (OutlineParser)
+- the fold regions per folding language (CodeFoldingParser)
+
+Lookups are keyed by a content hash, so two editors showing the same text
+share a result and a save does not invalidate anything. Editors get an
+extra fast path keyed by (editor, document revision) that skips hashing
+the text when nothing changed since the last lookup.
+
+The cache is thread safe; the outline worker uses it off the GUI thread.
+"""
+
+import ast
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class ParseResult:
+    """
+    Parse artefacts of one piece of content.
+
+    Every property is computed on first access and then reused. Two threads
+    racing on the same property may both compute it; the results are equal
+    and the last one wins, so no locking is needed here.
+    """
+
+    _UNSET = object()
+
+    def __init__(self, file_path: str, content: str):
+        self.file_path = file_path
+        self.content = content
+        self.suffix = Path(file_path).suffix.lower() if file_path else ''
+        self._tree = self._UNSET
+        self._syntax_error = None
+        self._outline = None
+        self._folds: Dict[str, list] = {}
+
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """Python AST of the content, or None if it does not parse"""
+        if self._tree is self._UNSET:
+            try:
+                self._tree = ast.parse(self.content)
+            except (SyntaxError, ValueError) as e:
+                self._syntax_error = e
+                self._tree = None
+        return self._tree
+
+    @property
+    def syntax_error(self) -> Optional[Exception]:
+        """The error raised by ast.parse, if any"""
+        self.tree
+        return self._syntax_error
+
+    @property
+    def outline(self) -> list:
+        """Outline symbols (list of OutlineParser.Symbol)"""
+        if self._outline is None:
+            from ide.core.OutlineParser import OutlineParser, PythonParser
+
+            if self.suffix == '.py':
+                tree = self.tree
+                self._outline = PythonParser.from_tree(tree) if tree is not None else []
+            else:
+                self._outline = OutlineParser.parse(self.file_path, self.content)
+        return self._outline
+
+    def fold_regions(self, language: str) -> list:
+        """
+        Fold regions for a folding language.
+
+        Returns fresh FoldRegion copies: the folding manager mutates
+        is_folded, which must not leak into other editors.
+
+        Args:
+            language: CodeFoldingParser language name
+
+        Returns:
+            List of FoldRegion objects
+        """
+        regions = self._folds.get(language)
+        if regions is None:
+            from ide.core.CodeFolding import CodeFoldingParser
+
+            regions = CodeFoldingParser(language).parse(self.content)
+            self._folds[language] = regions
+        return [replace(region, is_folded=False) for region in regions]
+
+
+class ParseCache:
+    """
+    LRU cache of ParseResult objects keyed by (file path, content hash).
+
+    Use the module level get_parse_cache() to share one instance across the
+    IDE.
+    """
+
+    MAX_ENTRIES = 32
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, bytes], ParseResult]" = OrderedDict()
+        # editor -> (document revision, content key); weak so closed
+        # editors drop out on their own
+        self._revisions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(file_path: str, content: str) -> Tuple[str, bytes]:
+        digest = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return (file_path or '', digest)
+
+    def lookup(self, file_path: str, content: str, store: bool = True) -> ParseResult:
+        """
+        Get the parse result for some content.
+
+        Args:
+            file_path: Path of the file (selects the outline parser)
+            content: Full text to parse
+            store: Insert the result on a miss. Bulk indexing passes False
+                so files that are not open do not evict open buffers.
+
+        Returns:
+            ParseResult, shared with other callers on a hit
+        """
+        key = self._key(file_path, content)
+        with self._lock:
+            result = self._get(key)
+            if result is not None:
+                return result
+
+        result = ParseResult(file_path, content)
+        if store:
+            with self._lock:
+                self._put(key, result)
+        return result
+
+    def for_editor(self, editor) -> ParseResult:
+        """
+        Get the parse result for an editor's current text.
+
+        Args:
+            editor: CodeEditor instance
+
+        Returns:
+            ParseResult of the editor's document at its current revision
+        """
+        revision = editor.document().revision()
+        file_path = editor.file_path or ''
+
+        with self._lock:
+            known = self._revisions.get(editor)
+            if known is not None and known[0] == revision and known[1][0] == file_path:
+                result = self._get(known[1])
+                if result is not None:
+                    return result
+
+        content = editor.toPlainText()
+        key = self._key(file_path, content)
+        with self._lock:
+            self._revisions[editor] = (revision, key)
+            result = self._get(key)
+            if result is None:
+                result = ParseResult(file_path, content)
+                self._put(key, result)
+        return result
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+            self._revisions.clear()
+
+    # Internal helpers (caller holds the lock)
+
+    def _get(self, key) -> Optional[ParseResult]:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def _put(self, key, result: ParseResult):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_shared_cache = ParseCache()
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the IDE-wide parse cache"""
+    return _shared_cache
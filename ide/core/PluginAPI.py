@@ -61,9 +61,12 @@ class PluginAPI:
             'on_cursor_moved': [],          # Called when cursor moves
             'on_selection_changed': [],     # Called when selection changes
             'on_text_changed': [],          # Called when text changes
+            'on_definition_requested': [],  # Called on Ctrl+click in an editor
+            'on_completion_requested': [],  # Called when typing an identifier in an editor
 
             # IDE events
             'on_project_opened': [],        # Called when project is activated
+            'on_projects_changed': [],      # Called with the active project paths after a toggle
             'on_workspace_opened': [],      # Called when IDE starts
             'on_workspace_closed': [],      # Called when IDE closes
         }
@@ -249,6 +252,35 @@ class PluginAPI:
             return True
         return False
 
+    def get_settings_snapshot(self):
+        """Get the current immutable SettingsSnapshot (None if unavailable)"""
+        if hasattr(self.ide, 'settings_manager'):
+            return self.ide.settings_manager.snapshot
+        return None
+
+    def subscribe_settings(self, callback, keys=None):
+        """
+        Call callback(snapshot, changed_keys) whenever settings change.
+
+        Plugins should keep the values they need in local fields and refresh
+        them here, instead of reading settings on every use.
+
+        Args:
+            callback: Receives the new SettingsSnapshot and changed keys
+            keys: Only notify when one of these keys changed (None = any)
+
+        Returns:
+            Handle for unsubscribe_settings(), or None if unavailable
+        """
+        if hasattr(self.ide, 'settings_manager'):
+            return self.ide.settings_manager.subscribe(callback, keys)
+        return None
+
+    def unsubscribe_settings(self, handle):
+        """Remove a callback registered with subscribe_settings()"""
+        if handle is not None and hasattr(self.ide, 'settings_manager'):
+            self.ide.settings_manager.unsubscribe(handle)
+
     # =========================================================================
     # IDE Access Methods
     # =========================================================================
@@ -271,6 +303,17 @@ class PluginAPI:
         """
         return self.ide.workspace_path
 
+    def get_active_projects(self) -> List[str]:
+        """
+        Get the projects checked in the Projects panel
+
+        Returns:
+            List of project paths as strings
+        """
+        if hasattr(self.ide, 'projects_panel'):
+            return self.ide.projects_panel.get_active_projects()
+        return self.get_setting('active_projects', [])
+
     def get_file_tree(self):
         """
         Get file tree widget
@@ -0,0 +1,67 @@
+"""
+Event-driven statistics for plugin panels
+
+A data source calls notify() whenever its counters change (from any
+thread); the publisher collects the statistics once and emits them on the
+GUI thread, at most once per min_interval_ms however many changes arrive
+in between. Nothing runs while nothing changes, so a panel showing the
+statistics costs no CPU when the IDE is idle.
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class StatsPublisher(QObject):
+    """Rate-limited publication of a statistics dictionary"""
+
+    # Latest statistics
+    stats_changed = pyqtSignal(dict)
+
+    # Queued to the GUI thread by notify()
+    _notified = pyqtSignal()
+
+    def __init__(self, collect: Callable[[], Dict], min_interval_ms: int = 500, parent=None):
+        """
+        Args:
+            collect: Returns the current statistics; cheap, it reads
+                counters kept up to date by the data source
+            min_interval_ms: Minimum time between two stats_changed signals
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.collect = collect
+        self.min_interval_ms = min_interval_ms
+        self._stats: Optional[Dict] = None
+        self._last_publish = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.publish)
+        self._notified.connect(self._schedule)
+
+    def notify(self):
+        """Report a change of the statistics (thread-safe)"""
+        self._notified.emit()
+
+    def current(self) -> Dict:
+        """Latest published statistics, collected now if there are none"""
+        if self._stats is None:
+            self._stats = self.collect()
+        return self._stats
+
+    def publish(self):
+        """Collect and emit the statistics now"""
+        self._timer.stop()
+        self._last_publish = time.monotonic()
+        self._stats = self.collect()
+        self.stats_changed.emit(self._stats)
+
+    def _schedule(self):
+        if self._timer.isActive():
+            # Already due: this change is included
+            return
+        elapsed_ms = (time.monotonic() - self._last_publish) * 1000
+        self._timer.start(max(0, int(self.min_interval_ms - elapsed_ms)))
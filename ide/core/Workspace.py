@@ -27,6 +27,7 @@ from ide import VERSION
 from ide.core.Plugin import PluginManager
 from ide.core.PluginAPI import PluginAPI
 from ide.core.FindReplace import FindReplaceWidget
+from ide.core.FindInFilesPanel import FindInFilesPanel
 from ide.core.QuickOpen import QuickOpenDialog
 from ide.core.Settings import SettingsDialog
 from ide.core.SettingDescriptor import SettingType, SettingsProvider, SettingDescriptor
@@ -301,42 +302,11 @@ class Workspace(QMainWindow, SettingsProvider):
         self._auto_save_enabled = self.settings_manager.get('auto_save', False)
 
         # ========================================================================
-        # Editor Settings (from CodeEditor - when you implement it)
-        # Apply to all open editors
+        # Editor Settings (from CodeEditor SETTINGS_DESCRIPTORS)
         # ========================================================================
 
-        editor_font_size = self.settings_manager.get('editor_font_size', 10)
-        tab_width = self.settings_manager.get('tab_width', 4)
-        show_line_numbers = self.settings_manager.get('show_line_numbers', True)
-        gutter_width = self.settings_manager.get('gutter_width', 10)
-
-        # Apply to all tabs in the current tab widget
-        if hasattr(self, 'tabs'):
-            for i in range(self.tabs.count()):
-                editor = self.tabs.widget(i)
-                if isinstance(editor, CodeEditor):
-                    # Update editor settings
-                    if hasattr(editor, 'set_font_size'):
-                        editor.set_font_size(editor_font_size)
-                    if hasattr(editor, 'set_tab_width'):
-                        editor.set_tab_width(tab_width)
-                    if hasattr(editor, 'set_show_line_numbers'):
-                        editor.set_show_line_numbers(show_line_numbers)
-                    if hasattr(editor, 'set_gutter_width'):
-                        editor.set_gutter_width(gutter_width)
-
-        # If using split editor manager, apply to all groups
-        if hasattr(self, 'split_manager'):
-            for editor in self.split_manager.get_all_editors():
-                if isinstance(editor, CodeEditor):
-                    if hasattr(editor, 'set_font_size'):
-                        editor.set_font_size(editor_font_size)
-                    if hasattr(editor, 'set_tab_width'):
-                        editor.set_tab_width(tab_width)
-                    if hasattr(editor, 'set_show_line_numbers'):
-                        editor.set_show_line_numbers(show_line_numbers)
-                    if hasattr(editor, 'set_gutter_width'):
-                        editor.set_gutter_width(gutter_width)
+        # Nothing to do here: every editor is bound to settings_manager via
+        # CodeEditor.bind_settings() and reacts to settings_changed itself.
 
     def should_restore_session(self):
         """Check if we should restore the session on startup"""
@@ -369,6 +339,12 @@ class Workspace(QMainWindow, SettingsProvider):
         self._create_editor_area()
         self._create_right_sidebar()
 
+        # Find in Files results, docked below the editors
+        self.find_in_files = FindInFilesPanel(self.projects_panel.get_active_projects, self)
+        self.find_in_files.location_requested.connect(self.open_location)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.find_in_files)
+        self.find_in_files.hide()
+
         # Set initial splitter proportions
         self.main_splitter.setStretchFactor(0, 1)  # Left
         self.main_splitter.setStretchFactor(1, 4)  # Center
@@ -422,6 +398,7 @@ class Workspace(QMainWindow, SettingsProvider):
         # Projects Panel
         self.projects_panel = ProjectsPanel(self.workspace_path, self)
         self.projects_panel.projects_changed.connect(self.update_tree_highlighting)
+        self.projects_panel.projects_changed.connect(self.trigger_projects_changed)
         left_tabs.addTab(self.projects_panel, "📦 Projects")
 
         self.main_splitter.addWidget(left_tabs)
@@ -529,7 +506,7 @@ class Workspace(QMainWindow, SettingsProvider):
         if isinstance(editor, CodeEditor):
             cursor = editor.textCursor()
             line = cursor.blockNumber()
-            editor.folding_manager.toggle_fold_at_line(line)
+            editor.folding_manager.toggle_fold_around_line(line)
 
     def unfold_current(self):
         self.fold_current()  # Toggle works both ways
@@ -1025,6 +1002,45 @@ class Workspace(QMainWindow, SettingsProvider):
             self.find_replace.set_editor(current_widget)
             self.find_replace.show_find()
 
+    def show_find_in_files(self):
+        """Show the Find in Files panel, searching for the editor selection"""
+        text = ''
+        current_widget = self.get_current_editor()
+        if isinstance(current_widget, CodeEditor):
+            selection = current_widget.textCursor().selectedText()
+            # A multi-line selection is not a useful query
+            if '\u2029' not in selection:
+                text = selection
+        self.find_in_files.focus_search(text)
+
+    def open_location(self, file_path: str, line: int, column: int = 0, length: int = 0):
+        """
+        Open a file with the cursor at a position
+
+        Args:
+            file_path: File to open
+            line: Line number (1-based)
+            column: Column in characters
+            length: Characters to select from the column
+        """
+        editor = self.tab_manager.open_file_by_path(Path(file_path), self.settings_manager.settings)
+        if not isinstance(editor, CodeEditor):
+            return
+
+        block = editor.document().findBlockByNumber(max(0, line - 1))
+        if not block.isValid():
+            # The file got shorter since it was searched
+            block = editor.document().lastBlock()
+        cursor = QTextCursor(block)
+        column = min(column, max(0, block.length() - 1))
+        cursor.setPosition(block.position() + column)
+        if length:
+            end = min(block.position() + column + length, block.position() + block.length() - 1)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        editor.setTextCursor(cursor)
+        editor.centerCursor()
+        editor.setFocus()
+
     def find_next(self):
         """Find next occurrence"""
         if self.find_replace.isVisible():
@@ -1365,6 +1381,7 @@ class Workspace(QMainWindow, SettingsProvider):
 <tr><td><b>Ctrl+D</b></td><td>Duplicate Line/Selection</td></tr>
 <tr><td><b>Ctrl+F</b></td><td>Find</td></tr>
 <tr><td><b>Ctrl+H</b></td><td>Replace</td></tr>
+<tr><td><b>Ctrl+Shift+F</b></td><td>Find in Files</td></tr>
 <tr><td><b>F3</b></td><td>Find Next</td></tr>
 <tr><td><b>Shift+F3</b></td><td>Find Previous</td></tr>
 <tr><td><b>Ctrl+/</b></td><td>Toggle Comment</td></tr>
@@ -1547,6 +1564,32 @@ class Workspace(QMainWindow, SettingsProvider):
         if hasattr(self, 'plugin_api'):
             self.plugin_api.trigger_hook('on_cursor_moved', editor, line, column)
 
+    def connect_editor_hooks(self, editor):
+        """Route a new editor's signals to the plugin hook triggers"""
+        editor.textChanged.connect(lambda: self.trigger_text_changed(editor))
+        editor.definition_requested.connect(lambda: self.trigger_definition_requested(editor))
+        editor.completion_requested.connect(lambda: self.trigger_completion_requested(editor))
+
+    def trigger_text_changed(self, editor):
+        """Trigger text changed hook"""
+        if hasattr(self, 'plugin_api'):
+            self.plugin_api.trigger_hook('on_text_changed', editor)
+
+    def trigger_definition_requested(self, editor):
+        """Trigger definition requested hook (Ctrl+click)"""
+        if hasattr(self, 'plugin_api'):
+            self.plugin_api.trigger_hook('on_definition_requested', editor)
+
+    def trigger_completion_requested(self, editor):
+        """Trigger completion requested hook (typing an identifier)"""
+        if hasattr(self, 'plugin_api'):
+            self.plugin_api.trigger_hook('on_completion_requested', editor)
+
+    def trigger_projects_changed(self):
+        """Trigger projects changed hook"""
+        if hasattr(self, 'plugin_api'):
+            self.plugin_api.trigger_hook('on_projects_changed', self.projects_panel.get_active_projects())
+
 
     # =====================================================================
     # Application Lifecycle
@@ -1564,6 +1607,10 @@ class Workspace(QMainWindow, SettingsProvider):
         if hasattr(self, 'outline_widget'):
             self.outline_widget.cleanup()
 
+        # Stop a running Find in Files search
+        if hasattr(self, 'find_in_files'):
+            self.find_in_files.stop()
+
         # Trigger workspace closing hook
         if hasattr(self, 'plugin_api'):
             self.plugin_api.trigger_hook('on_workspace_closed')
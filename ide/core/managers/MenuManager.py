@@ -231,6 +231,7 @@ class MenuManager:
         self._add_action(menu, "Toggle Comment", "Ctrl+/", self.parent.toggle_comment)
         self._add_action(menu, "Find", "Ctrl+F", self.parent.show_find_replace)
         self._add_action(menu, "Replace", "Ctrl+H", self.parent.show_find_replace)
+        self._add_action(menu, "Find in Files...", "Ctrl+Shift+F", self.parent.show_find_in_files)
 
         return menu
 
@@ -3,18 +3,93 @@
 # ============================================================================
 
 import json
+from collections.abc import Mapping
 from pathlib import Path
-from typing import List, Type
+from types import MappingProxyType
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional, Type
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
 from ide.core.SettingDescriptor import SettingType, SettingsProvider, SettingDescriptor
 
 
-class SettingsManager:
-    """Manages application settings persistence with component registration"""
+_MISSING = object()
+
+
+def _freeze(value):
+    """Recursively convert containers to immutable equivalents"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+class SettingsSnapshot(Mapping):
+    """
+    Immutable view of all settings at one point in time.
+
+    Values have already been coerced by their SettingDescriptor, lists are
+    frozen to tuples and dicts to read-only mappings. Supports both mapping
+    access (snapshot['tab_width'], snapshot.get(...)) and attribute access
+    (snapshot.tab_width).
+    """
+
+    __slots__ = ('_values', 'revision')
+
+    def __init__(self, values: dict, revision: int = 0):
+        object.__setattr__(self, '_values', {k: _freeze(v) for k, v in values.items()})
+        object.__setattr__(self, 'revision', revision)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getattr__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        raise AttributeError("SettingsSnapshot is immutable")
+
+    def changed_keys(self, other: Optional['SettingsSnapshot']) -> FrozenSet[str]:
+        """Keys whose value differs between this snapshot and other"""
+        if other is None:
+            return frozenset(self._values)
+        keys = self._values.keys() | other._values.keys()
+        return frozenset(
+            k for k in keys
+            if self._values.get(k, _MISSING) != other._values.get(k, _MISSING)
+        )
+
+
+class SettingsManager(QObject):
+    """
+    Manages application settings persistence with component registration.
+
+    Every load/set/update publishes a new SettingsSnapshot. Components
+    connect to settings_changed (or use subscribe()) and keep their own
+    fields, updated only when a key they care about actually changed.
+    """
+
+    # (SettingsSnapshot, frozenset of changed keys)
+    settings_changed = pyqtSignal(object, object)
 
     def __init__(self, config_file):
+        super().__init__()
         self.config_file = config_file
         self.providers: List[Type[SettingsProvider]] = []
         self.settings = {}
+        self._snapshot = SettingsSnapshot({})
         
     def register_provider(self, provider_class: Type[SettingsProvider]):
         """Register a settings provider (Workspace, CodeEditor, etc.)"""
@@ -56,6 +131,7 @@ class SettingsManager:
         
         # Validate all settings
         self.validate_all()
+        self._publish()
         return self.settings
 
     def validate_all(self):
@@ -84,11 +160,61 @@ class SettingsManager:
     def set(self, key, value):
         """Set a setting value"""
         self.settings[key] = value
+        self._publish()
 
     def update(self, new_settings):
         """Update multiple settings at once"""
         self.settings.update(new_settings)
         self.validate_all()
+        self._publish()
+
+    # ========================================================================
+    # Snapshots and change notification
+    # ========================================================================
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        """Current immutable settings snapshot"""
+        return self._snapshot
+
+    def _publish(self):
+        """Build a new snapshot and notify listeners if anything changed"""
+        previous = self._snapshot
+        current = SettingsSnapshot(self.settings, previous.revision + 1)
+        changed = current.changed_keys(previous)
+        if not changed:
+            return
+
+        self._snapshot = current
+        self.settings_changed.emit(current, changed)
+
+    def subscribe(self, callback: Callable[[SettingsSnapshot, FrozenSet[str]], Any],
+                  keys: Optional[Iterable[str]] = None):
+        """
+        Call callback(snapshot, changed_keys) whenever settings change.
+
+        Args:
+            callback: Receives the new snapshot and the set of changed keys
+            keys: Only notify when one of these keys changed (None = any)
+
+        Returns:
+            Handle to pass to unsubscribe()
+        """
+        watched = frozenset(keys) if keys is not None else None
+
+        def slot(snapshot, changed):
+            if watched is None or watched & changed:
+                callback(snapshot, changed)
+
+        self.settings_changed.connect(slot)
+        return slot
+
+    def unsubscribe(self, handle):
+        """Disconnect a callback registered with subscribe()"""
+        try:
+            self.settings_changed.disconnect(handle)
+        except (TypeError, RuntimeError):
+            pass
     
     def get_settings_by_section(self):
         """Group settings by section for organized UI display"""
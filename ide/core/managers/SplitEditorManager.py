@@ -392,9 +392,14 @@ class SplitEditorManager:
             gutter_width=settings.get('gutter_width', 10)
         )
         
+        # Follow settings changes (font, tab width, folding, ...)
+        if hasattr(self.parent, 'settings_manager'):
+            editor.bind_settings(self.parent.settings_manager)
+        
         if editor.load_file(str(path)):
             tab_index = group.add_editor(editor, path.name, str(path))
             editor.textChanged.connect(lambda: self.parent.on_editor_modified(editor))
+            self.parent.connect_editor_hooks(editor)
             
             # CRITICAL: Track which group is active when editor gets focus
             editor.focusInEvent = self._create_focus_handler(editor, group_id)
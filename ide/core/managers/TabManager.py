@@ -41,6 +41,10 @@ class TabManager:
             gutter_width=settings.get('gutter_width', 10)
         )
 
+        # Follow settings changes (font, tab width, folding, ...)
+        if hasattr(self.parent, 'settings_manager'):
+            editor.bind_settings(self.parent.settings_manager)
+
         # *** NEW: Connect file monitor ***
         if hasattr(self.parent, 'file_monitor'):
             editor.set_file_monitor(self.parent.file_monitor)
@@ -49,6 +53,7 @@ class TabManager:
             tab_index = self.tabs.addTab(editor, path.name)
             self.tabs.setTabToolTip(tab_index, str(path))
             editor.textChanged.connect(lambda: self.parent.on_editor_modified(editor))
+            self.parent.connect_editor_hooks(editor)
             self.tabs.setCurrentWidget(editor)
 
             # CRITICAL: Add focus handler for split view
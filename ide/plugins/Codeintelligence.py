@@ -13,6 +13,7 @@ from PyQt6.QtCore import QThread, pyqtSignal, QTimer
 
 # Import Code Intelligence components
 import sys
+import threading
 from pathlib import Path
 
 # Add the Codeintelligence directory to path
@@ -20,13 +21,22 @@ plugin_dir = Path(__file__).parent
 if str(plugin_dir) not in sys.path:
     sys.path.insert(0, str(plugin_dir))
 
+from ide.core.StatsPublisher import StatsPublisher
+
 from Codeintelligence.SymbolInfo import SymbolInfo
-from Codeintelligence.SymbolDatabase import SymbolDatabase
+from Codeintelligence.ShardedSymbolDatabase import ShardedSymbolDatabase
 from Codeintelligence.SymbolIndexer import SymbolIndexer
+from Codeintelligence.IndexManifest import IndexManifest
+from Codeintelligence.ParallelIndexer import ParallelIndexer
+from Codeintelligence.ReindexQueue import ReindexQueue
+from Codeintelligence.CompletionEngine import CompletionEngine, completion_prefix
+from Codeintelligence.QueryServer import QueryServer
+from Codeintelligence.WorkspaceWalker import walk_source_files
 from Codeintelligence.NavigationManager import NavigationManager
 from Codeintelligence.ReferenceTracker import ReferenceTracker
 from Codeintelligence.SymbolSearchDialog import SymbolSearchDialog
 from Codeintelligence.SymbolPanelWidget import SymbolPanelWidget
+from Codeintelligence.ReferencesPanelWidget import ReferencesPanelWidget
 
 
 # ============================================================================
@@ -48,6 +58,13 @@ class CodeIntelligencePlugin:
     PLUGIN_HAS_UI = True
     PLUGIN_ICON = "🧠"
     
+    # Seconds a save waits for further saves of the same file
+    SAVE_DELAY = 0.2
+    # Milliseconds of no typing before open buffers are indexed
+    EDIT_DELAY_MS = 500
+    # Setting enabling the query socket for external tools
+    QUERY_SERVER_SETTING = 'code_intelligence_query_server'
+    
     def __init__(self, api):
         """
         Initialize plugin instance
@@ -61,7 +78,20 @@ class CodeIntelligencePlugin:
         self.nav_manager = None
         self.ref_tracker = None
         self.symbol_panel = None
+        self.search_dialog = None
+        self.references_panel = None
         self.indexing_thread = None
+        self.reference_thread = None
+        self.load_thread = None
+        self.reindex_queue = None
+        self.completion_engine = None
+        self.query_server = None
+        self.stats = None
+        # (request id, editor, prefix) of the completion being computed
+        self._completion = None
+        self.status_label = None
+        self._edited_buffers = {}
+        self._edit_timer = None
         self.auto_index_enabled = True
         self.initialized = False
         
@@ -78,10 +108,37 @@ class CodeIntelligencePlugin:
         cache_dir = self.api.app_dirs.plugin_dir("code-intelligence")
         cache_dir.mkdir(exist_ok=True)
         
-        self.database = SymbolDatabase(cache_dir)
+        # One index shard per active project; the search indexes are
+        # loaded in the background, lookups work meanwhile and fuzzy
+        # searches wait for them
+        self.database = ShardedSymbolDatabase(cache_dir)
+        self.database.set_projects(self.api.get_active_projects())
+        # Index statistics for the panel, published when they change
+        self.stats = StatsPublisher(self.get_statistics)
+        self.database.add_stats_listener(self.stats.notify)
         self.indexer = SymbolIndexer()
         self.nav_manager = NavigationManager(self.database, self.api)
         self.ref_tracker = ReferenceTracker(self.database)
+        
+        # Saves and edits are indexed on a worker thread
+        self.reindex_queue = ReindexQueue(self.indexer, self.database)
+        self.reindex_queue.indexed.connect(self.on_file_indexed)
+        self._edit_timer = QTimer()
+        self._edit_timer.setSingleShot(True)
+        self._edit_timer.timeout.connect(self.queue_edited_buffers)
+        
+        # Completions are computed on their own thread within a budget
+        self.completion_engine = CompletionEngine(self.database)
+        self.completion_engine.completed.connect(self.on_completions_ready)
+
+        # Import graph queries for other plugins (e.g. the Ollama context)
+        self.api.set_cache('code_intelligence.dependencies', self.database.get_dependencies)
+        self.api.set_cache('code_intelligence.dependents', self.database.get_dependents)
+
+        # Optional local socket answering queries of external tools
+        self.query_server = QueryServer(self.database, self.ref_tracker, cache_dir / "query.sock")
+        if self.api.get_setting(self.QUERY_SERVER_SETTING, False):
+            self.query_server.start()
 
         print(f"{cache_dir} Plugin initialized")        
         print(f"[{self.PLUGIN_NAME}] Plugin initialized")
@@ -90,6 +147,10 @@ class CodeIntelligencePlugin:
         self.api.register_hook('on_file_saved', self.on_file_saved, plugin_id='code_intelligence')
         self.api.register_hook('on_file_opened', self.on_file_opened, plugin_id='code_intelligence')
         self.api.register_hook('on_workspace_opened', self.on_workspace_opened, plugin_id='code_intelligence')
+        self.api.register_hook('on_projects_changed', self.on_projects_changed, plugin_id='code_intelligence')
+        self.api.register_hook('on_text_changed', self.on_text_changed, plugin_id='code_intelligence')
+        self.api.register_hook('on_definition_requested', self.on_definition_requested, plugin_id='code_intelligence')
+        self.api.register_hook('on_completion_requested', self.on_completion_requested, plugin_id='code_intelligence')
         
         # Register keyboard shortcuts
         if hasattr(self.api, 'register_keyboard_shortcut'):
@@ -99,6 +160,12 @@ class CodeIntelligencePlugin:
         
         self.api.show_status_message("Code Intelligence initialized", 2000)
         
+        # Readiness of the symbol index in the status bar
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #888; padding: 0 6px;")
+        self.api.add_status_bar_widget(self.status_label, permanent=True)
+        self.load_shards()
+        
         self.initialized = True
     
     def get_widget(self, parent=None):
@@ -109,15 +176,45 @@ class CodeIntelligencePlugin:
         """Cleanup plugin resources"""
         print(f"[{self.PLUGIN_NAME}] Cleaning up...")
         
-        if self.database:
-            self.database.save_to_cache()
-            print(f"[{self.PLUGIN_NAME}] Saved symbol cache")
+        if self._edit_timer:
+            self._edit_timer.stop()
+            self._edited_buffers.clear()
+        
+        if self.reindex_queue:
+            self.reindex_queue.stop()
+        
+        if self.completion_engine:
+            self.completion_engine.stop()
+            self._completion = None
+        
+        if self.query_server:
+            self.query_server.stop()
+        
+        # Every thread using the database finishes before it is closed
+        if self.load_thread and self.load_thread.isRunning():
+            self.load_thread.wait()
         
         if self.indexing_thread and self.indexing_thread.isRunning():
             print(f"[{self.PLUGIN_NAME}] Stopping indexing thread...")
-            self.indexing_thread.terminate()
+            self.indexing_thread.cancel()
             self.indexing_thread.wait()
         
+        if self.reference_thread and self.reference_thread.isRunning():
+            self.reference_thread.cancel()
+            self.reference_thread.wait()
+        
+        self.api.clear_cache('code_intelligence.dependencies')
+        self.api.clear_cache('code_intelligence.dependents')
+        
+        if self.database:
+            self.database.save_to_cache()
+            print(f"[{self.PLUGIN_NAME}] Saved symbol cache")
+            self.database.close()
+        
+        if self.status_label:
+            self.api.remove_status_bar_widget(self.status_label)
+            self.status_label = None
+        
         if self.api:
             self.api.unregister_all_plugin_hooks('code_intelligence')
         
@@ -133,8 +230,79 @@ class CodeIntelligencePlugin:
         if not self.auto_index_enabled:
             return
         
-        self.index_file(file_path)
+        # Repeated saves within SAVE_DELAY are indexed once
+        self.reindex_queue.request(file_path, ReindexQueue.PRIORITY_SAVE, delay=self.SAVE_DELAY)
+    
+    def on_text_changed(self, editor):
+        """Handle typing - index the buffer once the user pauses"""
+        if not self.auto_index_enabled or not self.reindex_queue:
+            return
+        
+        file_path = getattr(editor, 'file_path', None)
+        if not file_path or Path(file_path).suffix.lower() not in SymbolIndexer.EXTENSIONS:
+            return
+        
+        self._edited_buffers[id(editor)] = editor
+        self._edit_timer.start(self.EDIT_DELAY_MS)
+    
+    def queue_edited_buffers(self):
+        """Queue the text of the buffers edited since the last pause"""
+        editors, self._edited_buffers = list(self._edited_buffers.values()), {}
+        for editor in editors:
+            try:
+                document = editor.document()
+                if not document.isModified():
+                    # Saved meanwhile: the save job reads the file
+                    continue
+                self.reindex_queue.request(
+                    editor.file_path, ReindexQueue.PRIORITY_EDIT,
+                    content=editor.toPlainText(),
+                    revision=(id(document), document.revision()),
+                )
+            except RuntimeError:
+                # Editor closed before the timer fired
+                continue
+    
+    def on_definition_requested(self, editor):
+        """Handle Ctrl+click - the click already moved the cursor"""
+        if editor is self.api.get_current_editor():
+            self.jump_to_definition()
+    
+    def on_completion_requested(self, editor):
+        """Handle typing an identifier - complete it on the engine thread"""
+        if not self.completion_engine:
+            return
         
+        file_path = getattr(editor, 'file_path', None)
+        if not file_path or Path(file_path).suffix.lower() not in SymbolIndexer.EXTENSIONS:
+            return
+        
+        cursor = editor.textCursor()
+        found = completion_prefix(cursor.block().text(), cursor.positionInBlock())
+        if found is None or (found[1] is None and len(found[0]) < CompletionEngine.MIN_PREFIX):
+            self.completion_engine.cancel()
+            self._completion = None
+            editor.hide_completions()
+            return
+        
+        prefix, qualifier = found
+        request_id = self.completion_engine.request(file_path, prefix, qualifier, cursor.blockNumber() + 1)
+        self._completion = (request_id, editor, prefix)
+    
+    def on_completions_ready(self, request_id: int, completions: list):
+        """Show the answer to the latest completion request"""
+        if not self._completion or self._completion[0] != request_id:
+            return
+        _, editor, prefix = self._completion
+        self._completion = None
+        try:
+            editor.show_completions(prefix, [(c.name, c.kind) for c in completions])
+        except RuntimeError:
+            # Editor closed meanwhile
+            pass
+    
+    def on_file_indexed(self, file_path: str, symbol_count: int):
+        """Handle a queued re-index finishing"""
         if self.symbol_panel and self.symbol_panel.current_file == file_path:
             self.symbol_panel.refresh_symbols()
     
@@ -147,38 +315,104 @@ class CodeIntelligencePlugin:
         """Handle workspace open"""
         print(f"[{self.PLUGIN_NAME}] Workspace opened")
     
+    def on_projects_changed(self, project_paths: list):
+        """
+        Handle a project toggle - mount the shards of activated projects
+        and unload the shards of deactivated ones
+        
+        Args:
+            project_paths: Active project paths
+        """
+        if not self.database:
+            return
+        
+        interrupted = bool(self.indexing_thread and self.indexing_thread.isRunning())
+        if interrupted:
+            # Its shards may be unmounted under it; restarted below
+            self.indexing_thread.cancel()
+            self.indexing_thread.wait()
+        
+        mounted, unmounted = self.database.set_projects(project_paths)
+        if mounted:
+            self.load_shards()
+        if interrupted or (mounted and self.auto_index_enabled):
+            # Unchanged files are skipped, so this mostly costs a walk
+            self.index_projects(project_paths if interrupted else mounted)
+        elif unmounted:
+            total = self.database.get_statistics()['total_symbols']
+            self.set_index_status(f"{total:,} symbols")
+    
     # ========================================================================
     # Indexing Methods
     # ========================================================================
     
     def index_file(self, file_path: str):
-        """Index a single file"""
-        if not self.database or not self.indexer:
+        """Queue a single file for indexing from disk"""
+        if not self.reindex_queue:
             return
         
-        try:
-            self.database.remove_file(file_path)
-            symbols = self.indexer.index_file(file_path)
-            self.database.add_symbols(symbols)
-            print(f"[{self.PLUGIN_NAME}] Indexed {file_path}: {len(symbols)} symbols")
-        except Exception as e:
-            print(f"[{self.PLUGIN_NAME}] Error indexing {file_path}: {e}")
+        self.reindex_queue.request(file_path, ReindexQueue.PRIORITY_SAVE)
     
     def index_workspace(self):
         """Index active projects (background thread)"""
-        settings = self.api.get_settings()
-        active_projects = settings.get('active_projects', [])
+        active_projects = self.api.get_active_projects()
         
         if not active_projects:
             self.api.show_status_message("No active projects selected", 3000)
             return
         
-        self.indexing_thread = IndexingThread(active_projects, self.indexer, self.database)
+        if self.indexing_thread and self.indexing_thread.isRunning():
+            self.api.show_status_message("Indexing already running", 2000)
+            return
+        
+        self.database.set_projects(active_projects)
+        self.load_shards()
+        self.index_projects(active_projects)
+    
+    def index_projects(self, project_paths: list):
+        """
+        Index some projects in the background
+        
+        Args:
+            project_paths: Projects with a mounted shard
+        """
+        self.indexing_thread = IndexingThread(project_paths, self.indexer, self.database)
         self.indexing_thread.progress.connect(self.on_indexing_progress)
         self.indexing_thread.finished_signal.connect(self.on_indexing_complete)
         self.indexing_thread.start()
         
-        self.api.show_status_message(f"Indexing {len(active_projects)} projects...", 2000)
+        self.api.show_status_message(f"Indexing {len(project_paths)} projects...", 2000)
+        self.set_index_status("Indexing…")
+    
+    def load_shards(self):
+        """Load the search indexes of newly mounted shards in the background"""
+        if self.database.is_ready() or (self.load_thread and self.load_thread.isRunning()):
+            # A running load picks the new shards up (see on_cache_loaded)
+            return
+        
+        self.set_index_status("Loading symbols…")
+        self.load_thread = CacheLoadThread(self.database)
+        self.load_thread.loaded.connect(self.on_cache_loaded)
+        self.load_thread.start()
+    
+    def set_index_status(self, text: str):
+        """Show the index state in the status bar"""
+        if self.status_label:
+            self.status_label.setText(f"{self.PLUGIN_ICON} {text}")
+    
+    def on_cache_loaded(self, total_symbols: int):
+        """Handle the background cache load finishing"""
+        if self.search_dialog:
+            self.search_dialog.refresh()
+        
+        if not self.database.is_ready():
+            # Shards were mounted after the load had passed them
+            self.load_thread.wait()
+            self.load_shards()
+            return
+        
+        if not (self.indexing_thread and self.indexing_thread.isRunning()):
+            self.set_index_status(f"{total_symbols:,} symbols")
     
     def on_indexing_progress(self, message: str):
         """Handle indexing progress"""
@@ -187,6 +421,7 @@ class CodeIntelligencePlugin:
     def on_indexing_complete(self, total_symbols: int):
         """Handle indexing completion"""
         self.api.show_status_message(f"Indexing complete: {total_symbols:,} symbols", 3000)
+        self.set_index_status(f"{total_symbols:,} symbols")
         
         if self.database:
             self.database.save_to_cache()
@@ -201,23 +436,26 @@ class CodeIntelligencePlugin:
             return
         
         dialog = SymbolSearchDialog(self.database, self.nav_manager, parent=self.api.ide)
-        if dialog.exec():
-            if dialog.selected_symbol:
-                self.nav_manager.jump_to_symbol(dialog.selected_symbol)
+        # Refreshed by on_cache_loaded while the index is loading
+        self.search_dialog = dialog
+        try:
+            accepted = dialog.exec()
+        finally:
+            self.search_dialog = None
+        if accepted and dialog.selected_symbol:
+            self.nav_manager.jump_to_symbol(dialog.selected_symbol)
     
     def jump_to_definition(self):
         """Jump to definition of symbol at cursor"""
         if not self.nav_manager:
             return
         
-        result = self.nav_manager.get_symbol_at_cursor()
+        result = self.nav_manager.definition_at_cursor()
         if not result:
             self.api.show_status_message("No symbol at cursor", 2000)
             return
         
-        symbol_name, file_path, line, column = result
-        definition = self.nav_manager.find_definition(symbol_name, file_path)
-        
+        symbol_name, definition = result
         if definition:
             self.nav_manager.jump_to_symbol(definition)
         else:
@@ -234,13 +472,65 @@ class CodeIntelligencePlugin:
             return
         
         symbol_name, file_path, line, column = result
-        references = self.ref_tracker.find_all_references(symbol_name)
         
-        if references:
-            self.api.show_status_message(f"Found {len(references)} references to '{symbol_name}'", 3000)
+        if self.reference_thread and self.reference_thread.isRunning():
+            self.reference_thread.cancel()
+        
+        if self.references_panel is None:
+            self.references_panel = ReferencesPanelWidget(self.nav_manager)
+            self.references_panel.stop_requested.connect(self.stop_reference_search)
+            self.api.add_to_right_sidebar(self.references_panel, "References", "🔗")
+        self.references_panel.start(symbol_name)
+        self.api.focus_right_sidebar_tab("References")
+        
+        # Until the first indexing run has finished, project files the
+        # index does not know yet are scanned as well
+        project_paths = []
+        if not self.database.get_indexed_files() or (
+                self.indexing_thread and self.indexing_thread.isRunning()):
+            project_paths = self.api.get_active_projects()
+        
+        thread = ReferenceSearchThread(self.ref_tracker, symbol_name, project_paths)
+        # Results of a superseded search are dropped
+        thread.references_found.connect(
+            lambda refs, t=thread: t is self.reference_thread and self.references_panel.add_references(refs))
+        thread.finished_signal.connect(
+            lambda *result, t=thread: t is self.reference_thread and self.on_references_complete(*result))
+        self.reference_thread = thread
+        thread.start()
+    
+    def stop_reference_search(self):
+        """Cancel the running find-references search"""
+        if self.reference_thread and self.reference_thread.isRunning():
+            self.reference_thread.cancel()
+    
+    def on_references_complete(self, count: int, truncated: bool, cancelled: bool):
+        """Handle find-references completion"""
+        self.references_panel.finish(truncated, cancelled)
+        symbol_name = self.reference_thread.symbol_name
+        if count:
+            self.api.show_status_message(f"Found {count} references to '{symbol_name}'", 3000)
         else:
             self.api.show_status_message(f"No references found for '{symbol_name}'", 2000)
     
+    def set_query_server_enabled(self, enabled: bool):
+        """
+        Start or stop the query socket and remember the choice
+        
+        Args:
+            enabled: Serve queries of external tools
+        """
+        self.api.set_setting(self.QUERY_SERVER_SETTING, enabled)
+        if not self.query_server:
+            return
+        if enabled:
+            if self.query_server.start():
+                self.api.show_status_message(f"Query server listening on {self.query_server.socket_path}", 3000)
+            else:
+                self.api.show_status_message("Query socket is in use by another IDE", 3000)
+        else:
+            self.query_server.stop()
+    
     def get_statistics(self):
         """Get database statistics"""
         if self.database:
@@ -250,7 +540,9 @@ class CodeIntelligencePlugin:
             'files_indexed': 0,
             'classes': 0,
             'functions': 0,
-            'methods': 0
+            'methods': 0,
+            'types': {},
+            'memory_bytes': 0
         }
 
 
@@ -258,52 +550,148 @@ class CodeIntelligencePlugin:
 # Background Indexing Thread
 # ============================================================================
 
+class CacheLoadThread(QThread):
+    """Background thread loading the symbol search index at startup"""
+    
+    loaded = pyqtSignal(int)   # Symbols loaded
+    
+    def __init__(self, database: ShardedSymbolDatabase):
+        super().__init__()
+        self.database = database
+    
+    def run(self):
+        """Build the search indexes of the mounted shards"""
+        self.database.load_from_cache()
+        self.loaded.emit(self.database.get_statistics()['total_symbols'])
+
+
 class IndexingThread(QThread):
     """Background thread for indexing active projects"""
     
     progress = pyqtSignal(str)
     finished_signal = pyqtSignal(int)
     
-    def __init__(self, project_paths: list, indexer: SymbolIndexer, database: SymbolDatabase):
+    def __init__(self, project_paths: list, indexer: SymbolIndexer, database: ShardedSymbolDatabase):
         super().__init__()
         self.project_paths = [Path(p) for p in project_paths]
         self.indexer = indexer
         self.database = database
+        self._cancel = threading.Event()
     
-    def run(self):
-        """Index all Python files in active projects"""
-        total_symbols = 0
-        files_indexed = 0
-        
-        indexed_files = []
-        for project_path in self.project_paths:
-            if project_path.exists():
-                indexed_files.extend(list(project_path.rglob('*.py')))
-                indexed_files.extend(list(project_path.rglob('*.php')))
-                indexed_files.extend(list(project_path.rglob('*.go')))
-        
-        for i, file_path in enumerate(indexed_files, 1):
-            if any(part.startswith('.') for part in file_path.parts):
-                continue
+    def cancel(self):
+        """Stop indexing after the chunks already being parsed"""
+        self._cancel.set()
+    
+    def _on_progress(self, done: int, queued: int):
+        """ParallelIndexer progress callback (every ~100 files)"""
+        if done - self._last_report >= 100:
+            self._last_report = done
+            self.progress.emit(
+                f"Indexing: {done} changed files ({self._files_skipped} unchanged)..."
+            )
+    
+    def _changed_files(self, manifest: IndexManifest, seen: set):
+        """
+        Walk the projects once and yield the files that need indexing
+        
+        Args:
+            manifest: Manifest of the indexed files
+            seen: Filled with every source file found
             
-            if 'venv' in file_path.parts or 'env' in file_path.parts or '__pycache__' in file_path.parts:
+        Yields:
+            (file path, known content hash) for ParallelIndexer, while
+            the walk is still going
+        """
+        for path, stat in walk_source_files(self.project_paths, SymbolIndexer.EXTENSIONS):
+            seen.add(path)
+            if manifest.classify(path, stat) == IndexManifest.UNCHANGED:
+                self._files_skipped += 1
                 continue
-            
-            try:
-                self.database.remove_file(str(file_path))
-                symbols = self.indexer.index_file(str(file_path))
-                self.database.add_symbols(symbols)
-                
-                total_symbols += len(symbols)
-                files_indexed += 1
-                
-                if i % 10 == 0:
-                    self.progress.emit(f"Indexing: {files_indexed}/{len(indexed_files)} files...")
-            
-            except Exception as e:
-                print(f"[IndexingThread] Error indexing {file_path}: {e}")
+            yield path, manifest.known_hash(path)
+    
+    def run(self):
+        """
+        Index all source files in active projects
+        
+        The projects are walked once; files whose size and mtime match
+        the manifest are skipped without being read, the rest stream to
+        the ParallelIndexer process pool as they are found. Files that
+        are gone from disk are purged.
+        """
+        manifest = IndexManifest(self.database, SymbolIndexer.VERSION)
+        seen = set()
+        self._files_skipped = 0
+        self._last_report = 0
+        
+        indexer = ParallelIndexer(self.database, SymbolIndexer.VERSION)
+        stats = indexer.run(self._changed_files(manifest, seen),
+                            progress=self._on_progress, cancel=self._cancel)
+        
+        if stats['cancelled']:
+            print(f"[IndexingThread] Cancelled after {stats['indexed']} files")
+            return
+        
+        removed = manifest.missing(self.project_paths, seen)
+        for path in removed:
+            self.database.remove_file(path)
         
-        self.finished_signal.emit(total_symbols)
+        print(f"[IndexingThread] {stats['indexed']} files indexed ({stats['symbols']} symbols) "
+              f"on {indexer.max_workers} workers, {self._files_skipped + stats['unchanged']} unchanged, "
+              f"{len(removed)} removed")
+        self.finished_signal.emit(self.database.get_statistics()['total_symbols'])
+
+
+class ReferenceSearchThread(QThread):
+    """Background thread streaming find-references results"""
+    
+    references_found = pyqtSignal(list)         # References of one file
+    finished_signal = pyqtSignal(int, bool, bool)  # count, truncated, cancelled
+    
+    # Stop after this many references
+    MAX_HITS = 5000
+    
+    def __init__(self, ref_tracker: ReferenceTracker, symbol_name: str, project_paths: list = None):
+        super().__init__()
+        self.ref_tracker = ref_tracker
+        self.symbol_name = symbol_name
+        self.project_paths = [Path(p) for p in project_paths or []]
+        self._cancel = threading.Event()
+    
+    def cancel(self):
+        """Stop searching; files already being read are abandoned"""
+        self._cancel.set()
+    
+    def run(self):
+        """
+        Search indexed files, plus the files of project_paths when the
+        index may not cover them yet
+        """
+        count = 0
+        truncated = False
+        try:
+            files = None
+            if self.project_paths:
+                files = self.ref_tracker.db.get_indexed_files()
+                known = set(files)
+                files.extend(
+                    path for path, _ in walk_source_files(self.project_paths, SymbolIndexer.EXTENSIONS)
+                    if path not in known
+                )
+            
+            # One hit past the cap tells whether a hit was actually dropped
+            for references in self.ref_tracker.iter_references(
+                    self.symbol_name, files, cancel=self._cancel, max_hits=self.MAX_HITS + 1):
+                if count + len(references) > self.MAX_HITS:
+                    references = references[:self.MAX_HITS - count]
+                    truncated = True
+                count += len(references)
+                if references:
+                    self.references_found.emit(references)
+        except Exception as e:
+            # An exception escaping run() aborts the application under PyQt6
+            print(f"[ReferenceSearchThread] Search for {self.symbol_name} failed: {e}")
+        finally:
+            self.finished_signal.emit(count, truncated, self._cancel.is_set())
 
 
 # ============================================================================
@@ -321,10 +709,9 @@ class CodeIntelligenceWidget(QWidget):
         
         self.init_ui()
         
-        # Update stats every 2 seconds
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_statistics)
-        self.update_timer.start(2000)
+        # Redrawn when the index changes, not on a timer
+        if self.plugin.stats:
+            self.plugin.stats.stats_changed.connect(self.update_statistics)
     
     def init_ui(self):
         """Initialize UI"""
@@ -395,13 +782,29 @@ class CodeIntelligenceWidget(QWidget):
         self.auto_index_checkbox.stateChanged.connect(self.on_auto_index_changed)
         settings_layout.addWidget(self.auto_index_checkbox)
         
+        self.query_server_checkbox = QCheckBox("Serve queries to external tools")
+        self.query_server_checkbox.setToolTip(
+            "Answer symbol queries on a local socket (see Codeintelligence/QueryServer.py)"
+        )
+        self.query_server_checkbox.setChecked(
+            bool(self.plugin.query_server and self.plugin.query_server.is_running())
+        )
+        self.query_server_checkbox.stateChanged.connect(self.on_query_server_changed)
+        settings_layout.addWidget(self.query_server_checkbox)
+        
         layout.addLayout(settings_layout)
         
         layout.addStretch()
     
-    def update_statistics(self):
-        """Update statistics display"""
-        stats = self.plugin.get_statistics()
+    def update_statistics(self, stats=None):
+        """
+        Update statistics display
+        
+        Args:
+            stats: Published statistics; the latest ones if None
+        """
+        if stats is None:
+            stats = self.plugin.stats.current() if self.plugin.stats else self.plugin.get_statistics()
         
         stats_text = (
             f"📊 <b>Statistics:</b><br>"
@@ -409,15 +812,20 @@ class CodeIntelligenceWidget(QWidget):
             f"&nbsp;&nbsp;• Files indexed: {stats['files_indexed']:,}<br>"
             f"&nbsp;&nbsp;• Classes: {stats['classes']:,}<br>"
             f"&nbsp;&nbsp;• Functions: {stats['functions']:,}<br>"
-            f"&nbsp;&nbsp;• Methods: {stats['methods']:,}"
+            f"&nbsp;&nbsp;• Methods: {stats['methods']:,}<br>"
+            f"&nbsp;&nbsp;• Memory: {stats.get('memory_bytes', 0) / 1e6:.1f} MB"
         )
         self.stats_label.setText(stats_text)
         
         # Show active projects
-        settings = self.plugin.api.get_settings()
-        active_projects = settings.get('active_projects', [])
+        active_projects = self.plugin.api.get_active_projects()
         if active_projects:
-            project_names = [Path(p).name for p in active_projects]
+            shards = stats.get('shards', {})
+            project_names = [
+                f"{Path(p).name} ({shards[p]['total_symbols']:,} symbols, "
+                f"{shards[p]['memory_bytes'] / 1e6:.1f} MB)" if p in shards else Path(p).name
+                for p in active_projects
+            ]
             projects_text = (
                 f"📁 <b>Active Projects ({len(active_projects)}):</b><br>"
                 f"&nbsp;&nbsp;• " + "<br>&nbsp;&nbsp;• ".join(project_names)
@@ -429,9 +837,12 @@ class CodeIntelligenceWidget(QWidget):
     def on_index_workspace(self):
         """Handle index workspace button"""
         self.plugin.index_workspace()
-        QTimer.singleShot(1000, self.update_statistics)
     
     def on_auto_index_changed(self, state):
         """Handle auto-index checkbox"""
         self.plugin.auto_index_enabled = (state == 2)
         print(f"[{self.plugin.PLUGIN_NAME}] Auto-index: {self.plugin.auto_index_enabled}")
+    
+    def on_query_server_changed(self, state):
+        """Handle query server checkbox"""
+        self.plugin.set_query_server_enabled(state == 2)
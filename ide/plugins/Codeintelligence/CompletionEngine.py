@@ -0,0 +1,277 @@
+# ide/plugins/Codeintelligence/CompletionEngine.py
+
+"""
+CompletionEngine - As-you-type completion from the symbol index
+
+Each keystroke that extends an identifier sends a request to the engine
+thread. A newer request replaces one that is still waiting and cancels one
+that is running, so only the latest prefix is ever answered. Candidates
+are collected by scope proximity, every source being a prefix lookup in an
+index that already exists (or is cached after the first request in a
+file):
+
+    1. names defined in the enclosing functions, and their parameters
+    2. module-level definitions and imports of the file
+    3. identifiers used in the file, by occurrence count (PrefixIndex)
+    4. names defined anywhere in the workspace, by number of definitions
+
+After a '.', the members of the qualifier are offered instead: the
+enclosing class for self/cls, the module for an import alias, or a class
+of the file; anything else falls back to the identifiers of the file.
+Every request has a hard budget (BUDGET_MS): the deadline is checked
+between sources and interrupts the workspace query, and whatever was
+found by then is the answer.
+
+Scopes come from the Python AST; for the other OutlineParser languages the
+file and workspace sources still apply.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .SymbolInfo import SymbolInfo, ImportInfo
+
+
+# Identifier (with an optional dotted qualifier) ending at the cursor
+_PREFIX = re.compile(r'(?:([A-Za-z_][\w.]*)\.)?([A-Za-z_]\w*)?$')
+
+
+def completion_prefix(line_text: str, column: int) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Find what is being completed at a cursor position
+
+    Args:
+        line_text: Text of the cursor line
+        column: Cursor column
+
+    Returns:
+        Tuple of (typed prefix, qualifier before the '.' or None), or None
+        when the cursor is not after an identifier or a '.'
+    """
+    match = _PREFIX.search(line_text[:column])
+    qualifier, prefix = match.group(1), match.group(2) or ''
+    if qualifier is None and not prefix:
+        return None
+    if qualifier is not None and qualifier.endswith('.'):
+        return None
+    return prefix, qualifier
+
+
+class Completion(NamedTuple):
+    """One completion candidate"""
+    name: str
+    kind: str      # Symbol type, 'parameter', 'import' or 'identifier'
+    tier: int      # Scope proximity, lower is closer
+    weight: int    # Occurrences or definitions, higher is more frequent
+
+
+class CompletionRequest(NamedTuple):
+    """Completion wanted at a cursor"""
+    request_id: int
+    file_path: str
+    prefix: str
+    qualifier: Optional[str]
+    line: int
+
+
+class CompletionEngine(QThread):
+    """
+    Worker thread answering completion requests within a time budget
+    """
+
+    # Milliseconds a request may take
+    BUDGET_MS = 5.0
+    # Candidates returned per request
+    MAX_RESULTS = 50
+    # Shortest prefix completed without a qualifier
+    MIN_PREFIX = 2
+
+    # Scope proximity tiers
+    TIER_LOCAL = 0
+    TIER_MODULE = 1
+    TIER_FILE = 2
+    TIER_WORKSPACE = 3
+
+    # (request id, list of Completion)
+    completed = pyqtSignal(int, object)
+
+    def __init__(self, database, parent=None):
+        super().__init__(parent)
+        self.database = database
+        self._condition = threading.Condition()
+        self._pending: Optional[CompletionRequest] = None
+        self._latest = 0
+        self._running = True
+        self.requests = 0
+        self.cancelled = 0
+        self.over_budget = 0
+
+    def request(self, file_path: str, prefix: str, qualifier: Optional[str], line: int) -> int:
+        """
+        Ask for completions, replacing the previous request
+
+        Args:
+            file_path: File being edited
+            prefix: Typed part of the identifier
+            qualifier: Dotted name before the '.', or None
+            line: Cursor line (1-based)
+
+        Returns:
+            Request id passed back with the completed signal
+        """
+        with self._condition:
+            self._latest += 1
+            if self._pending is not None:
+                self.cancelled += 1
+            self._pending = CompletionRequest(self._latest, file_path, prefix, qualifier, line)
+            self.requests += 1
+            self._condition.notify()
+            request_id = self._latest
+
+        if not self.isRunning():
+            self.start()
+        return request_id
+
+    def cancel(self):
+        """Drop the waiting request and stop the running one"""
+        with self._condition:
+            self._latest += 1
+            self._pending = None
+
+    def stop(self):
+        """Stop the thread and wait for it"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                request, self._pending = self._pending, None
+
+            try:
+                completions = self.complete(request)
+            except Exception as e:
+                print(f"[CompletionEngine] Error completing {request.prefix!r}: {e}")
+                continue
+            if completions is not None:
+                self.completed.emit(request.request_id, completions)
+
+    # ========================================================================
+    # Candidates
+    # ========================================================================
+
+    def complete(self, request: CompletionRequest) -> Optional[List[Completion]]:
+        """
+        Collect and rank the candidates for a request
+
+        Args:
+            request: The request
+
+        Returns:
+            Best candidates first, or None if a newer request arrived
+        """
+        deadline = time.perf_counter() + self.BUDGET_MS / 1000
+        found: Dict[str, Completion] = {}
+
+        def add(name: str, kind: str, tier: int, weight: int = 1):
+            if name == request.prefix or name[0].isdigit():
+                return
+            old = found.get(name)
+            if old is None or (tier, -weight) < (old.tier, -old.weight):
+                found[name] = Completion(name, kind, tier, weight)
+
+        prefix = request.prefix.lower()
+        index = self.database.get_position_index(request.file_path)
+
+        if request.qualifier is not None:
+            for symbol in self._qualified_members(index, request):
+                if symbol.name.lower().startswith(prefix):
+                    add(symbol.name, symbol.type, self.TIER_LOCAL)
+        else:
+            for tier, name, kind in self._scope_names(index, request.line):
+                if name.lower().startswith(prefix):
+                    add(name, kind, tier)
+
+        if request.qualifier is None:
+            sources = [self._file_names, self._workspace_names]
+        else:
+            # Unknown qualifiers (e.g. modules outside the tree) fall back
+            # to the identifiers of the file
+            sources = [] if found else [self._file_names]
+        for source in sources:
+            if self._latest != request.request_id:
+                return None
+            if time.perf_counter() > deadline:
+                self.over_budget += 1
+                break
+            source(request, deadline, add)
+
+        if self._latest != request.request_id:
+            return None
+        ranked = sorted(found.values(), key=lambda c: (c.tier, -c.weight, len(c.name), c.name))
+        return ranked[:self.MAX_RESULTS]
+
+    def _scope_names(self, index, line: int):
+        """(tier, name, kind) of the names visible at a line, closest first"""
+        for depth, scope in enumerate(index.scopes_at(line)):
+            if scope.type == 'class' and depth > 0:
+                # Class bodies are not visible from their methods
+                continue
+            for symbol in index.members(scope.qualified_name):
+                yield self.TIER_LOCAL, symbol.name, symbol.type
+            for parameter in scope.parameters:
+                yield self.TIER_LOCAL, parameter.lstrip('*'), 'parameter'
+        for symbol in index.members(None):
+            yield self.TIER_MODULE, symbol.name, symbol.type
+        for alias in index.imports:
+            if alias != '*':
+                yield self.TIER_MODULE, alias, 'import'
+
+    def _qualified_members(self, index, request: CompletionRequest) -> List[SymbolInfo]:
+        """Members of the qualifier before the '.'"""
+        qualifier = request.qualifier
+        if qualifier in ('self', 'cls'):
+            cls = index.enclosing_class(request.line)
+            if cls is None:
+                return []
+            members = index.members(cls.qualified_name)
+            for base in cls.bases:
+                owner = self.database.find_by_qualified_name(base.split('.')[-1])
+                if owner is not None and owner.type == 'class':
+                    members += self.database.get_position_index(owner.file_path).members(owner.qualified_name)
+            return members
+
+        head, _, rest = qualifier.partition('.')
+        imported = index.imports.get(head)
+        if isinstance(imported, ImportInfo):
+            if imported.target is not None and not rest:
+                return self.database.get_position_index(imported.target).members(None)
+            return []
+
+        owner = index.lookup(head, request.line)
+        if isinstance(owner, SymbolInfo) and owner.type == 'class' and not rest:
+            return index.members(owner.qualified_name)
+        return []
+
+    def _file_names(self, request: CompletionRequest, deadline: float, add):
+        """Identifiers used in the file, weighted by occurrences"""
+        if not request.prefix:
+            return
+        for name, count in self.database.get_token_index(request.file_path).match(request.prefix):
+            add(name, 'identifier', self.TIER_FILE, count)
+
+    def _workspace_names(self, request: CompletionRequest, deadline: float, add):
+        """Names defined in the workspace, weighted by definitions"""
+        for name, symbol_type, count in self.database.complete_names(
+                request.prefix, self.MAX_RESULTS, deadline):
+            add(name, symbol_type, self.TIER_WORKSPACE, count)
@@ -0,0 +1,196 @@
+# ide/plugins/Codeintelligence/DependencyGraph.py
+
+"""
+DependencyGraph - Resolve imports to the files they load
+
+Python imports come from the AST (see SymbolIndexer.parse_python_ast).
+For the other languages the statements that load another source file by
+path are picked up with regular expressions:
+
+    JavaScript/TypeScript  import ... from './x', require('./x'), import('./x')
+    PHP                    require/include 'x.php'
+    C/C++                  #include "x.h"
+    Ruby                   require_relative 'x'
+    CSS/SCSS               @import 'x'
+    HTML                   <script src="x">, <link href="x">
+
+Each import is stored with the file it resolves to (its target), which
+makes the symbol database a module-level import graph: the imports of a
+file and the files importing it are single indexed queries (see
+SymbolDatabase.get_dependencies / get_dependents).
+
+An import that cannot be resolved yet keeps the stem of the file it would
+load, so it is bound as soon as a file with that stem is indexed.
+"""
+
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Set
+
+from .SymbolInfo import ImportInfo
+from .PositionIndex import resolve_module
+
+
+_QUOTED = r"""(?P<quote>['"])(?P<spec>[^'"\n]+)(?P=quote)"""
+
+_JS = re.compile(r"\b(?:from|require\s*\(|import\s*\(?)\s*" + _QUOTED)
+_PHP = re.compile(r"\b(?:require|include)(?:_once)?\s*\(?\s*(?P<dir>__DIR__\s*\.\s*)?" + _QUOTED)
+_C = re.compile(r'^[ \t]*#[ \t]*include[ \t]*"(?P<spec>[^"\n]+)"', re.MULTILINE)
+_RUBY = re.compile(r"\brequire_relative\s*\(?\s*" + _QUOTED)
+_CSS = re.compile(r"@(?:import|use|forward)\s+(?:url\(\s*)?" + _QUOTED)
+_HTML = re.compile(r"<(?:script|link)\b[^>]*?\b(?:src|href)\s*=\s*" + _QUOTED, re.IGNORECASE)
+
+_JS_EXTENSIONS = ('.js', '.ts', '.jsx', '.tsx')
+
+# Extension -> (pattern, suffixes tried after the path as written)
+_PATH_IMPORTS = {
+    '.js': (_JS, _JS_EXTENSIONS),
+    '.jsx': (_JS, _JS_EXTENSIONS),
+    '.ts': (_JS, _JS_EXTENSIONS),
+    '.tsx': (_JS, _JS_EXTENSIONS),
+    '.php': (_PHP, ()),
+    '.c': (_C, ()),
+    '.cpp': (_C, ()),
+    '.h': (_C, ()),
+    '.rb': (_RUBY, ('.rb',)),
+    '.css': (_CSS, ('.css',)),
+    '.scss': (_CSS, ('.scss', '.sass', '.css')),
+    '.sass': (_CSS, ('.sass', '.scss', '.css')),
+    '.html': (_HTML, ()),
+    '.htm': (_HTML, ()),
+}
+
+
+def extract_path_imports(file_path: str, content: str) -> List[ImportInfo]:
+    """
+    Find the statements of a non-Python file that load other files
+
+    Args:
+        file_path: File the content belongs to (selects the language)
+        content: File text
+
+    Returns:
+        ImportInfo list with the path as written in alias and module
+    """
+    language = _PATH_IMPORTS.get(os.path.splitext(file_path)[1].lower())
+    if language is None:
+        return []
+
+    imports = []
+    line_starts = None
+    for match in language[0].finditer(content):
+        spec = match.group('spec').strip()
+        if '://' in spec or spec.startswith('//'):
+            continue
+        if match.groupdict().get('dir') and spec.startswith('/'):
+            # require __DIR__ . '/x.php'
+            spec = '.' + spec
+        if line_starts is None:
+            line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+        imports.append(ImportInfo(spec, spec, None, bisect_right(line_starts, match.start())))
+    return imports
+
+
+def resolve_dependencies(file_path: str, imports: List[ImportInfo],
+                         cache: Optional[Dict] = None,
+                         roots: Sequence[str] = ()) -> List[ImportInfo]:
+    """
+    Fill in the file each import loads
+
+    Args:
+        file_path: Importing file
+        imports: Its imports (see SymbolIndexer.parse_file)
+        cache: Optional dict shared by calls for files indexed together;
+            resolutions only depend on the importing directory
+        roots: Project and source roots bounding the search for
+            absolute Python imports (see PositionIndex.resolve_module)
+
+    Returns:
+        The imports with target set (None for modules outside the tree)
+    """
+    if cache is None:
+        cache = {}
+    directory = os.path.dirname(file_path)
+    python = file_path.endswith('.py')
+
+    resolved = []
+    for imported in imports:
+        key = (directory, imported.module, imported.name if python else None)
+        if key in cache:
+            target = cache[key]
+        else:
+            if python:
+                target = _resolve_python(imported, file_path, roots)
+            else:
+                target = _resolve_path(imported.module, directory, file_path)
+            cache[key] = target
+        resolved.append(imported._replace(target=target))
+    return resolved
+
+
+def _resolve_python(imported: ImportInfo, file_path: str, roots: Sequence[str]) -> Optional[str]:
+    if imported.name is not None and imported.name != '*':
+        # from package import module loads the submodule
+        separator = '' if imported.module.endswith('.') else '.'
+        target = resolve_module(imported.module + separator + imported.name, file_path, roots)
+        if target is not None:
+            return target
+    return resolve_module(imported.module, file_path, roots)
+
+
+def _resolve_path(spec: str, directory: str, file_path: str) -> Optional[str]:
+    language = _PATH_IMPORTS.get(os.path.splitext(file_path)[1].lower())
+    suffixes = language[1] if language else ()
+    if language is not None and language[0] is _JS and not spec.startswith(('.', '/')):
+        # Bare specifier: an npm package
+        return None
+
+    path = os.path.normpath(os.path.join(directory, spec.split('?')[0].split('#')[0]))
+    head, name = os.path.split(path)
+    candidates = [path]
+    candidates.extend(path + suffix for suffix in suffixes)
+    if language is not None and language[0] is _CSS:
+        # Sass partials
+        candidates.extend(os.path.join(head, '_' + name + suffix) for suffix in ('',) + suffixes)
+    if suffixes is _JS_EXTENSIONS:
+        candidates.extend(os.path.join(path, 'index' + suffix) for suffix in suffixes)
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def import_stem(file_path: str, imported: ImportInfo) -> str:
+    """
+    Stem of the file an import would load (the key unresolved imports
+    are bound by)
+
+    Args:
+        file_path: Importing file
+        imported: One of its imports
+    """
+    if file_path.endswith('.py'):
+        module = imported.module.rstrip('.')
+        if not module.strip('.') and imported.name:
+            # from . import name
+            return imported.name
+        return module.rsplit('.', 1)[-1]
+    return os.path.splitext(os.path.basename(imported.module))[0]
+
+
+def file_stems(file_path: str) -> Set[str]:
+    """
+    Import stems that may resolve to a file (see import_stem)
+
+    Args:
+        file_path: Newly indexed file
+    """
+    head, name = os.path.split(file_path)
+    stem = os.path.splitext(name)[0]
+    stems = {stem, stem.lstrip('_')}
+    if stem in ('__init__', 'index'):
+        # Packages are imported by their directory name
+        stems.add(os.path.basename(head))
+    return stems
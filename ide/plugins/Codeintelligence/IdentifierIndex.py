@@ -0,0 +1,124 @@
+# ide/plugins/Codeintelligence/IdentifierIndex.py
+
+"""
+IdentifierIndex - Identifier occurrences for instant find-references
+
+While a file is indexed, every identifier token in it is collected with
+its (line, column) positions. The positions of one token in one file are
+stored as a posting blob: varint-encoded deltas (line delta, then the
+column, or the column delta for further hits on the same line), usually
+one or two bytes per occurrence.
+
+SymbolDatabase keeps one row per (token, file), so re-indexing a file only
+replaces that file's rows and a reference query is a single index lookup.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+
+# Same notion of a whole word as ReferenceTracker._is_whole_word: a
+# maximal run of letters, digits and underscores (runs starting with a
+# digit are numbers and skipped)
+_WORD = re.compile(r'\w+')
+
+# (token, occurrence count, posting blob)
+IdentifierPostings = Tuple[str, int, bytes]
+
+
+def extract_identifiers(content: str) -> List[IdentifierPostings]:
+    """
+    Collect the identifier postings of a file
+
+    Args:
+        content: Text of the file
+
+    Returns:
+        List of (token, count, postings) with 1-based lines and 0-based
+        columns, as ReferenceTracker reports them
+    """
+    positions: Dict[str, List[int]] = {}
+    finditer = _WORD.finditer
+    for line_num, line in enumerate(content.split('\n'), 1):
+        for match in finditer(line):
+            token = match.group()
+            if token[0].isdigit():
+                continue
+            hits = positions.get(token)
+            if hits is None:
+                positions[token] = [line_num, match.start()]
+            else:
+                hits.append(line_num)
+                hits.append(match.start())
+
+    return [
+        (token, len(flat) // 2, encode_postings(flat))
+        for token, flat in positions.items()
+    ]
+
+
+def encode_postings(flat: List[int]) -> bytes:
+    """
+    Delta/varint encode positions
+
+    Args:
+        flat: line, column, line, column, ... in ascending order
+
+    Returns:
+        Encoded postings
+    """
+    out = bytearray()
+    append = out.append
+    prev_line = 0
+    prev_col = 0
+    for i in range(0, len(flat), 2):
+        line = flat[i]
+        col = flat[i + 1]
+        if line != prev_line:
+            values = (line - prev_line, col)
+        else:
+            values = (0, col - prev_col)
+        prev_line, prev_col = line, col
+        for value in values:
+            while value >= 0x80:
+                append((value & 0x7F) | 0x80)
+                value >>= 7
+            append(value)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> List[Tuple[int, int]]:
+    """
+    Decode postings produced by encode_postings
+
+    Args:
+        data: Encoded postings
+
+    Returns:
+        List of (line, column)
+    """
+    values = []
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = 0
+            shift = 0
+
+    positions = []
+    line = 0
+    col = 0
+    for i in range(0, len(values), 2):
+        line_delta = values[i]
+        if line_delta:
+            line += line_delta
+            col = values[i + 1]
+        else:
+            col += values[i + 1]
+        positions.append((line, col))
+    return positions
+
@@ -0,0 +1,116 @@
+# ide/plugins/Codeintelligence/IndexManifest.py
+
+"""
+IndexManifest - Decide which files actually need re-indexing
+
+The symbol database records, for every indexed file, the state it was
+indexed from: (size, mtime_ns, content hash, indexer version). Comparing
+against that state lets a workspace re-index skip unchanged files with a
+single stat() call, and find files that were deleted since.
+"""
+
+import hashlib
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class FileState(NamedTuple):
+    """State of a file at the time it was indexed"""
+    size: int
+    mtime_ns: int
+    content_hash: str
+    indexer_version: int
+
+
+def hash_content(data: bytes) -> str:
+    """Content hash stored in the manifest"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_file_state(file_path: str, indexer_version: int) -> Tuple[str, FileState]:
+    """
+    Read a file for indexing
+
+    Args:
+        file_path: Path to the file
+        indexer_version: SymbolIndexer.VERSION
+
+    Returns:
+        Tuple of (decoded content, FileState)
+    """
+    with open(file_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    state = FileState(stat.st_size, stat.st_mtime_ns, hash_content(data), indexer_version)
+    return data.decode('utf-8'), state
+
+
+class IndexManifest:
+    """
+    Snapshot of the indexed file states, loaded once per indexing run
+    """
+
+    # Results of classify()
+    UNCHANGED = 'unchanged'   # Same size/mtime: skip without reading
+    STALE = 'stale'           # Read it: content or indexer may differ
+    NEW = 'new'               # Never indexed
+
+    def __init__(self, database, indexer_version: int):
+        self.indexer_version = indexer_version
+        self.entries: Dict[str, FileState] = database.get_manifest()
+
+    def classify(self, file_path: str, stat: os.stat_result) -> str:
+        """
+        Compare a file on disk with its manifest entry
+
+        Args:
+            file_path: Path to the file
+            stat: Result of os.stat(file_path)
+
+        Returns:
+            UNCHANGED, STALE or NEW
+        """
+        entry = self.entries.get(file_path)
+        if entry is None:
+            return self.NEW
+        if (entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns
+                and entry.indexer_version == self.indexer_version):
+            return self.UNCHANGED
+        return self.STALE
+
+    def known_hash(self, file_path: str) -> Optional[str]:
+        """
+        Content hash a re-read file can be compared against, or None if
+        the file is new or was indexed by another indexer version
+        """
+        entry = self.entries.get(file_path)
+        if entry is None or entry.indexer_version != self.indexer_version:
+            return None
+        return entry.content_hash
+
+    def same_content(self, file_path: str, state: FileState) -> bool:
+        """
+        True if only the timestamp changed (e.g. touch, checkout of
+        identical content), so the old symbols are still valid
+        """
+        entry = self.entries.get(file_path)
+        return (entry is not None
+                and entry.content_hash == state.content_hash
+                and entry.indexer_version == state.indexer_version)
+
+    def missing(self, roots: Iterable[str], seen: set) -> List[str]:
+        """
+        Indexed files below the given roots that were not seen on disk
+
+        Args:
+            roots: Project directories that were walked
+            seen: Paths found during the walk
+
+        Returns:
+            Paths to purge from the index
+        """
+        prefixes = tuple(os.path.join(str(root), '') for root in roots)
+        return [
+            path for path in self.entries
+            if path not in seen and path.startswith(prefixes)
+        ]
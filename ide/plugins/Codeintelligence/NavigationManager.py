@@ -2,12 +2,23 @@
 
 """
 NavigationManager - Handle jump-to-definition and symbol resolution
+
+The word under the cursor is taken from the current line only. It is
+resolved through the file's PositionIndex (enclosing scopes, then module
+level, then imports) and only falls back to a global name lookup when
+the file itself does not tell where the name comes from.
 """
 
+import re
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from PyQt6.QtGui import QTextCursor
-from .SymbolInfo import SymbolInfo
+from .SymbolInfo import SymbolInfo, ImportInfo
+from .PositionIndex import resolve_module
+
+
+# Dotted expression ending right before a word, e.g. "self." or "os.path."
+_QUALIFIER = re.compile(r'([A-Za-z_][\w.]*)\.\s*$')
 
 
 class NavigationManager:
@@ -20,7 +31,8 @@ class NavigationManager:
         self.db = database
         self.api = api
     
-    def get_symbol_at_position(self, file_path: str, line: int, column: int) -> Optional[str]:
+    def get_symbol_at_position(self, file_path: str, line: int, column: int,
+                               line_text: Optional[str] = None) -> Optional[str]:
         """
         Get symbol name at cursor position
         
@@ -28,54 +40,80 @@ class NavigationManager:
             file_path: Current file
             line: Line number (1-based)
             column: Column number (0-based)
+            line_text: Text of that line; the file is only read when
+                it is not given
             
         Returns:
             Symbol name at cursor, or None
         """
         try:
-            # Get the editor content
-            content = self.api.get_file_content(file_path)
-            if not content:
-                return None
-            
-            lines = content.split('\n')
-            if line < 1 or line > len(lines):
-                return None
-            
-            current_line = lines[line - 1]
-            
-            # Extract word at column position
-            # Find word boundaries (alphanumeric + underscore)
-            start = column
-            while start > 0 and (current_line[start-1].isalnum() or current_line[start-1] == '_'):
-                start -= 1
-            
-            end = column
-            while end < len(current_line) and (current_line[end].isalnum() or current_line[end] == '_'):
-                end += 1
-            
-            if start == end:
-                return None
+            if line_text is None:
+                content = self.api.get_file_content(file_path)
+                if not content:
+                    return None
+                
+                lines = content.split('\n')
+                if line < 1 or line > len(lines):
+                    return None
+                line_text = lines[line - 1]
             
-            symbol_name = current_line[start:end]
-            return symbol_name if symbol_name else None
+            span = self._word_span(line_text, column)
+            return line_text[span[0]:span[1]] if span else None
         
         except Exception as e:
             print(f"[NavigationManager] Error getting symbol at position: {e}")
             return None
     
-    def find_definition(self, symbol_name: str, context_file: str) -> Optional[SymbolInfo]:
+    @staticmethod
+    def _word_span(text: str, column: int) -> Optional[Tuple[int, int]]:
+        """Boundaries of the identifier at a column (alphanumeric + underscore)"""
+        start = column
+        while start > 0 and (text[start-1].isalnum() or text[start-1] == '_'):
+            start -= 1
+        
+        end = column
+        while end < len(text) and (text[end].isalnum() or text[end] == '_'):
+            end += 1
+        
+        return (start, end) if start < end else None
+    
+    @staticmethod
+    def _qualifier(text: str, start: int) -> Optional[str]:
+        """Dotted expression the word at start is an attribute of"""
+        match = _QUALIFIER.search(text, 0, start)
+        return match.group(1) if match else None
+    
+    def find_definition(self, symbol_name: str, context_file: str, line: Optional[int] = None,
+                        qualifier: Optional[str] = None) -> Optional[SymbolInfo]:
         """
         Find definition of a symbol
         
+        Resolution order: the scopes around line in context_file, then
+        its module level definitions and imports (followed into the
+        imported module), then every indexed symbol of that name.
+        
         Args:
             symbol_name: Name of symbol to find
             context_file: File where symbol is referenced (for context)
+            line: Line of the reference (enables local scope lookup)
+            qualifier: Expression before the name, e.g. 'self' for
+                self.name or 'os.path' for os.path.name
             
         Returns:
             SymbolInfo of definition, or None if not found
         """
-        # Try exact match first
+        index = self.db.get_position_index(context_file)
+        
+        if qualifier:
+            found = self._resolve_attribute(index, symbol_name, context_file, line, qualifier)
+        else:
+            found = index.lookup(symbol_name, line)
+            if isinstance(found, ImportInfo):
+                found = self._resolve_import(found, context_file)
+        if found is not None:
+            return found
+        
+        # Global index
         matches = self.db.find_symbol(symbol_name)
         
         if not matches:
@@ -88,6 +126,80 @@ class NavigationManager:
         # Multiple matches - use heuristics to pick best one
         return self._resolve_ambiguous_symbol(matches, context_file)
     
+    def _resolve_attribute(self, index, name: str, context_file: str, line: Optional[int],
+                           qualifier: str) -> Optional[SymbolInfo]:
+        """Resolve qualifier.name through the enclosing class or an import"""
+        if qualifier in ('self', 'cls'):
+            cls = index.enclosing_class(line) if line is not None else None
+            if cls is None:
+                return None
+            found = index.member(cls.qualified_name, name)
+            if found is None:
+                # Inherited: look in the base classes
+                for base in cls.bases:
+                    found = self.db.find_by_qualified_name(f"{base.split('.')[-1]}.{name}")
+                    if found is not None:
+                        break
+            return found
+        
+        head, _, rest = qualifier.partition('.')
+        imported = index.imports.get(head)
+        if imported is None:
+            # A class of this file: Class.name
+            owner = index.lookup(head, line)
+            if isinstance(owner, SymbolInfo) and owner.type == 'class' and not rest:
+                return index.member(owner.qualified_name, name)
+            return None
+        
+        if imported.name is None:
+            module = imported.bound_module + (f".{rest}" if rest else '')
+        elif not rest:
+            # from package import module
+            module = self._submodule(imported)
+        else:
+            return None
+        
+        if module == imported.module and imported.target is not None:
+            # Resolved when the file was indexed
+            module_file = imported.target
+        else:
+            module_file = resolve_module(module, context_file, self.db.import_roots)
+        if module_file is None:
+            return None
+        return self.db.get_position_index(module_file).member(None, name)
+    
+    def _resolve_import(self, imported: ImportInfo, context_file: str) -> Optional[SymbolInfo]:
+        """Follow an import to the module or the definition it binds"""
+        if imported.name is None:
+            module_file = imported.target or resolve_module(imported.module, context_file, self.db.import_roots)
+            return self._module_symbol(imported.alias, module_file) if module_file else None
+        
+        module_file = resolve_module(imported.module, context_file, self.db.import_roots)
+        if module_file is not None:
+            found = self.db.get_position_index(module_file).member(None, imported.name)
+            if found is not None:
+                return found
+        
+        # from package import module
+        submodule = resolve_module(self._submodule(imported), context_file, self.db.import_roots)
+        if submodule is not None:
+            return self._module_symbol(imported.alias, submodule)
+        
+        # Not in the tree (or re-exported): the global index decides
+        matches = self.db.find_symbol(imported.name)
+        return self._resolve_ambiguous_symbol(matches, context_file) if matches else None
+    
+    @staticmethod
+    def _submodule(imported: ImportInfo) -> str:
+        """Module name of 'from package import name' if name is a module"""
+        separator = '' if imported.module.endswith('.') else '.'
+        return imported.module + separator + imported.name
+    
+    @staticmethod
+    def _module_symbol(name: str, module_file: str) -> SymbolInfo:
+        """Pseudo symbol for jumping to the top of a module"""
+        return SymbolInfo(name=name, symbol_type='module', file_path=module_file, line=1)
+    
     def _resolve_ambiguous_symbol(self, matches: List[SymbolInfo], context_file: str) -> SymbolInfo:
         """
         Resolve which symbol definition to use when there are multiple matches
@@ -223,7 +335,8 @@ class NavigationManager:
             line = cursor.blockNumber() + 1
             column = cursor.columnNumber()
             
-            symbol_name = self.get_symbol_at_position(editor.file_path, line, column)
+            symbol_name = self.get_symbol_at_position(editor.file_path, line, column,
+                                                      cursor.block().text())
             
             if symbol_name:
                 return (symbol_name, editor.file_path, line, column)
@@ -233,4 +346,27 @@ class NavigationManager:
         except Exception as e:
             print(f"[NavigationManager] Error getting symbol at cursor: {e}")
             return None
+    
+    def definition_at_cursor(self) -> Optional[Tuple[str, Optional[SymbolInfo]]]:
+        """
+        Resolve the word under the cursor of the current editor
+        
+        Returns:
+            Tuple of (symbol name, definition or None), or None when the
+            cursor is not on a word
+        """
+        editor = self.api.get_current_editor()
+        if not editor or not getattr(editor, 'file_path', None):
+            return None
+        
+        cursor = editor.textCursor()
+        text = cursor.block().text()
+        span = self._word_span(text, cursor.positionInBlock())
+        if span is None:
+            return None
+        
+        symbol_name = text[span[0]:span[1]]
+        definition = self.find_definition(
+            symbol_name, editor.file_path, cursor.blockNumber() + 1, self._qualifier(text, span[0]))
+        return symbol_name, definition
 
@@ -0,0 +1,276 @@
+# ide/plugins/Codeintelligence/ParallelIndexer.py
+
+"""
+ParallelIndexer - Spread symbol extraction over a process pool
+
+ast.parse and the regex outline parsers are CPU bound, so a thread pool
+would just take turns on the GIL (and compete with the UI). Files are sent
+to worker processes in chunks; each worker reads, hashes and parses its
+files and sends back compact tuples instead of pickled SymbolInfo objects.
+The results are merged into the SymbolDatabase in batched transactions on
+the calling thread.
+"""
+
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .SymbolInfo import SymbolInfo, ImportInfo
+from .IndexManifest import FileState, read_file_state
+from .IdentifierIndex import extract_identifiers
+from .DependencyGraph import resolve_dependencies
+
+
+# ============================================================================
+# Wire format
+# ============================================================================
+
+# (name, type, line, column, end line, parent, children, parameters,
+#  decorators, bases, docstring) - empty lists travel as None
+SymbolTuple = tuple
+
+
+def pack_symbol(symbol: SymbolInfo) -> SymbolTuple:
+    """Convert a SymbolInfo to its compact tuple form"""
+    return (
+        symbol.name, symbol.type, symbol.line, symbol.column, symbol.end_line, symbol.parent,
+        tuple(symbol.children) or None,
+        tuple(symbol.parameters) or None,
+        tuple(symbol.decorators) or None,
+        tuple(symbol.bases) or None,
+        symbol.docstring,
+    )
+
+
+def unpack_symbols(file_path: str, packed: List[SymbolTuple]) -> List[SymbolInfo]:
+    """Rebuild SymbolInfo objects for one file from compact tuples"""
+    symbols = []
+    for (name, symbol_type, line, column, end_line, parent,
+         children, parameters, decorators, bases, docstring) in packed:
+        symbols.append(SymbolInfo(
+            name=name,
+            symbol_type=symbol_type,
+            file_path=file_path,
+            line=line,
+            column=column,
+            end_line=end_line,
+            parent=parent,
+            children=children,
+            parameters=parameters,
+            decorators=decorators,
+            bases=bases,
+            docstring=docstring,
+        ))
+    return symbols
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+_worker_indexer = None
+
+
+def index_chunk(items: List[Tuple[str, Optional[str]]], indexer_version: int,
+                import_roots: Tuple[str, ...] = ()) -> list:
+    """
+    Index a chunk of files (runs in a worker process)
+
+    Args:
+        items: List of (file path, content hash from the manifest or None)
+        indexer_version: SymbolIndexer.VERSION of the parent
+        import_roots: Roots Python imports are resolved in (the
+            database's import_roots)
+
+    Returns:
+        List of (file path, state tuple, packed symbols, identifier
+        postings, resolved imports, error). packed symbols, postings and
+        imports are None when the content hash matched the manifest; state
+        is None when the file could not be read.
+    """
+    global _worker_indexer
+    if _worker_indexer is None:
+        from .SymbolIndexer import SymbolIndexer
+        _worker_indexer = SymbolIndexer()
+
+    results = []
+    resolve_cache = {}
+    for file_path, known_hash in items:
+        try:
+            content, state = read_file_state(file_path, indexer_version)
+        except Exception as e:
+            results.append((file_path, None, None, None, None, str(e)))
+            continue
+
+        if known_hash == state.content_hash:
+            results.append((file_path, tuple(state), None, None, None, None))
+            continue
+
+        symbols, imports = _worker_indexer.parse_file(file_path, content)
+        imports = resolve_dependencies(file_path, imports, resolve_cache, import_roots)
+        results.append((file_path, tuple(state), [pack_symbol(s) for s in symbols],
+                        extract_identifiers(content), [tuple(i) for i in imports], None))
+    return results
+
+
+# ============================================================================
+# Parent side
+# ============================================================================
+
+class ParallelIndexer:
+    """
+    Index files on a process pool and merge the results into a database
+    """
+
+    CHUNK_SIZE = 64        # Files per worker task
+    BATCH_SIZE = 256       # Files per database transaction
+    TASKS_PER_WORKER = 2   # Chunks kept in flight per worker
+
+    def __init__(self, database, indexer_version: int, max_workers: Optional[int] = None):
+        self.database = database
+        self.indexer_version = indexer_version
+        self.max_workers = max_workers or self.default_workers()
+
+    @staticmethod
+    def default_workers() -> int:
+        """Available cores minus one for the UI"""
+        try:
+            cores = len(os.sched_getaffinity(0))
+        except AttributeError:
+            cores = os.cpu_count() or 1
+        return max(1, cores - 1)
+
+    def run(self, items: Iterable[Tuple[str, Optional[str]]],
+            progress: Optional[Callable[[int, int], None]] = None,
+            cancel: Optional[threading.Event] = None) -> Dict[str, int]:
+        """
+        Index files and store their symbols
+
+        Args:
+            items: (file path, known content hash or None) pairs
+            progress: Called as progress(files_done, files_queued)
+            cancel: Event that stops the run when set
+
+        Returns:
+            Dictionary with 'indexed', 'unchanged', 'failed', 'symbols'
+            counts and 'cancelled' (0/1)
+        """
+        self._stats = {'indexed': 0, 'unchanged': 0, 'failed': 0, 'symbols': 0, 'cancelled': 0}
+        self._batch = []
+        self._done = 0
+        self._queued = 0
+        self._progress = progress
+        cancel = cancel or threading.Event()
+
+        chunks = self._chunks(items)
+        first = next(chunks, None)
+        second = next(chunks, None)
+
+        if self.max_workers == 1 or second is None:
+            # A single chunk (or core) is not worth starting processes for
+            self._run_inline(itertools.chain(filter(None, (first, second)), chunks), cancel)
+        else:
+            self._run_pool(itertools.chain((first, second), chunks), cancel)
+
+        self._flush()
+        if cancel.is_set():
+            self._stats['cancelled'] = 1
+        return self._stats
+
+    def _run_pool(self, chunks: Iterator[list], cancel: threading.Event):
+        # spawn instead of fork: forking a process that runs Qt threads is
+        # not safe, and spawn behaves the same on every platform
+        context = multiprocessing.get_context('spawn')
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        max_in_flight = self.max_workers * self.TASKS_PER_WORKER
+        pending = {}  # future -> chunk
+        broken = []   # chunks to redo in-process if the pool dies
+
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            self._queued += len(chunk)
+            pending[executor.submit(index_chunk, chunk, self.indexer_version,
+                                     self.database.import_roots)] = chunk
+            return True
+
+        try:
+            more = True
+            while more and len(pending) < max_in_flight:
+                more = submit_next()
+
+            while pending and not broken:
+                if cancel.is_set():
+                    break
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        self._merge(future.result())
+                    except BrokenProcessPool as e:
+                        print(f"[ParallelIndexer] Process pool failed ({e}), continuing in-process")
+                        broken.append(chunk)
+                        continue
+                    if more and not cancel.is_set():
+                        more = submit_next()
+        finally:
+            executor.shutdown(wait=not cancel.is_set(), cancel_futures=True)
+
+        if broken:
+            redo = broken + list(pending.values())
+            self._queued -= sum(len(chunk) for chunk in redo)
+            self._run_inline(itertools.chain(redo, chunks), cancel)
+
+    def _run_inline(self, chunks: Iterable[list], cancel: threading.Event):
+        """Index chunks on the calling thread"""
+        for chunk in chunks:
+            if cancel.is_set():
+                break
+            self._queued += len(chunk)
+            self._merge(index_chunk(chunk, self.indexer_version, self.database.import_roots))
+
+    def _chunks(self, items: Iterable) -> Iterator[list]:
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _merge(self, results: list):
+        """Queue worker results for the next database transaction"""
+        for file_path, state, packed, identifiers, imports, error in results:
+            self._done += 1
+            if state is None:
+                self._stats['failed'] += 1
+                print(f"[ParallelIndexer] Error indexing {file_path}: {error}")
+                continue
+
+            state = FileState(*state)
+            if packed is None:
+                # Touched but not modified: keep the symbols
+                self.database.update_file_state(file_path, state)
+                self._stats['unchanged'] += 1
+                continue
+
+            self._batch.append((file_path, unpack_symbols(file_path, packed), state, identifiers,
+                                [ImportInfo(*i) for i in imports]))
+            self._stats['indexed'] += 1
+            self._stats['symbols'] += len(packed)
+
+        if len(self._batch) >= self.BATCH_SIZE:
+            self._flush()
+        if self._progress:
+            self._progress(self._done, self._queued)
+
+    def _flush(self):
+        if self._batch:
+            self.database.replace_files(self._batch)
+            self._batch = []
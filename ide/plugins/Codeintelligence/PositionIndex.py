@@ -0,0 +1,218 @@
+# ide/plugins/Codeintelligence/PositionIndex.py
+
+"""
+PositionIndex - Resolve a name at a position in a file from the index
+
+Built from the symbols and imports the database holds for one file, so
+jump-to-definition never has to read or re-parse the file:
+
+- scope spans: the classes and functions sorted by start line, each with
+  its end line and the index of its enclosing span. The scopes around a
+  line are one bisect plus a walk up the enclosing chain.
+- members: the names defined in each scope (None is module level).
+- imports: the name each import statement binds.
+
+Only Python symbols carry end lines; for other languages the index still
+answers module-level and member lookups.
+"""
+
+import os
+import tomllib
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Union
+
+from .SymbolInfo import SymbolInfo, ImportInfo
+
+
+class PositionIndex:
+    """
+    Scopes, definitions and imports of one indexed file
+    """
+
+    def __init__(self, symbols: List[SymbolInfo], imports: List[ImportInfo]):
+        # Spans sorted by start, outer before inner on the same line
+        spans = sorted((s for s in symbols if s.end_line), key=lambda s: (s.line, -s.end_line))
+        self._spans = spans
+        self._starts = [s.line for s in spans]
+        self._enclosing: List[int] = []
+        stack = []
+        for i, span in enumerate(spans):
+            while stack and spans[stack[-1]].end_line < span.line:
+                stack.pop()
+            self._enclosing.append(stack[-1] if stack else -1)
+            stack.append(i)
+
+        # Scope qualified name -> name -> symbol; later definitions shadow
+        self._members: Dict[Optional[str], Dict[str, SymbolInfo]] = {}
+        for symbol in symbols:
+            self._members.setdefault(symbol.parent, {})[symbol.name] = symbol
+
+        self.imports: Dict[str, ImportInfo] = {}
+        for imported in imports:
+            self.imports[imported.alias] = imported
+
+    def scopes_at(self, line: int) -> List[SymbolInfo]:
+        """
+        Classes and functions whose body contains a line
+
+        Args:
+            line: Line number (1-based)
+
+        Returns:
+            Enclosing symbols, innermost first
+        """
+        scopes = []
+        i = bisect_right(self._starts, line) - 1
+        while i >= 0:
+            span = self._spans[i]
+            if span.end_line >= line:
+                scopes.append(span)
+            i = self._enclosing[i]
+        return scopes
+
+    def member(self, scope: Optional[str], name: str) -> Optional[SymbolInfo]:
+        """
+        Symbol defined directly in a scope
+
+        Args:
+            scope: Qualified name of a class or function, None for module level
+            name: Name defined in it
+        """
+        members = self._members.get(scope)
+        return members.get(name) if members else None
+
+    def members(self, scope: Optional[str]) -> List[SymbolInfo]:
+        """
+        Symbols defined directly in a scope
+
+        Args:
+            scope: Qualified name of a class or function, None for module level
+        """
+        return list(self._members.get(scope, {}).values())
+
+    def enclosing_class(self, line: int) -> Optional[SymbolInfo]:
+        """Innermost class around a line"""
+        for scope in self.scopes_at(line):
+            if scope.type == 'class':
+                return scope
+        return None
+
+    def lookup(self, name: str, line: Optional[int] = None) -> Union[SymbolInfo, ImportInfo, None]:
+        """
+        Resolve a bare name as seen from a line: enclosing function scopes
+        from the inside out (a parameter resolves to its function), then
+        module level definitions, then imports
+
+        Args:
+            name: Identifier
+            line: Line the name is used on; None skips the local scopes
+
+        Returns:
+            Defining SymbolInfo, the ImportInfo binding the name, or None
+        """
+        if line is not None:
+            for depth, scope in enumerate(self.scopes_at(line)):
+                if scope.type == 'class':
+                    # Class bodies are not visible from their methods
+                    if depth == 0:
+                        symbol = self.member(scope.qualified_name, name)
+                        if symbol is not None:
+                            return symbol
+                    continue
+                symbol = self.member(scope.qualified_name, name)
+                if symbol is not None:
+                    return symbol
+                if any(p.lstrip('*') == name for p in scope.parameters):
+                    return scope
+
+        symbol = self.member(None, name)
+        if symbol is not None:
+            return symbol
+        return self.imports.get(name)
+
+
+def resolve_module(module: str, context_file: str, roots: Sequence[str] = ()) -> Optional[str]:
+    """
+    Find the file of an imported Python module
+
+    Relative modules are resolved against the importing file. Absolute
+    ones are looked up in the importing directory, its parents up to the
+    outermost root containing it (source roots such as ide/plugins in
+    between are among them), then the other roots. Nothing outside the
+    roots is searched, so modules outside the tree (stdlib,
+    site-packages, a stray json.py in the home directory) give None.
+
+    Args:
+        module: Module as written in the import ('a.b', '..c')
+        context_file: File containing the import
+        roots: Active project roots and their declared source roots
+            (see source_roots), normalized
+
+    Returns:
+        Path of the module file or package __init__.py, or None
+    """
+    directory = os.path.dirname(context_file)
+    name = module.lstrip('.')
+    level = len(module) - len(name)
+    parts = name.split('.') if name else []
+
+    if level:
+        for _ in range(level - 1):
+            directory = os.path.dirname(directory)
+        bases = [directory]
+    else:
+        top = min((r for r in roots if directory == r or directory.startswith(r + os.sep)),
+                  key=len, default=directory)
+        bases = [directory]
+        while directory != top:
+            directory = os.path.dirname(directory)
+            bases.append(directory)
+        bases.extend(r for r in roots if r not in bases)
+
+    for base in bases:
+        path = os.path.join(base, *parts)
+        if parts and os.path.isfile(path + '.py'):
+            return path + '.py'
+        init = os.path.join(path, '__init__.py')
+        if os.path.isfile(init):
+            return init
+    return None
+
+
+def source_roots(project_root: str) -> List[str]:
+    """
+    Source roots a project declares in its pyproject.toml (setuptools
+    packages.find / package-dir, poetry packages, hatch wheel packages)
+
+    Args:
+        project_root: Normalized project directory
+
+    Returns:
+        Normalized directories below the project, without the root itself
+    """
+    try:
+        with open(os.path.join(project_root, 'pyproject.toml'), 'rb') as f:
+            tool = tomllib.load(f).get('tool', {})
+    except (OSError, tomllib.TOMLDecodeError):
+        return []
+
+    declared = []
+    setuptools = tool.get('setuptools', {})
+    find = setuptools.get('packages', {})
+    if isinstance(find, dict):
+        declared += find.get('find', {}).get('where', [])
+    declared.append(setuptools.get('package-dir', {}).get('', ''))
+    declared += [p.get('from', '') for p in tool.get('poetry', {}).get('packages', [])
+                 if isinstance(p, dict)]
+    wheel = tool.get('hatch', {}).get('build', {}).get('targets', {}).get('wheel', {})
+    declared += [os.path.dirname(p) for p in wheel.get('packages', [])]
+
+    roots = []
+    for relative in declared:
+        if not isinstance(relative, str):
+            continue
+        path = os.path.normpath(os.path.join(project_root, relative))
+        if path != project_root and path.startswith(project_root + os.sep) \
+                and path not in roots and os.path.isdir(path):
+            roots.append(path)
+    return roots
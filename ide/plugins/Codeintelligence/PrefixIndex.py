@@ -0,0 +1,50 @@
+# ide/plugins/Codeintelligence/PrefixIndex.py
+
+"""
+PrefixIndex - Case-insensitive prefix lookup over a fixed set of names
+
+A sorted array of lowercase keys: the names starting with a prefix are
+one contiguous run found with two bisects, so a lookup costs
+O(log n + matches) and building costs one sort. Used for the identifier
+tokens of a file by the completion engine (see CompletionEngine).
+"""
+
+from bisect import bisect_left
+from typing import Iterable, List, Tuple
+
+
+class PrefixIndex:
+    """
+    Names with a weight (e.g. occurrence count), searchable by prefix
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int]]):
+        """
+        Args:
+            entries: (name, weight) pairs
+        """
+        ordered = sorted((name.lower(), name, weight) for name, weight in entries)
+        self._keys = [key for key, _, _ in ordered]
+        self._entries = [(name, weight) for _, name, weight in ordered]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def match(self, prefix: str, limit: int = 0) -> List[Tuple[str, int]]:
+        """
+        Names starting with a prefix, ignoring case
+
+        Args:
+            prefix: Typed prefix
+            limit: Maximum number of results in key order, 0 for all
+
+        Returns:
+            List of (name, weight)
+        """
+        key = prefix.lower()
+        start = bisect_left(self._keys, key)
+        # '\U0010ffff' sorts after every character a name continues with
+        end = bisect_left(self._keys, key + '\U0010ffff', start)
+        if limit:
+            end = min(end, start + limit)
+        return self._entries[start:end]
@@ -0,0 +1,505 @@
+# ide/plugins/Codeintelligence/QueryServer.py
+
+"""
+QueryServer - The warm symbol index over a local Unix socket
+
+External tools (CLI scripts, pre-commit hooks) ask the running IDE instead
+of parsing the tree themselves. The protocol is JSON-RPC 2.0, one JSON
+document per line:
+
+    {"jsonrpc": "2.0", "id": 1, "method": "find_symbol", "params": {"name": "Foo"}}
+
+A line holding an array is a batch; its responses come back as one array
+line, in request order. With "stream": true in the params, a list result
+is sent in chunks as it is produced, each as a notification
+
+    {"jsonrpc": "2.0", "method": "partial", "params": {"id": 1, "items": [...]}}
+
+followed by the response {"result": {"count": <items sent>}}; other
+results are answered as usual. References are streamed one file at a
+time, straight from ReferenceTracker.
+
+Methods (params):
+    ping                 ()
+    statistics           ()
+    find_symbol          (name)
+    find_qualified       (qualified_name)
+    fuzzy_search         (pattern, limit=50)
+    file_symbols         (path)
+    references           (name, files=None, max_hits=None)
+    dependencies         (path)
+    dependents           (path)
+
+Every connection gets its own thread, so idle clients cost nothing but
+that thread; a semaphore lets at most MAX_QUERIES requests read the
+database at once. The socket is created with mode 0600.
+
+Run this file to query a running IDE from the command line:
+
+    python QueryServer.py find_symbol name=Foo
+    python QueryServer.py references name=Foo stream=true
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+def default_socket_path() -> Path:
+    """
+    Socket of the running IDE: the Code Intelligence plugin directory
+    (AppDirs.plugin_dir('code-intelligence')); WORKSPACE_IDE_SOCKET overrides
+    """
+    override = os.environ.get('WORKSPACE_IDE_SOCKET')
+    if override:
+        return Path(override)
+    if sys.platform == 'darwin':
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        xdg = os.environ.get("XDG_CONFIG_HOME", "")
+        base = Path(xdg) if xdg else Path.home() / ".config"
+    return base / "workspace-ide" / "plugins" / "code-intelligence" / "query.sock"
+
+
+def symbol_to_json(symbol) -> Dict:
+    """Fields of a SymbolInfo sent to clients (docstrings are not loaded)"""
+    return {
+        'name': symbol.name,
+        'qualified_name': symbol.qualified_name,
+        'type': symbol.type,
+        'file_path': symbol.file_path,
+        'line': symbol.line,
+        'column': symbol.column,
+        'end_line': symbol.end_line,
+        'parent': symbol.parent,
+        'parameters': list(symbol.parameters),
+    }
+
+
+class QueryError(Exception):
+    """Error answered to the client as a JSON-RPC error"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class QueryServer:
+    """
+    Serves symbol queries from a database and reference tracker
+    """
+
+    # Requests answered at once (threads reading the database)
+    MAX_QUERIES = 8
+    # Items per 'partial' notification when streaming a list
+    CHUNK_SIZE = 200
+    # Seconds a fuzzy search waits for a search index still loading
+    LOAD_WAIT = 10.0
+
+    def __init__(self, database, ref_tracker, socket_path: Optional[Path] = None):
+        """
+        Args:
+            database: SymbolDatabase or ShardedSymbolDatabase
+            ref_tracker: ReferenceTracker over the same database
+            socket_path: Where to listen (default_socket_path() if None)
+        """
+        self.database = database
+        self.ref_tracker = ref_tracker
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.requests = 0
+        self._server = None
+        self._thread = None
+        self._queries = threading.BoundedSemaphore(self.MAX_QUERIES)
+
+        # Method name -> callable(params) returning a result; methods
+        # returning an iterator of lists can be streamed
+        self.methods: Dict[str, Callable[[Dict], object]] = {
+            'ping': lambda params: 'pong',
+            'statistics': self._statistics,
+            'find_symbol': self._find_symbol,
+            'find_qualified': self._find_qualified,
+            'fuzzy_search': self._fuzzy_search,
+            'file_symbols': self._file_symbols,
+            'references': self._references,
+            'dependencies': lambda params: self.database.get_dependencies(_param(params, 'path', str)),
+            'dependents': lambda params: self.database.get_dependents(_param(params, 'path', str)),
+        }
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    def start(self) -> bool:
+        """
+        Listen on the socket and serve on background threads
+
+        Returns:
+            False if another process is already serving on the socket
+        """
+        if self._server is not None:
+            return True
+        if self.socket_path.exists():
+            if _is_listening(self.socket_path):
+                print(f"[QueryServer] {self.socket_path} is served by another process")
+                return False
+            self.socket_path.unlink()
+
+        # Restricted to 0600 between bind() and listen(): nobody can
+        # connect before listen(), and the process umask is left alone
+        # (other threads may be creating files meanwhile)
+        server = _UnixServer(str(self.socket_path), _RequestHandler, self, bind_and_activate=False)
+        try:
+            server.server_bind()
+            os.chmod(self.socket_path, 0o600)
+            server.server_activate()
+        except OSError:
+            server.server_close()
+            raise
+        self._server = server
+        self._thread = threading.Thread(target=self._server.serve_forever, name='query-server', daemon=True)
+        self._thread.start()
+        print(f"[QueryServer] Listening on {self.socket_path}")
+        return True
+
+    def stop(self):
+        """Stop listening, disconnect the clients and wait for the running requests"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.disconnect_all()
+        # Joins the connection threads
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+        print(f"[QueryServer] Stopped ({self.requests} requests served)")
+
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    # ========================================================================
+    # Requests
+    # ========================================================================
+
+    def handle_line(self, line: bytes, send: Callable[[object], None]):
+        """
+        Answer one line of the protocol
+
+        Args:
+            line: A request or a batch (JSON array of requests)
+            send: Writes one message to the client
+        """
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            send(_error(None, PARSE_ERROR, f"Parse error: {e}"))
+            return
+
+        if isinstance(message, list):
+            if not message:
+                send(_error(None, INVALID_REQUEST, "Empty batch"))
+                return
+            responses = [r for r in (self.handle_request(m, send) for m in message) if r is not None]
+            if responses:
+                send(responses)
+        else:
+            response = self.handle_request(message, send)
+            if response is not None:
+                send(response)
+
+    def handle_request(self, request, send: Callable[[object], None]) -> Optional[Dict]:
+        """
+        Run one request; partial results of a streamed request are sent
+        as they come
+
+        Returns:
+            The response, or None for a notification (no id)
+        """
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get('id')
+        params = request.get('params') or {}
+        self.requests += 1
+
+        try:
+            if not isinstance(params, dict):
+                raise QueryError(INVALID_PARAMS, "params must be an object")
+            method = self.methods.get(request['method'])
+            if method is None:
+                raise QueryError(METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+            result = method(params)
+            if params.get('stream') and isinstance(result, (list, Iterator)):
+                count = 0
+                for items in _chunks(result, self.CHUNK_SIZE):
+                    send({'jsonrpc': '2.0', 'method': 'partial', 'params': {'id': request_id, 'items': items}})
+                    count += len(items)
+                result = {'count': count}
+            elif isinstance(result, Iterator):
+                result = [item for items in result for item in items]
+        except QueryError as e:
+            return _error(request_id, e.code, e.message) if 'id' in request else None
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as e:
+            print(f"[QueryServer] Error in {request['method']}: {e}")
+            return _error(request_id, INTERNAL_ERROR, str(e)) if 'id' in request else None
+
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def _statistics(self, params: Dict) -> Dict:
+        return self.database.get_statistics()
+
+    def _find_symbol(self, params: Dict) -> List[Dict]:
+        return [symbol_to_json(s) for s in self.database.find_symbol(_param(params, 'name', str))]
+
+    def _find_qualified(self, params: Dict) -> Optional[Dict]:
+        symbol = self.database.find_by_qualified_name(_param(params, 'qualified_name', str))
+        return symbol_to_json(symbol) if symbol else None
+
+    def _fuzzy_search(self, params: Dict) -> List[Dict]:
+        limit = _param(params, 'limit', int, 50)
+        # Pool thread: waiting for a loading index does not block the IDE
+        matches = self.database.fuzzy_search(_param(params, 'pattern', str), limit,
+                                             timeout=self.LOAD_WAIT)
+        return [symbol_to_json(s) for s in matches]
+
+    def _file_symbols(self, params: Dict) -> List[Dict]:
+        return [symbol_to_json(s) for s in self.database.get_file_symbols(_param(params, 'path', str))]
+
+    def _references(self, params: Dict) -> Iterator[List[Dict]]:
+        name = _param(params, 'name', str)
+        files = _param(params, 'files', list, None)
+        max_hits = _param(params, 'max_hits', int, None)
+        for file_refs in self.ref_tracker.iter_references(name, files, max_hits=max_hits):
+            yield [ref.to_dict() for ref in file_refs]
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server with one thread per connection"""
+
+    # server_close() waits for the connection threads
+    daemon_threads = False
+    block_on_close = True
+    # Pending connections (clients connecting at once, e.g. a parallel hook)
+    request_queue_size = 64
+
+    def __init__(self, path: str, handler, query_server: QueryServer, bind_and_activate: bool = True):
+        self.query_server = query_server
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        super().__init__(path, handler, bind_and_activate)
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def disconnect_all(self):
+        """End every open connection (their handlers see end of input)"""
+        with self._connections_lock:
+            for request in self._connections:
+                try:
+                    request.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: request lines in, response lines out"""
+
+    def handle(self):
+        server = self.server.query_server
+
+        def send(message):
+            self.wfile.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+            self.wfile.flush()
+
+        try:
+            for line in self.rfile:
+                if line.strip():
+                    # Waiting for input holds no slot, only answering does
+                    with server._queries:
+                        server.handle_line(line, send)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away, e.g. in the middle of a stream
+            pass
+
+
+def _param(params: Dict, name: str, kind: type, default=QueryError):
+    value = params.get(name, default)
+    if value is QueryError:
+        raise QueryError(INVALID_PARAMS, f"Missing parameter: {name}")
+    if value is not None and value is not default and not isinstance(value, kind):
+        raise QueryError(INVALID_PARAMS, f"Parameter {name} must be {kind.__name__}")
+    return value
+
+
+def _chunks(result, size: int) -> Iterator[List]:
+    """Lists of at most size items from a list or an iterator of lists"""
+    if isinstance(result, list):
+        result = [result]
+    for items in result:
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+
+def _error(request_id, code: int, message: str) -> Dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+            return True
+        except OSError:
+            return False
+
+
+# ============================================================================
+# Client
+# ============================================================================
+
+class QueryClient:
+    """
+    Blocking client for tools talking to a running IDE
+
+        with QueryClient() as client:
+            client.call('find_symbol', name='Foo')
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 10.0):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(str(socket_path or default_socket_path()))
+        self.reader = self.sock.makefile('rb')
+        self._next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def call(self, method: str, **params):
+        """
+        Run a request and return its result
+
+        Raises:
+            QueryError: The server answered with an error
+        """
+        self._next_id += 1
+        self._send({'jsonrpc': '2.0', 'id': self._next_id, 'method': method, 'params': params})
+        return _result(self._receive())
+
+    def batch(self, calls: List[tuple]) -> List:
+        """
+        Run several requests in one round trip
+
+        Args:
+            calls: (method, params dict) pairs
+
+        Returns:
+            Results in the order of calls (a QueryError instance for a
+            failed call)
+        """
+        first = self._next_id + 1
+        self._next_id += len(calls)
+        self._send([{'jsonrpc': '2.0', 'id': first + i, 'method': method, 'params': params}
+                    for i, (method, params) in enumerate(calls)])
+        by_id = {response.get('id'): response for response in self._receive()}
+        results = []
+        for i in range(len(calls)):
+            try:
+                results.append(_result(by_id[first + i]))
+            except QueryError as e:
+                results.append(e)
+        return results
+
+    def stream(self, method: str, **params) -> Iterator[List]:
+        """Yield the chunks of a list result as the server sends them"""
+        self._next_id += 1
+        request_id = self._next_id
+        self._send({'jsonrpc': '2.0', 'id': request_id, 'method': method,
+                    'params': dict(params, stream=True)})
+        while True:
+            message = self._receive()
+            if message.get('method') == 'partial' and message['params']['id'] == request_id:
+                yield message['params']['items']
+            elif message.get('id') == request_id:
+                _result(message)
+                return
+
+    def _send(self, message):
+        self.sock.sendall(json.dumps(message).encode() + b'\n')
+
+    def _receive(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the server")
+        return json.loads(line)
+
+
+def _result(response: Dict):
+    if 'error' in response:
+        raise QueryError(response['error']['code'], response['error']['message'])
+    return response.get('result')
+
+
+def main(argv: List[str]) -> int:
+    """Command line client: METHOD [name=value ...] (values parsed as JSON if possible)"""
+    if not argv:
+        print(__doc__)
+        return 2
+    params = {}
+    for arg in argv[1:]:
+        name, _, value = arg.partition('=')
+        try:
+            params[name] = json.loads(value)
+        except ValueError:
+            params[name] = value
+    stream = params.pop('stream', False)
+    try:
+        with QueryClient() as client:
+            if stream:
+                for items in client.stream(argv[0], **params):
+                    for item in items:
+                        print(json.dumps(item))
+            else:
+                print(json.dumps(client.call(argv[0], **params), indent=2))
+    except (OSError, QueryError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -2,9 +2,20 @@
 
 """
 ReferenceTracker - Find all references to a symbol
+
+Files covered by the identifier index are answered from their postings;
+the others (e.g. before the first indexing run finished) are scanned with
+mmap and a compiled byte regex on a thread pool. Results are streamed per
+file, in file order, and the search can be cancelled or capped.
 """
 
-from typing import List, Dict, Optional
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 
 
@@ -21,6 +32,12 @@ class ReferenceTracker:
     Tracks symbol references across codebase
     """
     
+    # Threads reading / scanning files (the regex holds the GIL, so this
+    # mostly overlaps file I/O)
+    MAX_WORKERS = 4
+    # Files submitted ahead of the one being yielded
+    WINDOW = 32
+    
     def __init__(self, database):
         self.db = database
     
@@ -36,57 +53,160 @@ class ReferenceTracker:
             List of Reference objects (file, line, column, context)
         """
         references = []
+        for file_refs in self.iter_references(symbol_name, file_filter):
+            references.extend(file_refs)
+        return references
+    
+    def iter_references(self, symbol_name: str, files: Optional[List[str]] = None,
+                        cancel: Optional[threading.Event] = None,
+                        max_hits: Optional[int] = None) -> Iterator[List[Reference]]:
+        """
+        Stream the references to a symbol, one file at a time
         
-        # Determine which files to search
-        if file_filter:
-            files_to_search = file_filter
-        else:
-            # Search all indexed files
-            files_to_search = list(self.db.symbols_by_file.keys())
+        Args:
+            symbol_name: Name of symbol to find references for
+            files: Files to search in this order (default: all indexed
+                files); files the index does not cover are scanned
+            cancel: Event that stops the search when set
+            max_hits: Stop after this many references
+            
+        Yields:
+            Non-empty lists of Reference objects, grouped by file, in the
+            order of `files`
+        """
+        cancel = cancel or threading.Event()
+        postings = self.db.find_identifier(symbol_name, files)
+        indexed = self.db.get_indexed_files()
+        if files is None:
+            files = indexed
+        indexed = set(indexed)
+        pattern = re.compile(rb'\b' + re.escape(symbol_name.encode('utf-8')) + rb'\b')
         
-        # Search each file
-        for file_path in files_to_search:
-            file_refs = self._search_file_for_references(file_path, symbol_name)
-            references.extend(file_refs)
+        # Stops scans that are still running when the consumer is done
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix='references')
+        pending = deque()
+        hits = 0
+        
+        def submit(file_path: str):
+            if file_path in postings:
+                pending.append(executor.submit(
+                    self._references_from_postings, file_path, symbol_name, postings[file_path]))
+            elif file_path not in indexed:
+                pending.append(executor.submit(
+                    self._search_file_for_references, file_path, symbol_name, pattern, stop))
+            # else: indexed and the name does not occur in it
+        
+        try:
+            remaining = iter(files)
+            for file_path in remaining:
+                submit(file_path)
+                if len(pending) >= self.WINDOW:
+                    break
+            
+            while pending and not cancel.is_set():
+                references = pending.popleft().result()
+                for file_path in remaining:
+                    submit(file_path)
+                    if len(pending) >= self.WINDOW:
+                        break
+                if not references or cancel.is_set():
+                    continue
+                if max_hits is not None and hits + len(references) >= max_hits:
+                    yield references[:max_hits - hits]
+                    return
+                hits += len(references)
+                yield references
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _references_from_postings(self, file_path: str, symbol_name: str,
+                                  positions: List[Tuple[int, int]]) -> List[Reference]:
+        """
+        Turn indexed (line, column) positions into references
+        
+        Args:
+            file_path: File the positions are in
+            symbol_name: Symbol name
+            positions: Indexed occurrences, in file order
+            
+        Returns:
+            List of Reference objects; the file is searched again if it
+            changed on disk since it was indexed
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except Exception as e:
+            print(f"[ReferenceTracker] Error searching {file_path}: {e}")
+            return []
         
+        references = []
+        for line_num, col in positions:
+            line = lines[line_num - 1] if line_num <= len(lines) else ''
+            if not line.startswith(symbol_name, col) or not self._is_whole_word(line, col, symbol_name):
+                # Stale postings
+                return self._search_file_for_references(file_path, symbol_name)
+            references.append(Reference(
+                file_path=file_path,
+                line=line_num,
+                column=col,
+                context=line.strip()
+            ))
         return references
     
-    def _search_file_for_references(self, file_path: str, symbol_name: str) -> List[Reference]:
+    def _search_file_for_references(self, file_path: str, symbol_name: str,
+                                    pattern: Optional[re.Pattern] = None,
+                                    stop: Optional[threading.Event] = None) -> List[Reference]:
         """
         Search a single file for references to a symbol
         
+        The file is memory-mapped and searched with a byte regex; only
+        the lines with a match are decoded.
+        
         Args:
             file_path: Path to file to search
             symbol_name: Symbol name to find
+            pattern: Compiled whole-word byte regex (built if None)
+            stop: Event that ends the scan early when set
             
         Returns:
             List of Reference objects found in this file
         """
+        if pattern is None:
+            pattern = re.compile(rb'\b' + re.escape(symbol_name.encode('utf-8')) + rb'\b')
         references = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            for line_num, line in enumerate(lines, 1):
-                # Find all occurrences of symbol_name in this line
-                col = 0
-                while True:
-                    col = line.find(symbol_name, col)
-                    if col == -1:
-                        break
-                    
-                    # Verify it's a whole word (not part of another identifier)
-                    if self._is_whole_word(line, col, symbol_name):
-                        context = line.strip()
-                        references.append(Reference(
-                            file_path=file_path,
-                            line=line_num,
-                            column=col,
-                            context=context
-                        ))
-                    
-                    col += len(symbol_name)
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return references
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    line_num = 1
+                    counted = 0
+                    for match in pattern.finditer(data):
+                        if stop is not None and stop.is_set():
+                            break
+                        start = match.start()
+                        line_num += data[counted:start].count(b'\n')
+                        counted = start
+                        
+                        line_start = data.rfind(b'\n', 0, start) + 1
+                        line_end = data.find(b'\n', start)
+                        if line_end == -1:
+                            line_end = len(data)
+                        line = data[line_start:line_end].decode('utf-8')
+                        col = len(data[line_start:start].decode('utf-8'))
+                        
+                        # \b only knows ASCII word characters
+                        if self._is_whole_word(line, col, symbol_name):
+                            references.append(Reference(
+                                file_path=file_path,
+                                line=line_num,
+                                column=col,
+                                context=line.strip()
+                            ))
         
         except Exception as e:
             print(f"[ReferenceTracker] Error searching {file_path}: {e}")
@@ -128,36 +248,7 @@ class ReferenceTracker:
             symbol_name: Symbol name
             
         Returns:
-            Count of references
+            Count of references in the indexed files (as of their last
+            indexing)
         """
-        count = 0
-        
-        for file_path in self.db.symbols_by_file.keys():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Quick count using string methods
-                col = 0
-                while True:
-                    col = content.find(symbol_name, col)
-                    if col == -1:
-                        break
-                    
-                    # Simple whole-word check
-                    if col > 0 and (content[col-1].isalnum() or content[col-1] == '_'):
-                        col += 1
-                        continue
-                    
-                    end = col + len(symbol_name)
-                    if end < len(content) and (content[end].isalnum() or content[end] == '_'):
-                        col += 1
-                        continue
-                    
-                    count += 1
-                    col += len(symbol_name)
-            
-            except Exception as e:
-                print(f"[ReferenceTracker] Error counting in {file_path}: {e}")
-        
-        return count
+        return self.db.count_identifier(symbol_name)
@@ -0,0 +1,155 @@
+# ide/plugins/Codeintelligence/ReferencesPanelWidget.py
+
+"""
+ReferencesPanelWidget - Find-references results panel for right sidebar
+"""
+
+from pathlib import Path
+from typing import List
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QTreeWidget, QTreeWidgetItem
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from .SymbolInfo import SymbolInfo, Reference
+
+
+class ReferencesPanelWidget(QWidget):
+    """
+    Find-references results panel for right sidebar
+    Results are appended per file while the search is still running
+    """
+
+    # Emitted when the user stops the running search
+    stop_requested = pyqtSignal()
+
+    def __init__(self, navigation_manager, parent=None):
+        super().__init__(parent)
+        self.nav_manager = navigation_manager
+        self.symbol_name = None
+        self.reference_count = 0
+
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize UI"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        # Header
+        header_layout = QHBoxLayout()
+
+        self.title = QLabel("References")
+        self.title.setStyleSheet("font-weight: bold; font-size: 14px;")
+        header_layout.addWidget(self.title)
+
+        self.stop_btn = QPushButton("⏹")
+        self.stop_btn.setFixedWidth(30)
+        self.stop_btn.setToolTip("Stop searching")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_requested.emit)
+        header_layout.addWidget(self.stop_btn)
+
+        layout.addLayout(header_layout)
+
+        # Results tree (file -> references)
+        self.results_tree = QTreeWidget()
+        self.results_tree.setHeaderHidden(True)
+        self.results_tree.setStyleSheet("""
+            QTreeWidget {
+                background-color: #2B2B2B;
+                color: #CCC;
+                border: none;
+            }
+            QTreeWidget::item {
+                padding: 4px;
+            }
+            QTreeWidget::item:selected {
+                background-color: #4A9EFF;
+            }
+            QTreeWidget::item:hover {
+                background-color: #3C3F41;
+            }
+        """)
+        self.results_tree.itemClicked.connect(self.on_reference_clicked)
+        layout.addWidget(self.results_tree)
+
+        # Stats label
+        self.stats_label = QLabel("No search")
+        self.stats_label.setStyleSheet("color: #666; font-size: 10px;")
+        layout.addWidget(self.stats_label)
+
+    def start(self, symbol_name: str):
+        """
+        Reset the panel for a new search
+
+        Args:
+            symbol_name: Symbol being searched
+        """
+        self.symbol_name = symbol_name
+        self.reference_count = 0
+        self.results_tree.clear()
+        self.title.setText(f"References: {symbol_name}")
+        self.stats_label.setText("Searching...")
+        self.stop_btn.setEnabled(True)
+
+    def add_references(self, references: List[Reference]):
+        """
+        Append the references found in one file
+
+        Args:
+            references: References of a single file
+        """
+        if not references:
+            return
+
+        file_path = references[0].file_path
+        file_item = QTreeWidgetItem([f"📄 {Path(file_path).name} ({len(references)})"])
+        file_item.setToolTip(0, file_path)
+        self.results_tree.addTopLevelItem(file_item)
+
+        for reference in references:
+            item = QTreeWidgetItem([f"{reference.line}: {reference.context}"])
+            item.setData(0, Qt.ItemDataRole.UserRole, reference)
+            file_item.addChild(item)
+        file_item.setExpanded(True)
+
+        self.reference_count += len(references)
+        self.stats_label.setText(f"Searching... {self.reference_count} references")
+
+    def finish(self, truncated: bool = False, cancelled: bool = False):
+        """
+        Show the final count
+
+        Args:
+            truncated: The search stopped at its hit limit
+            cancelled: The search was stopped by the user
+        """
+        self.stop_btn.setEnabled(False)
+        files = self.results_tree.topLevelItemCount()
+        text = f"{self.reference_count} references in {files} files"
+        if truncated:
+            text += " (limit reached)"
+        elif cancelled:
+            text += " (stopped)"
+        self.stats_label.setText(text)
+
+    def on_reference_clicked(self, item, column):
+        """
+        Handle reference click - jump to its position
+
+        Args:
+            item: QTreeWidgetItem that was clicked
+            column: Column index (ignored)
+        """
+        reference = item.data(0, Qt.ItemDataRole.UserRole)
+        if reference and self.symbol_name:
+            self.nav_manager.jump_to_symbol(SymbolInfo(
+                name=self.symbol_name,
+                symbol_type='reference',
+                file_path=reference.file_path,
+                line=reference.line,
+                column=reference.column,
+            ))
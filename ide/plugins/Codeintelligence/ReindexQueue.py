@@ -0,0 +1,175 @@
+# ide/plugins/Codeintelligence/ReindexQueue.py
+
+"""
+ReindexQueue - Background re-indexing of saved files and live buffers
+
+Saves and edits are queued here instead of being indexed on the GUI
+thread. The queue keeps at most one job per file: a new request for a file
+that is still waiting replaces the old one (keeping the higher priority),
+so repeated saves or a burst of edits cost a single parse. Jobs wait for
+their debounce delay, then run highest priority first.
+
+Buffer jobs carry the editor text and a document revision key; a buffer
+is not parsed again for a revision that was already indexed.
+
+When a saved file changes its module-level definitions, only its direct
+importers (from the import graph, see DependencyGraph) are queued after
+it, at the lowest priority.
+"""
+
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .SymbolIndexer import SymbolIndexer
+from .IndexManifest import read_file_state
+from .IdentifierIndex import extract_identifiers
+from .DependencyGraph import resolve_dependencies
+
+
+class ReindexJob(NamedTuple):
+    """A queued re-index of one file"""
+    priority: int
+    due: float                  # time.monotonic() after which it may run
+    seq: int                    # FIFO order within a priority
+    content: Optional[str]      # Buffer text, None to read the file from disk
+    revision: object            # Buffer revision key, None for disk jobs
+
+
+class ReindexQueue(QThread):
+    """
+    Worker thread indexing queued files one at a time
+    """
+
+    # Priorities, lowest value runs first
+    PRIORITY_EDIT = 0   # Unsaved edits in an open editor
+    PRIORITY_SAVE = 1   # File saved to disk
+    PRIORITY_DEPENDENT = 2   # Importer of a saved file whose interface changed
+
+    # (file path, symbol count)
+    indexed = pyqtSignal(str, int)
+
+    def __init__(self, indexer: SymbolIndexer, database, parent=None):
+        super().__init__(parent)
+        self.indexer = indexer
+        self.database = database
+        self._condition = threading.Condition()
+        self._pending: Dict[str, ReindexJob] = {}
+        self._seq = 0
+        self._running = True
+        # File path -> revision key of the buffer text last indexed
+        self._revisions: Dict[str, object] = {}
+        self.jobs_run = 0
+        self.jobs_coalesced = 0
+        self.dependents_queued = 0
+
+    def request(self, file_path: str, priority: int, content: Optional[str] = None,
+                revision: object = None, delay: float = 0.0):
+        """
+        Queue a file, replacing its pending job if there is one
+
+        Args:
+            file_path: File to index
+            priority: PRIORITY_EDIT, PRIORITY_SAVE or PRIORITY_DEPENDENT
+            content: Buffer text, or None to read the file from disk
+            revision: Key of the buffer revision content belongs to
+            delay: Seconds to wait for further requests of the same file
+        """
+        with self._condition:
+            old = self._pending.get(file_path)
+            if old is not None:
+                priority = min(priority, old.priority)
+                self.jobs_coalesced += 1
+            self._seq += 1
+            self._pending[file_path] = ReindexJob(
+                priority, time.monotonic() + delay, self._seq, content, revision)
+            self._condition.notify()
+
+        if not self.isRunning():
+            self.start()
+
+    def pending_count(self) -> int:
+        """Number of files waiting to be indexed"""
+        with self._condition:
+            return len(self._pending)
+
+    def stop(self):
+        """Stop the thread after the current job and wait for it"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self.wait()
+
+    def _next_job(self):
+        """
+        Pick the job to run (condition held)
+
+        Returns:
+            Tuple of (file path, job, None) or, when no job is due yet,
+            (None, None, seconds to wait or None)
+        """
+        now = time.monotonic()
+        ready = [(job.priority, job.seq, path) for path, job in self._pending.items() if job.due <= now]
+        if ready:
+            path = min(ready)[2]
+            return path, self._pending.pop(path), None
+        if self._pending:
+            return None, None, min(job.due for job in self._pending.values()) - now
+        return None, None, None
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._running:
+                    path, job, timeout = self._next_job()
+                    if path is not None:
+                        break
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+
+            self._index(path, job)
+
+    def _index(self, file_path: str, job: ReindexJob):
+        """Parse one file and replace its symbols"""
+        try:
+            if job.content is None:
+                content, state = read_file_state(file_path, SymbolIndexer.VERSION)
+            elif self._revisions.get(file_path) == job.revision:
+                return
+            else:
+                # Unsaved text: no manifest state, so the next workspace
+                # index reads the file from disk again
+                content, state = job.content, None
+
+            if job.priority == self.PRIORITY_SAVE:
+                old_interface = self._interface(self.database.get_file_symbols(file_path))
+            symbols, imports = self.indexer.parse_file(file_path, content)
+            imports = resolve_dependencies(file_path, imports, roots=self.database.import_roots)
+            self.database.replace_file(file_path, symbols, state, extract_identifiers(content), imports)
+            self._revisions[file_path] = job.revision
+            self.jobs_run += 1
+
+            if job.priority == self.PRIORITY_SAVE and self._interface(symbols) != old_interface:
+                self._queue_dependents(file_path)
+
+        except Exception as e:
+            print(f"[ReindexQueue] Error indexing {file_path}: {e}")
+            return
+
+        self.indexed.emit(file_path, len(symbols))
+
+    @staticmethod
+    def _interface(symbols) -> frozenset:
+        """What importers of a file can see: its module-level definitions"""
+        return frozenset((s.name, s.type, tuple(s.parameters)) for s in symbols if s.parent is None)
+
+    def _queue_dependents(self, file_path: str):
+        """Queue the files importing file_path from disk"""
+        for dependent in self.database.get_dependents(file_path):
+            # Files last indexed from an unsaved buffer keep that text
+            if dependent != file_path and self._revisions.get(dependent) is None:
+                self.request(dependent, self.PRIORITY_DEPENDENT)
+                self.dependents_queued += 1
@@ -0,0 +1,554 @@
+# ide/plugins/Codeintelligence/ShardedSymbolDatabase.py
+
+"""
+ShardedSymbolDatabase - One SymbolDatabase per active project
+
+Each project gets its own shard (its own SQLite file, slots and search
+index) under <cache dir>/shards/. Activating a project mounts its shard:
+opening the SQLite file takes milliseconds, and the search index is loaded
+by load_from_cache() in the background. Deactivating a project closes the
+shard and drops its in-memory index. Files outside every mounted project
+(e.g. a saved file that belongs to no active project) go to a "loose"
+shard that is always mounted. A project shard created for the first time
+is seeded from the index used before sharding (one database, or older
+still a JSON file, in the cache dir), which is kept for the projects not
+activated yet.
+
+The class offers the SymbolDatabase API used by the plugin, routing every
+file to the shard of the deepest project that contains it and merging
+query results over all mounted shards. Every call pins the shards it
+uses, so a project deactivated meanwhile is only closed once the calls
+of other threads (indexing, references, completion, query server) are
+done with its shard.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .SymbolDatabase import SymbolDatabase
+from .SymbolInfo import SymbolInfo, ImportInfo
+from .IndexManifest import FileState
+from .PositionIndex import PositionIndex, source_roots
+from .PrefixIndex import PrefixIndex
+
+
+class ShardedSymbolDatabase:
+    """
+    Per-project symbol index shards behind the SymbolDatabase API
+    """
+
+    LOOSE_SHARD = "_loose"
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.shards_dir = cache_dir / "shards"
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+
+        # Guards the shard map; shards lock their own data
+        self._lock = threading.RLock()
+        self._stats_listeners: List[Callable[[], None]] = []
+        # New shard -> project root, seeded from the legacy index when loaded
+        self._pending_imports: Dict[SymbolDatabase, str] = {}
+        # Project root -> its declared source roots; the project and
+        # source roots, given to every shard, bound import resolution
+        self._source_roots: Dict[str, List[str]] = {}
+        self.import_roots: Tuple[str, ...] = ()
+        # Project root -> shard, plus the loose shard under LOOSE_SHARD
+        self.shards: Dict[str, SymbolDatabase] = {}
+        self.shards[self.LOOSE_SHARD] = self._open(self.LOOSE_SHARD)
+        # Shard -> running calls using it (see _using); unmounted shards
+        # still in use wait in _retired
+        self._users: Counter = Counter()
+        self._retired = set()
+
+    def _shard_dir(self, root: str) -> Path:
+        if root == self.LOOSE_SHARD:
+            return self.shards_dir / root
+        digest = hashlib.blake2b(root.encode('utf-8'), digest_size=6).hexdigest()
+        return self.shards_dir / f"{Path(root).name}-{digest}"
+
+    def _open(self, root: str) -> SymbolDatabase:
+        shard_dir = self._shard_dir(root)
+        fresh = not shard_dir.exists()
+        shard_dir.mkdir(exist_ok=True)
+        shard = SymbolDatabase(shard_dir, load=False)
+        shard.import_roots = self.import_roots
+        shard.add_stats_listener(self._notify_stats)
+        if fresh and root != self.LOOSE_SHARD:
+            self._pending_imports[shard] = root
+        return shard
+
+    # ========================================================================
+    # Legacy index
+    # ========================================================================
+
+    def _import_unsharded(self, root: str, shard: SymbolDatabase):
+        """
+        Seed a new project shard with the project's files from the index
+        used before sharding, so its symbols are searchable before the
+        first index run has finished. The entries keep their old file
+        state; the indexer re-parses whatever is stale.
+        """
+        try:
+            entries = self._legacy_entries(root + os.sep)
+            if entries:
+                added = shard.import_files(entries)
+                print(f"[ShardedSymbolDatabase] Imported {added} files of {root} from the unsharded index")
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"[ShardedSymbolDatabase] Cannot import the unsharded index for {root}: {e}")
+
+    def _legacy_entries(self, prefix: str) -> list:
+        """(path, symbols, state, identifiers, None) of the legacy files below prefix"""
+        db_file = self.cache_dir / "symbol_index.db"
+        if db_file.exists():
+            return self._legacy_database_entries(db_file, prefix)
+        json_file = self.cache_dir / "symbol_index.json"
+        if json_file.exists():
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            by_file: Dict[str, List[SymbolInfo]] = {}
+            for entry in data.get('symbols', []):
+                if entry.get('file_path', '').startswith(prefix):
+                    symbol = SymbolInfo.from_dict(entry)
+                    by_file.setdefault(symbol.file_path, []).append(symbol)
+            return [(path, symbols, None, None, None) for path, symbols in by_file.items()]
+        return []
+
+    @staticmethod
+    def _legacy_database_entries(db_file: Path, prefix: str) -> list:
+        conn = sqlite3.connect(f"{db_file.as_uri()}?mode=ro", uri=True)
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            file_columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+            has_state = {'size', 'mtime_ns', 'content_hash', 'indexer_version'} <= file_columns
+            state_columns = "size, mtime_ns, content_hash, indexer_version" if has_state else "NULL, NULL, NULL, NULL"
+            # LIKE would treat '_' and '%' in the path as wildcards
+            files = conn.execute(
+                f"SELECT id, path, {state_columns} FROM files WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchall()
+
+            entries = []
+            for file_id, path, *state in files:
+                symbols = [
+                    SymbolInfo(
+                        name, symbol_type, path, line, col, parent=parent,
+                        children=json.loads(children) if children else None,
+                        parameters=json.loads(parameters) if parameters else None,
+                        decorators=json.loads(decorators) if decorators else None,
+                        bases=json.loads(bases) if bases else None,
+                        docstring=docstring,
+                    )
+                    for name, symbol_type, line, col, parent, children, parameters, decorators, bases, docstring
+                    in conn.execute(
+                        "SELECT name, type, line, col, parent, children, parameters, decorators, bases, docstring "
+                        "FROM symbols WHERE file_id = ? ORDER BY id", (file_id,)
+                    )
+                ]
+                identifiers = None
+                if 'idents' in tables:
+                    identifiers = conn.execute(
+                        "SELECT token, count, postings FROM idents WHERE file_id = ?", (file_id,)
+                    ).fetchall()
+                file_state = FileState(*state) if has_state and state[0] is not None else None
+                entries.append((path, symbols, file_state, identifiers, None))
+            return entries
+        finally:
+            conn.close()
+
+    # ========================================================================
+    # Mounting
+    # ========================================================================
+
+    def mount(self, project_path) -> SymbolDatabase:
+        """
+        Open the shard of a project (its search index is loaded by the
+        next load_from_cache call)
+
+        Args:
+            project_path: Project directory
+
+        Returns:
+            The shard
+        """
+        root = os.path.normpath(str(project_path))
+        declared = source_roots(root)
+        with self._lock:
+            shard = self.shards.get(root)
+            if shard is None:
+                shard = self._open(root)
+                self.shards[root] = shard
+                self._source_roots[root] = declared
+                self._update_import_roots()
+                print(f"[ShardedSymbolDatabase] Mounted {root}")
+            else:
+                return shard
+        self._notify_stats()
+
+        # Files saved while the project was inactive went to the loose
+        # shard; the project shard picks them up when it is re-indexed
+        with self._using() as shards:
+            loose = shards.get(self.LOOSE_SHARD)
+            for path in loose.get_indexed_files() if loose is not None else ():
+                if path.startswith(root + os.sep):
+                    loose.remove_file(path)
+        return shard
+
+    def unmount(self, project_path):
+        """
+        Close the shard of a project and release its memory (it stays on
+        disk for the next activation). A shard still used by a running
+        call is retired instead and closed when the last one returns.
+
+        Args:
+            project_path: Project directory
+        """
+        root = os.path.normpath(str(project_path))
+        with self._lock:
+            shard = self.shards.pop(root, None)
+            in_use = shard is not None and self._users[shard] > 0
+            if in_use:
+                self._retired.add(shard)
+            if self._source_roots.pop(root, None) is not None:
+                self._update_import_roots()
+        if shard is None:
+            return
+        if not in_use:
+            self._close_shard(shard)
+        print(f"[ShardedSymbolDatabase] Unmounted {root}")
+        self._notify_stats()
+
+    def _update_import_roots(self):
+        """Give every shard the mounted project and source roots (lock held)"""
+        roots = []
+        for root in sorted(self._source_roots):
+            roots.append(root)
+            roots.extend(self._source_roots[root])
+        self.import_roots = tuple(roots)
+        for shard in self.shards.values():
+            shard.import_roots = self.import_roots
+
+    @staticmethod
+    def _close_shard(shard: SymbolDatabase):
+        shard.save_to_cache()
+        shard.close()
+
+    def set_projects(self, project_paths: Iterable) -> Tuple[List[str], List[str]]:
+        """
+        Mount exactly the given projects
+
+        Args:
+            project_paths: Active project directories
+
+        Returns:
+            Tuple of (mounted roots, unmounted roots)
+        """
+        wanted = {os.path.normpath(str(p)) for p in project_paths}
+        current = set(self.project_roots())
+        for root in current - wanted:
+            self.unmount(root)
+        for root in sorted(wanted - current):
+            self.mount(root)
+        return sorted(wanted - current), sorted(current - wanted)
+
+    def project_roots(self) -> List[str]:
+        """Roots of the mounted projects"""
+        with self._lock:
+            return [root for root in self.shards if root != self.LOOSE_SHARD]
+
+    def shard_for(self, file_path: str) -> Optional[SymbolDatabase]:
+        """
+        Shard a file belongs to: the deepest mounted project containing
+        it, or the loose shard (None once the database is closed)
+        """
+        with self._lock:
+            return self._route(self.shards, file_path)
+
+    def _route(self, shards: Dict[str, SymbolDatabase], file_path: str) -> Optional[SymbolDatabase]:
+        path = os.path.normpath(file_path)
+        best, best_len = shards.get(self.LOOSE_SHARD), -1
+        for root, shard in shards.items():
+            if root != self.LOOSE_SHARD and len(root) > best_len and (
+                    path.startswith(root + os.sep) or path == root):
+                best, best_len = shard, len(root)
+        return best
+
+    @contextmanager
+    def _using(self):
+        """
+        Pin the mounted shards for the duration of a call, so unmounting
+        a project from another thread cannot close a shard under it
+
+        Yields:
+            Dict of project root -> shard, as mounted when the call began
+        """
+        with self._lock:
+            shards = dict(self.shards)
+            self._users.update(shards.values())
+        try:
+            yield shards
+        finally:
+            closing = []
+            with self._lock:
+                for shard in shards.values():
+                    self._users[shard] -= 1
+                    if self._users[shard] <= 0:
+                        del self._users[shard]
+                        if shard in self._retired:
+                            self._retired.discard(shard)
+                            closing.append(shard)
+            for shard in closing:
+                self._close_shard(shard)
+
+    def _grouped(self, shards: Dict[str, SymbolDatabase], items: Iterable, path_of) -> Dict[SymbolDatabase, list]:
+        groups: Dict[SymbolDatabase, list] = {}
+        for item in items:
+            shard = self._route(shards, path_of(item))
+            if shard is not None:
+                groups.setdefault(shard, []).append(item)
+        return groups
+
+    # ========================================================================
+    # Writing
+    # ========================================================================
+
+    def replace_file(self, file_path: str, symbols: List[SymbolInfo], state: Optional[FileState] = None,
+                     identifiers=None, imports: Optional[List[ImportInfo]] = None) -> List[str]:
+        """See SymbolDatabase.replace_file"""
+        return self.replace_files([(file_path, symbols, state, identifiers, imports)])
+
+    def replace_files(self, entries: list) -> List[str]:
+        """
+        See SymbolDatabase.replace_files (one transaction per shard);
+        imports in other shards are bound to the added files as well
+        """
+        added = []
+        with self._using() as shards:
+            for shard, shard_entries in self._grouped(shards, entries, lambda entry: entry[0]).items():
+                shard_added = shard.replace_files(shard_entries)
+                if shard_added:
+                    for other in shards.values():
+                        if other is not shard:
+                            other.bind_imports(shard_added)
+                    added.extend(shard_added)
+        return added
+
+    def add_symbols(self, symbols: List[SymbolInfo]):
+        """See SymbolDatabase.add_symbols"""
+        with self._using() as shards:
+            for shard, shard_symbols in self._grouped(shards, symbols, lambda symbol: symbol.file_path).items():
+                shard.add_symbols(shard_symbols)
+
+    def update_file_state(self, file_path: str, state: FileState):
+        """See SymbolDatabase.update_file_state"""
+        with self._using() as shards:
+            shard = self._route(shards, file_path)
+            if shard is not None:
+                shard.update_file_state(file_path, state)
+
+    def remove_file(self, file_path: str):
+        """See SymbolDatabase.remove_file"""
+        with self._using() as shards:
+            shard = self._route(shards, file_path)
+            if shard is None:
+                return
+            shard.remove_file(file_path)
+            if not os.path.exists(file_path):
+                for other in shards.values():
+                    if other is not shard:
+                        other.unbind_imports(file_path)
+
+    def clear(self):
+        """Clear every mounted shard"""
+        with self._using() as shards:
+            for shard in shards.values():
+                shard.clear()
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    def find_symbol(self, name: str) -> List[SymbolInfo]:
+        """See SymbolDatabase.find_symbol"""
+        with self._using() as shards:
+            return [symbol for shard in shards.values() for symbol in shard.find_symbol(name)]
+
+    def find_by_qualified_name(self, qualified_name: str) -> Optional[SymbolInfo]:
+        """See SymbolDatabase.find_by_qualified_name"""
+        found = None
+        with self._using() as shards:
+            for shard in shards.values():
+                found = shard.find_by_qualified_name(qualified_name) or found
+        return found
+
+    def _on_file(self, file_path: str, query: Callable[[SymbolDatabase], object], empty):
+        """Run a per-file query on the file's shard (empty once closed)"""
+        with self._using() as shards:
+            shard = self._route(shards, file_path)
+            return query(shard) if shard is not None else empty
+
+    def get_file_symbols(self, file_path: str) -> List[SymbolInfo]:
+        """See SymbolDatabase.get_file_symbols"""
+        return self._on_file(file_path, lambda shard: shard.get_file_symbols(file_path), [])
+
+    def get_file_imports(self, file_path: str) -> List[ImportInfo]:
+        """See SymbolDatabase.get_file_imports"""
+        return self._on_file(file_path, lambda shard: shard.get_file_imports(file_path), [])
+
+    def get_dependencies(self, file_path: str) -> List[str]:
+        """See SymbolDatabase.get_dependencies"""
+        return self._on_file(file_path, lambda shard: shard.get_dependencies(file_path), [])
+
+    def get_dependents(self, file_path: str) -> List[str]:
+        """See SymbolDatabase.get_dependents (importers in every shard)"""
+        with self._using() as shards:
+            return sorted(path for shard in shards.values() for path in shard.get_dependents(file_path))
+
+    def get_position_index(self, file_path: str) -> PositionIndex:
+        """See SymbolDatabase.get_position_index"""
+        return self._on_file(file_path, lambda shard: shard.get_position_index(file_path),
+                             PositionIndex([], []))
+
+    def get_token_index(self, file_path: str):
+        """See SymbolDatabase.get_token_index"""
+        return self._on_file(file_path, lambda shard: shard.get_token_index(file_path), PrefixIndex([]))
+
+    def complete_names(self, prefix: str, limit: int = 50,
+                       deadline: Optional[float] = None) -> List[Tuple[str, str, int]]:
+        """See SymbolDatabase.complete_names (definitions summed over shards)"""
+        merged: Dict[str, list] = {}
+        with self._using() as shards:
+            for shard in shards.values():
+                for name, symbol_type, count in shard.complete_names(prefix, limit, deadline):
+                    entry = merged.setdefault(name, [name, symbol_type, 0])
+                    entry[2] += count
+        return [tuple(entry) for _, entry in sorted(merged.items())]
+
+    def get_indexed_files(self) -> List[str]:
+        """See SymbolDatabase.get_indexed_files"""
+        with self._using() as shards:
+            return [path for shard in shards.values() for path in shard.get_indexed_files()]
+
+    def get_manifest(self) -> Dict[str, FileState]:
+        """See SymbolDatabase.get_manifest"""
+        manifest = {}
+        with self._using() as shards:
+            for shard in shards.values():
+                manifest.update(shard.get_manifest())
+        return manifest
+
+    def find_identifier(self, token: str, files: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[int, int]]]:
+        """See SymbolDatabase.find_identifier"""
+        files = list(files) if files is not None else None
+        result = {}
+        with self._using() as shards:
+            for shard in shards.values():
+                result.update(shard.find_identifier(token, files))
+        return result
+
+    def count_identifier(self, token: str) -> int:
+        """See SymbolDatabase.count_identifier"""
+        with self._using() as shards:
+            return sum(shard.count_identifier(token) for shard in shards.values())
+
+    def fuzzy_search(self, pattern: str, limit: int = 50, timeout: float = 0.0) -> List[SymbolInfo]:
+        """
+        Fuzzy search all shards (see SymbolDatabase.fuzzy_search); the
+        timeout is shared by the shards still loading
+        """
+        deadline = time.monotonic() + timeout
+        scored = []
+        with self._using() as shards:
+            for shard in shards.values():
+                remaining = max(0.0, deadline - time.monotonic())
+                scored.extend(shard.fuzzy_search_scored(pattern, limit, remaining))
+        best = heapq.nlargest(limit, scored, key=lambda item: item[0])
+        return [symbol for score, symbol in best]
+
+    def get_statistics(self) -> Dict:
+        """
+        Get index statistics, summed over the shards
+
+        Returns:
+            Dictionary with the SymbolDatabase statistics plus 'shards':
+            per-project statistics keyed by project root
+        """
+        totals = {'total_symbols': 0, 'files_indexed': 0, 'classes': 0,
+                  'functions': 0, 'methods': 0, 'memory_bytes': 0}
+        types = Counter()
+        shards = {}
+        with self._using() as mounted:
+            for root, shard in mounted.items():
+                stats = shard.get_statistics()
+                shards[root] = stats
+                for key in totals:
+                    totals[key] += stats[key]
+                types.update(stats['types'])
+        totals['types'] = dict(types)
+        totals['shards'] = shards
+        return totals
+
+    def get_file_symbol_count(self, file_path: str) -> int:
+        """See SymbolDatabase.get_file_symbol_count"""
+        return self._on_file(file_path, lambda shard: shard.get_file_symbol_count(file_path), 0)
+
+    def add_stats_listener(self, callback: Callable[[], None]):
+        """
+        Call back after every change of the statistics of any shard, and
+        when a project is mounted or unmounted
+        """
+        self._stats_listeners.append(callback)
+
+    def _notify_stats(self):
+        for callback in self._stats_listeners:
+            callback()
+
+    # ========================================================================
+    # Loading / persistence
+    # ========================================================================
+
+    def is_ready(self) -> bool:
+        """True once every mounted shard's search index is loaded"""
+        with self._using() as shards:
+            return all(shard.is_ready() for shard in shards.values())
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until every mounted shard is loaded (see SymbolDatabase)"""
+        with self._using() as shards:
+            return all(shard.wait_until_ready(timeout) for shard in shards.values())
+
+    def load_from_cache(self):
+        """Load the search indexes of the shards that are not loaded yet"""
+        with self._using() as shards:
+            for shard in shards.values():
+                if not shard.is_ready():
+                    with self._lock:
+                        root = self._pending_imports.pop(shard, None)
+                    if root is not None:
+                        self._import_unsharded(root, shard)
+                    shard.load_from_cache()
+
+    def save_to_cache(self):
+        """Checkpoint every mounted shard"""
+        with self._using() as shards:
+            for shard in shards.values():
+                shard.save_to_cache()
+
+    def close(self):
+        """
+        Unmount every shard (closed once no call uses it); the database
+        then behaves as empty and ignores writes
+        """
+        with self._lock:
+            roots = list(self.shards)
+        for root in roots:
+            self.unmount(root)
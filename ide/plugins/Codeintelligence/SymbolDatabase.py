@@ -2,16 +2,50 @@
 
 """
 SymbolDatabase - Storage and indexing for symbols
+
+Symbols live in an SQLite database (WAL mode) in the plugin cache dir:
+
+    files    (id, path, size, mtime_ns, content_hash, indexer_version)
+    symbols  (id, file_id, name, qualified_name, type, line, col, end_line,
+              parent, children, parameters, decorators, bases, docstring)
+    refs     (symbol_id, file_path, line, col)
+    idents   (token, file_id, count, postings)
+    imports  (file_id, alias, module, name, line, target, stem)
+
+Re-indexing a file is one transaction that replaces that file's rows, so
+there is no "save everything" step any more. The file columns form the
+manifest used to skip unchanged files (see IndexManifest). idents holds
+the identifier occurrences of each file for find-references (see
+IdentifierIndex), imports the names each file imports (see
+PositionIndex) and the file each import loads, which makes it the import
+graph of the workspace (see DependencyGraph). Lookups go to SQLite through
+a small LRU of hot query results; the only thing kept for every symbol in
+memory is its slot (lowercase name + id, see SymbolSlots) and the search
+index over the slot names (see SymbolSearchIndex), so adding or removing a
+file costs O(symbols in that file). Symbol counts per type and per file
+are kept up to date along with the slots, so statistics never query the
+database; listeners are told when they change.
 """
 
 import json
+import os
+import sqlite3
 import threading
+import time
+from collections import Counter, OrderedDict
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 
-from .SymbolInfo import SymbolInfo, Reference
+from .SymbolInfo import SymbolInfo, Reference, ImportInfo
+from .IndexManifest import FileState
+from .IdentifierIndex import IdentifierPostings, decode_postings
+from .SymbolSlots import SymbolSlots
+from .SymbolSearchIndex import SymbolSearchIndex
+from .PositionIndex import PositionIndex
+from .PrefixIndex import PrefixIndex
+from .DependencyGraph import resolve_dependencies, import_stem, file_stems
 
 
 class SymbolDatabase:
@@ -19,256 +53,1078 @@ class SymbolDatabase:
     Storage and indexing for symbols
     Optimized for fast lookups with multiple indexes
     """
-    
-    def __init__(self, cache_dir: Path):
+
+    # Bump when the table layout changes; the index is a cache, so an
+    # old database is simply dropped and rebuilt.
+    SCHEMA_VERSION = 6
+
+    # Number of query results kept in the hot-row LRU
+    MAX_CACHED_QUERIES = 2048
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            id   INTEGER PRIMARY KEY,
+            path            TEXT NOT NULL UNIQUE,
+            size            INTEGER,
+            mtime_ns        INTEGER,
+            content_hash    TEXT,
+            indexer_version INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS symbols (
+            -- AUTOINCREMENT: ids are never reused, so the deferred docstring
+            -- of a SymbolInfo from before a re-index cannot load another row
+            id             INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_id        INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+            name           TEXT NOT NULL,
+            qualified_name TEXT NOT NULL,
+            type           TEXT NOT NULL,
+            line           INTEGER NOT NULL,
+            col            INTEGER NOT NULL,
+            end_line       INTEGER,
+            parent         TEXT,
+            children       TEXT,
+            parameters     TEXT,
+            decorators     TEXT,
+            bases          TEXT,
+            docstring      TEXT
+        );
+        CREATE TABLE IF NOT EXISTS refs (
+            symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+            file_path TEXT NOT NULL,
+            line      INTEGER NOT NULL,
+            col       INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS idents (
+            token    TEXT NOT NULL,
+            file_id  INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+            count    INTEGER NOT NULL,
+            postings BLOB NOT NULL,
+            PRIMARY KEY (token, file_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS imports (
+            file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+            alias   TEXT NOT NULL,
+            module  TEXT NOT NULL,
+            name    TEXT,
+            line    INTEGER NOT NULL,
+            target  TEXT,
+            stem    TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+        CREATE INDEX IF NOT EXISTS symbols_qualified_name ON symbols(qualified_name);
+        CREATE INDEX IF NOT EXISTS symbols_file ON symbols(file_id);
+        CREATE INDEX IF NOT EXISTS refs_symbol ON refs(symbol_id);
+        CREATE INDEX IF NOT EXISTS idents_file ON idents(file_id);
+        CREATE INDEX IF NOT EXISTS imports_file ON imports(file_id);
+        CREATE INDEX IF NOT EXISTS imports_target ON imports(target);
+        CREATE INDEX IF NOT EXISTS imports_unresolved ON imports(stem) WHERE target IS NULL;
+    """
+
+    _SYMBOL_COLUMNS = (
+        "s.id, f.path, s.name, s.type, s.line, s.col, s.end_line, s.parent, s.children, "
+        "s.parameters, s.decorators, s.bases, s.docstring IS NOT NULL"
+    )
+
+    def __init__(self, cache_dir: Path, load: bool = True):
+        """
+        Args:
+            cache_dir: Directory of the index database
+            load: Load the search index now; pass False to call
+                load_from_cache() later, e.g. from a background thread.
+                Lookups work right away either way; fuzzy_search only
+                sees the symbols loaded so far until it is done.
+        """
         self.cache_dir = cache_dir
-        self.cache_file = cache_dir / "symbol_index.json"
-
-        # Lock protecting all in-memory indexes.
-        # IndexingThread mutates them from a background thread while the
-        # main thread reads them via get_statistics / fuzzy_search.
-        self._lock = threading.Lock()
-
-        # In-memory indexes
-        self.symbols_by_name: Dict[str, List[SymbolInfo]] = {}
-        self.symbols_by_file: Dict[str, List[SymbolInfo]] = {}
-        self.symbols_by_qualified_name: Dict[str, SymbolInfo] = {}
-        
-        # Fuzzy search index (pre-computed for speed)
-        self.fuzzy_index: List[Tuple[str, SymbolInfo]] = []
-        
+        self.db_file = cache_dir / "symbol_index.db"
+
+        # Lock serializing writers and protecting the in-memory indexes.
+        # IndexingThread writes from a background thread while the main
+        # thread reads via find_symbol / fuzzy_search. Readers use their
+        # own per-thread connection, which WAL lets run next to a writer.
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._closing = False
+        self._loading = False
+        self._writer = self._connect()
+        self._init_schema()
+
+        # Hot-row LRU: ('name' | 'qname' | 'file' | 'pos' | 'tokens' | 'id' | 'rdeps', key)
+        # -> result.
+        # _generation is bumped by every write so a reader that raced with
+        # a writer does not put a stale result back into the cache.
+        self._hot: "OrderedDict[Tuple[str, object], object]" = OrderedDict()
+        self._generation = 0
+
+        # Fuzzy search slots (lowercase name, symbol id per slot) and the
+        # ranked search index over them
+        self.slots = SymbolSlots()
+        self.search_index = SymbolSearchIndex(self.slots)
+        self._search_ready = threading.Event()
+        # Files written (and clear() calls made) while rebuild_fuzzy_index
+        # reads its snapshot
+        self._rebuild_dirty: Optional[set] = None
+        self._clear_count = 0
+
+        # Directories absolute imports are resolved in (see
+        # PositionIndex.resolve_module); set by ShardedSymbolDatabase
+        self.import_roots: Tuple[str, ...] = ()
+
+        # Symbol counts per type and per file, maintained with the slots
+        self._type_counts: Counter = Counter()
+        self._file_counts: Dict[str, int] = {}
+        self._stats_listeners: List[Callable[[], None]] = []
+
         # Load from cache if exists
-        self.load_from_cache()
-    
+        if load:
+            self.load_from_cache()
+
+    # ========================================================================
+    # Connection management
+    # ========================================================================
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_file), check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Connection for queries on the calling thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """
+        Release the database: stop a running load, close every
+        connection and drop the in-memory indexes. The object must not
+        be used afterwards.
+        """
+        self._closing = True
+        if self._loading:
+            self._search_ready.wait()
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+            self._hot.clear()
+            self.slots = SymbolSlots()
+            self.search_index = SymbolSearchIndex(self.slots)
+        self._search_ready.set()
+
+    def _init_schema(self):
+        conn = self._writer
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            if version:
+                print(f"[SymbolDatabase] Index schema {version} is outdated, rebuilding")
+            conn.executescript("""
+                DROP TABLE IF EXISTS imports;
+                DROP TABLE IF EXISTS idents;
+                DROP TABLE IF EXISTS refs;
+                DROP TABLE IF EXISTS symbols;
+                DROP TABLE IF EXISTS files;
+            """)
+        conn.executescript(self._SCHEMA)
+        conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+
+    # ========================================================================
+    # Writing
+    # ========================================================================
+
+    def replace_file(self, file_path: str, symbols: List[SymbolInfo], state: Optional[FileState] = None,
+                     identifiers: Optional[List[IdentifierPostings]] = None,
+                     imports: Optional[List[ImportInfo]] = None):
+        """
+        Replace all symbols of a file in one transaction
+
+        Args:
+            file_path: File that was (re-)indexed
+            symbols: Its complete list of symbols (may be empty)
+            state: State of the file the symbols were parsed from, recorded
+                in the manifest; None for unsaved buffers
+            identifiers: Identifier postings of the file (see
+                IdentifierIndex.extract_identifiers); None leaves the file
+                out of the reference index
+            imports: Imports of the file with their targets (see
+                DependencyGraph.resolve_dependencies)
+
+        Returns:
+            [file_path] if the file was not indexed before, else []
+        """
+        return self.replace_files([(file_path, symbols, state, identifiers, imports)])
+
+    def replace_files(self, entries: List[Tuple[str, List[SymbolInfo], Optional[FileState],
+                                                Optional[List[IdentifierPostings]],
+                                                Optional[List[ImportInfo]]]]):
+        """
+        Replace the symbols of several files in one transaction
+        (used to merge batches from the parallel indexer)
+
+        Args:
+            entries: List of (file path, symbols, state, identifiers,
+                imports) as for replace_file
+
+        Returns:
+            Paths of the files that were not indexed before; unresolved
+            imports of other files that load them are bound to them
+        """
+        added = []
+        with self._lock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for file_path, symbols, state, identifiers, imports in entries:
+                    if not self._delete_file_rows(conn, file_path):
+                        added.append(file_path)
+                    file_id = conn.execute(
+                        "INSERT INTO files(path, size, mtime_ns, content_hash, indexer_version) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (file_path, *(state or (None, None, None, None)))
+                    ).lastrowid
+                    self._insert_symbols(conn, file_id, file_path, symbols)
+                    if identifiers:
+                        conn.executemany(
+                            "INSERT INTO idents(token, file_id, count, postings) VALUES (?, ?, ?, ?)",
+                            [(token, file_id, count, postings) for token, count, postings in identifiers]
+                        )
+                    if imports:
+                        conn.executemany(
+                            "INSERT INTO imports(file_id, alias, module, name, line, target, stem) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [(file_id, *imported, import_stem(file_path, imported)) for imported in imports]
+                        )
+                        for imported in imports:
+                            self._hot.pop(('rdeps', imported.target), None)
+                self._bind_imports(conn, added)
+                conn.execute("COMMIT")
+            except Exception:
+                self._rollback(conn)
+                raise
+        self._notify_stats()
+        return added
+
     def add_symbols(self, symbols: List[SymbolInfo]):
         """
         Add symbols to database
-        
+
         Args:
             symbols: List of SymbolInfo objects to add
         """
+        by_file: Dict[str, List[SymbolInfo]] = {}
+        for symbol in symbols:
+            by_file.setdefault(symbol.file_path, []).append(symbol)
+
+        with self._lock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for file_path, file_symbols in by_file.items():
+                    conn.execute("INSERT OR IGNORE INTO files(path) VALUES (?)", (file_path,))
+                    file_id = conn.execute("SELECT id FROM files WHERE path = ?", (file_path,)).fetchone()[0]
+                    self._insert_symbols(conn, file_id, file_path, file_symbols)
+                    self._hot.pop(('file', file_path), None)
+                conn.execute("COMMIT")
+            except Exception:
+                self._rollback(conn)
+                raise
+        self._notify_stats()
+
+    def update_file_state(self, file_path: str, state: FileState):
+        """
+        Record a new manifest state for a file whose symbols are unchanged
+
+        Args:
+            file_path: Indexed file
+            state: Its current state on disk
+        """
+        with self._lock:
+            self._writer.execute(
+                "UPDATE files SET size = ?, mtime_ns = ?, content_hash = ?, indexer_version = ? "
+                "WHERE path = ?",
+                (*state, file_path)
+            )
+
+    def import_files(self, entries: list) -> int:
+        """
+        Add files that are not indexed yet, leaving indexed ones alone
+        (used to seed a new shard from an older index while the indexer
+        may already be writing fresh entries)
+
+        Args:
+            entries: List of (file path, symbols, state, identifiers,
+                imports) as for replace_files
+
+        Returns:
+            Number of files added
+        """
         with self._lock:
-            for symbol in symbols:
-                # Index by name
-                if symbol.name not in self.symbols_by_name:
-                    self.symbols_by_name[symbol.name] = []
-                self.symbols_by_name[symbol.name].append(symbol)
-                
-                # Index by file
-                if symbol.file_path not in self.symbols_by_file:
-                    self.symbols_by_file[symbol.file_path] = []
-                self.symbols_by_file[symbol.file_path].append(symbol)
-                
-                # Index by qualified name (unique)
-                self.symbols_by_qualified_name[symbol.qualified_name] = symbol
-                
-                # Add to fuzzy index
-                self.fuzzy_index.append((symbol.name.lower(), symbol))
-    
+            known = set(self.get_indexed_files())
+            entries = [entry for entry in entries if entry[0] not in known]
+            if entries:
+                self.replace_files(entries)
+        return len(entries)
+
     def remove_file(self, file_path: str):
         """
-        Remove all symbols from a file (for re-indexing)
-        
+        Remove all symbols from a file (for re-indexing). If the file is
+        gone from disk, imports loading it become unresolved.
+
         Args:
             file_path: Path to file to remove symbols from
         """
         with self._lock:
-            if file_path not in self.symbols_by_file:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete_file_rows(conn, file_path)
+                if not os.path.exists(file_path):
+                    self._unbind_imports(conn, file_path)
+                conn.execute("COMMIT")
+            except Exception:
+                self._rollback(conn)
+                raise
+        self._notify_stats()
+
+    def bind_imports(self, file_paths: List[str]):
+        """
+        Resolve the unresolved imports that load newly indexed files
+        (for files indexed into another database, see ShardedSymbolDatabase)
+
+        Args:
+            file_paths: Files that were added to the index
+        """
+        with self._lock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._bind_imports(conn, file_paths)
+                conn.execute("COMMIT")
+            except Exception:
+                self._rollback(conn)
+                raise
+
+    def unbind_imports(self, file_path: str):
+        """
+        Mark the imports loading a deleted file as unresolved
+
+        Args:
+            file_path: File that no longer exists
+        """
+        with self._lock:
+            self._unbind_imports(self._writer, file_path)
+
+    def _bind_imports(self, conn: sqlite3.Connection, file_paths: List[str]):
+        """Point unresolved imports at new files they load (lock held)"""
+        for file_path in file_paths:
+            stems = list(file_stems(file_path))
+            rows = conn.execute(
+                "SELECT i.rowid, f.path, i.alias, i.module, i.name, i.line FROM imports i "
+                "JOIN files f ON f.id = i.file_id "
+                f"WHERE i.target IS NULL AND i.stem IN ({', '.join('?' * len(stems))})",
+                stems
+            ).fetchall()
+            bound = []
+            for rowid, importer, *imported in rows:
+                if resolve_dependencies(importer, [ImportInfo(*imported)], roots=self.import_roots)[0].target == file_path:
+                    bound.append((file_path, rowid))
+            if bound:
+                conn.executemany("UPDATE imports SET target = ? WHERE rowid = ?", bound)
+                self._generation += 1
+                self._hot.pop(('rdeps', file_path), None)
+
+    def _unbind_imports(self, conn: sqlite3.Connection, file_path: str):
+        """Clear the target of imports loading a file (lock held)"""
+        conn.execute("UPDATE imports SET target = NULL WHERE target = ?", (file_path,))
+        self._generation += 1
+        self._hot.pop(('rdeps', file_path), None)
+
+    def _rollback(self, conn: sqlite3.Connection):
+        """Undo a failed write and resync the in-memory indexes (lock held)"""
+        conn.execute("ROLLBACK")
+        self._hot.clear()
+        self.rebuild_fuzzy_index()
+
+    def _insert_symbols(self, conn: sqlite3.Connection, file_id: int, file_path: str,
+                        symbols: List[SymbolInfo]):
+        """Insert rows for one file and update the in-memory indexes (lock held)"""
+        self._generation += 1
+        if self._rebuild_dirty is not None:
+            self._rebuild_dirty.add(file_path)
+        self._hot.pop(('pos', file_path), None)
+        self._hot.pop(('tokens', file_path), None)
+        slot_entries = []
+        for symbol in symbols:
+            cursor = conn.execute(
+                "INSERT INTO symbols(file_id, name, qualified_name, type, line, col, end_line, "
+                "parent, children, parameters, decorators, bases, docstring) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file_id, symbol.name, symbol.qualified_name, symbol.type,
+                    symbol.line, symbol.column, symbol.end_line, symbol.parent,
+                    self._encode_list(symbol.children),
+                    self._encode_list(symbol.parameters),
+                    self._encode_list(symbol.decorators),
+                    self._encode_list(symbol.bases),
+                    symbol.docstring,
+                )
+            )
+            symbol_id = cursor.lastrowid
+            if symbol.references:
+                conn.executemany(
+                    "INSERT INTO refs(symbol_id, file_path, line, col) VALUES (?, ?, ?, ?)",
+                    [(symbol_id, ref[0], ref[1], ref[2]) for ref in symbol.references]
+                )
+
+            slot_entries.append((symbol.name, symbol_id))
+            self._type_counts[symbol.type] += 1
+            self._hot.pop(('name', symbol.name), None)
+            self._hot.pop(('qname', symbol.qualified_name), None)
+
+        self._file_counts[file_path] = self._file_counts.get(file_path, 0) + len(symbols)
+        start = self.slots.add_file(file_path, slot_entries)
+        self.search_index.add(start, [name for name, _ in slot_entries])
+
+    def _delete_file_rows(self, conn: sqlite3.Connection, file_path: str) -> bool:
+        """
+        Delete a file and its symbols (lock held, inside a transaction)
+
+        Returns:
+            False if the file was not indexed
+        """
+        self._generation += 1
+        if self._rebuild_dirty is not None:
+            self._rebuild_dirty.add(file_path)
+        self._hot.pop(('file', file_path), None)
+        self._hot.pop(('pos', file_path), None)
+        self._hot.pop(('tokens', file_path), None)
+
+        row = conn.execute("SELECT id FROM files WHERE path = ?", (file_path,)).fetchone()
+        if row is None:
+            return False
+        file_id = row[0]
+
+        for symbol_id, name, qualified_name, symbol_type in conn.execute(
+                "SELECT id, name, qualified_name, type FROM symbols WHERE file_id = ?", (file_id,)):
+            self._type_counts[symbol_type] -= 1
+            self._hot.pop(('name', name), None)
+            self._hot.pop(('qname', qualified_name), None)
+            self._hot.pop(('id', symbol_id), None)
+        for (target,) in conn.execute(
+                "SELECT DISTINCT target FROM imports WHERE file_id = ? AND target IS NOT NULL", (file_id,)):
+            self._hot.pop(('rdeps', target), None)
+
+        # Cascades to symbols, refs, idents and imports
+        conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        self._file_counts.pop(file_path, None)
+        version = self.slots.version
+        self.slots.remove_file(file_path)
+        if self.slots.version != version:
+            # Compacted: slot numbers changed
+            self.search_index = SymbolSearchIndex.rebuilt(self.slots, self.search_index)
+        return True
+
+    @staticmethod
+    def _encode_list(values) -> Optional[str]:
+        return json.dumps(list(values)) if values else None
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    def _cached(self, key: Tuple[str, object]):
+        with self._lock:
+            value = self._hot.get(key)
+            if value is not None:
+                self._hot.move_to_end(key)
+            return value
+
+    def _remember(self, key: Tuple[str, object], value, generation: int):
+        with self._lock:
+            if generation != self._generation:
                 return
-            
-            for symbol in self.symbols_by_file[file_path]:
-                # Remove from name index
-                if symbol.name in self.symbols_by_name:
-                    self.symbols_by_name[symbol.name] = [
-                        s for s in self.symbols_by_name[symbol.name] if s != symbol
-                    ]
-                    # Remove empty lists
-                    if not self.symbols_by_name[symbol.name]:
-                        del self.symbols_by_name[symbol.name]
-                
-                # Remove from qualified name index
-                if symbol.qualified_name in self.symbols_by_qualified_name:
-                    del self.symbols_by_qualified_name[symbol.qualified_name]
-            
-            # Remove from file index
-            del self.symbols_by_file[file_path]
-            
-            # Rebuild fuzzy index (still inside lock)
-            self.fuzzy_index = [
-                (s.name.lower(), s)
-                for symbols in self.symbols_by_name.values()
-                for s in symbols
-            ]
-    
+            self._hot[key] = value
+            if len(self._hot) > self.MAX_CACHED_QUERIES:
+                self._hot.popitem(last=False)
+
+    def _query_symbols(self, where: str, params: Iterable) -> List[SymbolInfo]:
+        rows = self._reader().execute(
+            f"SELECT {self._SYMBOL_COLUMNS} FROM symbols s JOIN files f ON f.id = s.file_id "
+            f"WHERE {where} ORDER BY s.id",
+            tuple(params)
+        ).fetchall()
+        return [self._row_to_symbol(row) for row in rows]
+
+    def _row_to_symbol(self, row) -> SymbolInfo:
+        (symbol_id, file_path, name, symbol_type, line, col, end_line, parent,
+         children, parameters, decorators, bases, has_docstring) = row
+        symbol = SymbolInfo(
+            name=name,
+            symbol_type=symbol_type,
+            file_path=file_path,
+            line=line,
+            column=col,
+            end_line=end_line,
+            parent=parent,
+            children=json.loads(children) if children else None,
+            parameters=json.loads(parameters) if parameters else None,
+            decorators=json.loads(decorators) if decorators else None,
+            bases=json.loads(bases) if bases else None,
+        )
+        if has_docstring:
+            # Docstrings are the bulk of a row; fetch only when shown
+            symbol.defer_docstring(partial(self.get_docstring, symbol_id))
+        return symbol
+
     def find_symbol(self, name: str) -> List[SymbolInfo]:
         """
         Find symbols by exact name
-        
+
         Args:
             name: Symbol name to find
-            
+
         Returns:
             List of matching SymbolInfo objects
         """
-        return self.symbols_by_name.get(name, [])
-    
+        key = ('name', name)
+        symbols = self._cached(key)
+        if symbols is None:
+            generation = self._generation
+            symbols = self._query_symbols("s.name = ?", (name,))
+            self._remember(key, symbols, generation)
+        return list(symbols)
+
     def find_by_qualified_name(self, qualified_name: str) -> Optional[SymbolInfo]:
         """
         Find symbol by fully qualified name
-        
+
         Args:
             qualified_name: Qualified name (e.g., "MyClass.my_method")
-            
+
         Returns:
             SymbolInfo or None
         """
-        return self.symbols_by_qualified_name.get(qualified_name)
-    
+        key = ('qname', qualified_name)
+        symbols = self._cached(key)
+        if symbols is None:
+            generation = self._generation
+            symbols = self._query_symbols("s.qualified_name = ?", (qualified_name,))
+            self._remember(key, symbols, generation)
+        # Later definitions shadow earlier ones, as the old dict index did
+        return symbols[-1] if symbols else None
+
     def get_file_symbols(self, file_path: str) -> List[SymbolInfo]:
         """
         Get all symbols in a file
-        
+
         Args:
             file_path: Path to file
-            
+
         Returns:
             List of SymbolInfo objects in that file
         """
-        return self.symbols_by_file.get(file_path, [])
-    
-    def fuzzy_search(self, pattern: str, limit: int = 50) -> List[SymbolInfo]:
+        key = ('file', file_path)
+        symbols = self._cached(key)
+        if symbols is None:
+            generation = self._generation
+            symbols = self._query_symbols("f.path = ?", (file_path,))
+            self._remember(key, symbols, generation)
+        return list(symbols)
+
+    def get_file_imports(self, file_path: str) -> List[ImportInfo]:
+        """
+        Get the imports of a file
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            List of ImportInfo in line order
+        """
+        rows = self._reader().execute(
+            "SELECT i.alias, i.module, i.name, i.line, i.target FROM imports i JOIN files f ON f.id = i.file_id "
+            "WHERE f.path = ? ORDER BY i.rowid",
+            (file_path,)
+        )
+        return [ImportInfo(*row) for row in rows]
+
+    def get_dependencies(self, file_path: str) -> List[str]:
+        """
+        Get the files a file imports
+
+        Args:
+            file_path: Importing file
+
+        Returns:
+            Sorted paths of the resolved import targets
+        """
+        rows = self._reader().execute(
+            "SELECT DISTINCT i.target FROM imports i JOIN files f ON f.id = i.file_id "
+            "WHERE f.path = ? AND i.target IS NOT NULL ORDER BY i.target",
+            (file_path,)
+        )
+        return [row[0] for row in rows]
+
+    def get_dependents(self, file_path: str) -> List[str]:
+        """
+        Get the files importing a file (its direct reverse dependencies)
+
+        Args:
+            file_path: Imported file
+
+        Returns:
+            Sorted paths of the importing files
+        """
+        key = ('rdeps', file_path)
+        dependents = self._cached(key)
+        if dependents is None:
+            generation = self._generation
+            dependents = tuple(row[0] for row in self._reader().execute(
+                "SELECT DISTINCT f.path FROM imports i JOIN files f ON f.id = i.file_id "
+                "WHERE i.target = ? ORDER BY f.path",
+                (file_path,)
+            ))
+            self._remember(key, dependents, generation)
+        return list(dependents)
+
+    def get_position_index(self, file_path: str) -> PositionIndex:
+        """
+        Get the scope and import index of a file (for resolving a name at
+        a position without reading the file)
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            PositionIndex (empty if the file is not indexed)
+        """
+        key = ('pos', file_path)
+        index = self._cached(key)
+        if index is None:
+            generation = self._generation
+            index = PositionIndex(self.get_file_symbols(file_path), self.get_file_imports(file_path))
+            self._remember(key, index, generation)
+        return index
+
+    def get_indexed_files(self) -> List[str]:
+        """
+        Get the paths of all indexed files
+
+        Returns:
+            List of file paths
+        """
+        return [row[0] for row in self._reader().execute("SELECT path FROM files ORDER BY id")]
+
+    def get_manifest(self) -> Dict[str, FileState]:
+        """
+        Get the recorded state of every indexed file
+
+        Returns:
+            Dictionary of file path -> FileState (files indexed from an
+            unsaved buffer have no state and are left out)
+        """
+        rows = self._reader().execute(
+            "SELECT path, size, mtime_ns, content_hash, indexer_version FROM files "
+            "WHERE content_hash IS NOT NULL"
+        )
+        return {row[0]: FileState(*row[1:]) for row in rows}
+
+    def get_docstring(self, symbol_id: int) -> Optional[str]:
+        """
+        Get the docstring of a symbol
+
+        Args:
+            symbol_id: Database id of the symbol
+
+        Returns:
+            Docstring, or None if the symbol has none or no longer exists
+        """
+        row = self._reader().execute(
+            "SELECT docstring FROM symbols WHERE id = ?", (symbol_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def find_identifier(self, token: str, files: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Look up the occurrences of an identifier
+
+        Args:
+            token: Identifier (exact, case-sensitive)
+            files: Only these files (default: all indexed files)
+
+        Returns:
+            Dictionary of file path -> [(line, column)] in file order
+        """
+        rows = self._reader().execute(
+            "SELECT f.path, i.postings FROM idents i JOIN files f ON f.id = i.file_id "
+            "WHERE i.token = ? ORDER BY f.id",
+            (token,)
+        )
+        wanted = set(files) if files is not None else None
+        return {
+            path: decode_postings(postings)
+            for path, postings in rows
+            if wanted is None or path in wanted
+        }
+
+    def count_identifier(self, token: str) -> int:
+        """
+        Count the occurrences of an identifier in all indexed files
+
+        Args:
+            token: Identifier (exact, case-sensitive)
+
+        Returns:
+            Number of occurrences
+        """
+        return self._reader().execute(
+            "SELECT COALESCE(SUM(count), 0) FROM idents WHERE token = ?", (token,)
+        ).fetchone()[0]
+
+    def get_token_index(self, file_path: str) -> PrefixIndex:
+        """
+        Get the identifiers of a file with their occurrence counts,
+        searchable by prefix (for completion)
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            PrefixIndex (empty if the file is not indexed)
+        """
+        key = ('tokens', file_path)
+        index = self._cached(key)
+        if index is None:
+            generation = self._generation
+            index = PrefixIndex(self._reader().execute(
+                "SELECT i.token, i.count FROM idents i JOIN files f ON f.id = i.file_id WHERE f.path = ?",
+                (file_path,)
+            ))
+            self._remember(key, index, generation)
+        return index
+
+    def complete_names(self, prefix: str, limit: int = 50,
+                       deadline: Optional[float] = None) -> List[Tuple[str, str, int]]:
+        """
+        Find defined names starting with a prefix (for completion)
+
+        The prefix is matched as typed and with its first letter's case
+        swapped, so 'sym' also finds 'SymbolInfo'; both are range scans
+        of the name index.
+
+        Args:
+            prefix: Typed prefix (not empty)
+            limit: Maximum number of names per case variant
+            deadline: time.perf_counter() value after which the query is
+                interrupted and the names found so far are returned
+
+        Returns:
+            List of (name, symbol type, number of definitions) in name order
+        """
+        variants = [prefix]
+        if prefix[0].swapcase() != prefix[0]:
+            variants.append(prefix[0].swapcase() + prefix[1:])
+
+        conn = self._reader()
+        if deadline is not None:
+            conn.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+        names = []
+        try:
+            for variant in variants:
+                names.extend(conn.execute(
+                    "SELECT name, MIN(type), COUNT(*) FROM symbols WHERE name >= ? AND name < ? "
+                    "GROUP BY name LIMIT ?",
+                    (variant, variant + '\U0010ffff', limit)
+                ).fetchall())
+        except sqlite3.OperationalError as e:
+            if 'interrupt' not in str(e):
+                raise
+        finally:
+            if deadline is not None:
+                conn.set_progress_handler(None, 0)
+        return names
+
+    def get_symbol_references(self, symbol_id: int) -> List[Reference]:
+        """
+        Get stored references of a symbol
+
+        Args:
+            symbol_id: Database id of the symbol
+
+        Returns:
+            List of Reference objects (context is left empty)
+        """
+        rows = self._reader().execute(
+            "SELECT file_path, line, col FROM refs WHERE symbol_id = ?", (symbol_id,)
+        ).fetchall()
+        return [Reference(file_path, line, col, '') for file_path, line, col in rows]
+
+    def _symbols_by_id(self, symbol_ids: List[int]) -> List[SymbolInfo]:
+        """Resolve symbol ids in order, through the hot-row cache"""
+        result = self._resolve_ids(symbol_ids)
+        return [result[i] for i in symbol_ids if i in result]
+
+    def _resolve_ids(self, symbol_ids: List[int]) -> Dict[int, SymbolInfo]:
+        """Map symbol ids to symbols, through the hot-row cache"""
+        result = {}
+        missing = []
+        for symbol_id in symbol_ids:
+            symbol = self._cached(('id', symbol_id))
+            if symbol is None:
+                missing.append(symbol_id)
+            else:
+                result[symbol_id] = symbol
+
+        if missing:
+            generation = self._generation
+            placeholders = ','.join('?' * len(missing))
+            rows = self._reader().execute(
+                f"SELECT {self._SYMBOL_COLUMNS} FROM symbols s JOIN files f ON f.id = s.file_id "
+                f"WHERE s.id IN ({placeholders})",
+                missing
+            ).fetchall()
+            for row in rows:
+                symbol = self._row_to_symbol(row)
+                result[row[0]] = symbol
+                self._remember(('id', row[0]), symbol, generation)
+
+        return result
+
+    def fuzzy_search(self, pattern: str, limit: int = 50, timeout: float = 0.0) -> List[SymbolInfo]:
         """
         Fuzzy search symbols
-        Uses same algorithm as QuickOpen
-        
+        Ranks exact, prefix, acronym, substring and subsequence matches
+
         Args:
             pattern: Search pattern
             limit: Maximum results to return
-            
+            timeout: Seconds to wait for a loading search index; by
+                default the symbols loaded so far are searched right away
+                (is_ready() tells whether the results are complete)
+
         Returns:
             List of matching SymbolInfo objects, sorted by relevance
         """
-        if not pattern:
-            return []
-        
-        pattern_lower = pattern.lower()
-        scored_matches = []
-        
-        snapshot = list(self.fuzzy_index)  # snapshot avoids holding lock during scoring
-        for name_lower, symbol in snapshot:
-            score = self._fuzzy_score(pattern_lower, name_lower)
-            if score > 0:
-                scored_matches.append((score, symbol))
-        
-        # Sort by score (highest first)
-        scored_matches.sort(reverse=True, key=lambda x: x[0])
-        
-        return [symbol for score, symbol in scored_matches[:limit]]
-    
-    def _fuzzy_score(self, pattern: str, text: str) -> int:
-        """
-        Fuzzy matching score (same as QuickOpen)
-        
+        return [symbol for score, symbol in self.fuzzy_search_scored(pattern, limit, timeout)]
+
+    def fuzzy_search_scored(self, pattern: str, limit: int = 50,
+                            timeout: float = 0.0) -> List[Tuple[int, SymbolInfo]]:
+        """
+        Fuzzy search symbols, with their scores (to merge results of
+        several databases)
+
         Args:
-            pattern: Search pattern (lowercase)
-            text: Text to match against (lowercase)
-            
+            pattern: Search pattern
+            limit: Maximum results to return
+            timeout: See fuzzy_search
+
         Returns:
-            Score (higher = better match), 0 if no match
-        """
-        # Exact substring match gets high score
-        if pattern in text:
-            return 1000 + (100 - text.index(pattern))
-        
-        # Character-by-character fuzzy match
-        score = 0
-        pattern_idx = 0
-        last_match_idx = -1
-        
-        for i, char in enumerate(text):
-            if pattern_idx < len(pattern) and char == pattern[pattern_idx]:
-                score += 10
-                # Bonus for consecutive characters
-                if i == last_match_idx + 1:
-                    score += 5
-                # Bonus for matching at word boundaries
-                if i == 0 or text[i-1] in '._':
-                    score += 3
-                last_match_idx = i
-                pattern_idx += 1
-        
-        # Only return score if all pattern characters matched
-        return score if pattern_idx == len(pattern) else 0
-    
+            List of (score, SymbolInfo), best first
+        """
+        if not pattern:
+            return []
+
+        if timeout > 0:
+            self._search_ready.wait(timeout)
+
+        # No lock: the search index is append-only or swapped as a whole
+        matches = self.search_index.search(pattern, limit)
+        symbols = self._resolve_ids([symbol_id for score, symbol_id in matches])
+        # Symbols deleted since the search are dropped
+        return [(score, symbols[symbol_id]) for score, symbol_id in matches if symbol_id in symbols]
+
     def get_statistics(self) -> Dict:
         """
-        Get index statistics
-        
+        Get index statistics (from the maintained counters, no query)
+
         Returns:
-            Dictionary with statistics
+            Dictionary with statistics; 'types' maps every symbol type to
+            its count
         """
-        all_symbols = self._all_symbols()
+        with self._lock:
+            counts = {kind: count for kind, count in self._type_counts.items() if count}
+            files_indexed = len(self._file_counts)
         return {
-            'total_symbols': len(all_symbols),
-            'files_indexed': len(self.symbols_by_file),
-            'classes': sum(1 for s in all_symbols if s.type == 'class'),
-            'functions': sum(1 for s in all_symbols if s.type == 'function'),
-            'methods': sum(1 for s in all_symbols if s.type == 'method'),
+            'total_symbols': sum(counts.values()),
+            'files_indexed': files_indexed,
+            'classes': counts.get('class', 0),
+            'functions': counts.get('function', 0),
+            'methods': counts.get('method', 0),
+            'types': counts,
+            'memory_bytes': self.memory_usage(),
         }
-    
+
+    def get_file_symbol_count(self, file_path: str) -> int:
+        """Number of symbols indexed for a file (0 if not indexed)"""
+        with self._lock:
+            return self._file_counts.get(file_path, 0)
+
+    def add_stats_listener(self, callback: Callable[[], None]):
+        """
+        Call back after every change of the statistics
+
+        Args:
+            callback: Called without arguments on the writing thread
+        """
+        self._stats_listeners.append(callback)
+
+    def _notify_stats(self):
+        for callback in self._stats_listeners:
+            callback()
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held in memory by the search slots and index"""
+        return self.slots.memory_usage() + self.search_index.memory_usage()
+
     def clear(self):
         """Clear all indexes"""
         with self._lock:
-            self.symbols_by_name.clear()
-            self.symbols_by_file.clear()
-            self.symbols_by_qualified_name.clear()
-            self.fuzzy_index.clear()
-    
+            self._writer.executescript("""
+                BEGIN IMMEDIATE;
+                DELETE FROM imports;
+                DELETE FROM idents;
+                DELETE FROM refs;
+                DELETE FROM symbols;
+                DELETE FROM files;
+                COMMIT;
+            """)
+            self._generation += 1
+            self._clear_count += 1
+            self._hot.clear()
+            self.slots.clear()
+            self.search_index = SymbolSearchIndex(self.slots)
+            self._type_counts = Counter()
+            self._file_counts = {}
+        self._notify_stats()
+
+    # ========================================================================
+    # Persistence
+    # ========================================================================
+
     def save_to_cache(self):
-        """Persist index to disk"""
+        """
+        Flush the index to disk
+
+        Every change is already committed per file; this only folds the
+        WAL back into the main database file.
+        """
         try:
-            snapshot = self._all_symbols()  # thread-safe snapshot
-            data = {
-                'symbols': [s.to_dict() for s in snapshot],
-                'version': '1.0',
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            
-            print(f"[SymbolDatabase] Saved {len(data['symbols'])} symbols to cache")
-        
+            with self._lock:
+                self._writer.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            print(f"[SymbolDatabase] Index checkpointed to {self.db_file.name}")
+
         except Exception as e:
             print(f"[SymbolDatabase] Error saving cache: {e}")
-    
+
+    def is_ready(self) -> bool:
+        """True once the search index is loaded"""
+        return self._search_ready.is_set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the search index is loaded
+
+        Args:
+            timeout: Seconds to wait at most (None = no limit)
+
+        Returns:
+            True if the index is ready
+        """
+        return self._search_ready.wait(timeout)
+
     def load_from_cache(self):
-        """Load index from disk"""
-        if not self.cache_file.exists():
+        """
+        Load the fuzzy search index from disk
+
+        Safe to run on a background thread: queries and writes may run
+        meanwhile (see is_ready for whether fuzzy_search is complete).
+        """
+        if self._closing:
             return
-        
+        self._loading = True
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            symbols = [SymbolInfo.from_dict(s) for s in data['symbols']]
-            self.add_symbols(symbols)
-            
-            print(f"[SymbolDatabase] Loaded {len(symbols)} symbols from cache")
-        
+            self.rebuild_fuzzy_index()
+            print(f"[SymbolDatabase] Loaded {len(self.slots)} symbols from {self.db_file}")
+
         except Exception as e:
             print(f"[SymbolDatabase] Error loading cache: {e}")
-    
+
+        finally:
+            self._loading = False
+            self._search_ready.set()
+
     def rebuild_fuzzy_index(self):
-        """Rebuild fuzzy search index (acquires lock)."""
-        with self._lock:
-            self.fuzzy_index = [
-                (symbol.name.lower(), symbol)
-                for symbols in self.symbols_by_name.values()
-                for symbol in symbols
-            ]
-    
-    def _all_symbols(self) -> List[SymbolInfo]:
-        """Get all symbols (flat list) — takes a snapshot under the lock."""
+        """
+        Rebuild the search slots and index from the database
+
+        The rows are read from a snapshot without holding the lock, so
+        writers are not blocked; files written in the meantime are
+        re-read before the new index is swapped in.
+        """
         with self._lock:
-            return [s for symbols in self.symbols_by_name.values() for s in symbols]
\ No newline at end of file
+            nested = self._rebuild_dirty is not None
+            if not nested:
+                self._rebuild_dirty = set()
+            clear_count = self._clear_count
+        try:
+            slots = SymbolSlots()
+            search_index = SymbolSearchIndex(slots)
+            # File -> symbol count per type
+            file_types: Dict[str, Counter] = {
+                path: Counter() for (path,) in self._reader().execute("SELECT path FROM files")
+            }
+            rows = self._reader().execute(
+                "SELECT f.path, s.name, s.id, s.type FROM symbols s JOIN files f ON f.id = s.file_id "
+                "ORDER BY s.file_id, s.id"
+            )
+            current_path, entries = None, []
+            for path, name, symbol_id, symbol_type in rows:
+                if path != current_path:
+                    if self._closing:
+                        return
+                    search_index.add(slots.add_file(current_path, entries), [n for n, _ in entries], merge=False)
+                    current_path, entries = path, []
+                    types = file_types.setdefault(path, Counter())
+                entries.append((name, symbol_id))
+                types[symbol_type] += 1
+            search_index.add(slots.add_file(current_path, entries), [n for n, _ in entries], merge=False)
+
+            with self._lock:
+                if self._clear_count != clear_count:
+                    # Cleared meanwhile: the snapshot is void
+                    slots = SymbolSlots()
+                    search_index = SymbolSearchIndex(slots)
+                    file_types = {}
+                for path in self._rebuild_dirty or ():
+                    version = slots.version
+                    slots.remove_file(path)
+                    if slots.version != version:
+                        search_index = SymbolSearchIndex.rebuilt(slots, search_index)
+                    rows = self._writer.execute(
+                        "SELECT s.name, s.id, s.type FROM symbols s JOIN files f ON f.id = s.file_id "
+                        "WHERE f.path = ? ORDER BY s.id", (path,)
+                    ).fetchall()
+                    entries = [(name, symbol_id) for name, symbol_id, _ in rows]
+                    search_index.add(slots.add_file(path, entries), [n for n, _ in entries], merge=False)
+                    if self._writer.execute("SELECT 1 FROM files WHERE path = ?", (path,)).fetchone():
+                        file_types[path] = Counter(symbol_type for _, _, symbol_type in rows)
+                    else:
+                        file_types.pop(path, None)
+                search_index.merge()
+                self.slots = slots
+                self.search_index = search_index
+                self._type_counts = Counter()
+                for types in file_types.values():
+                    self._type_counts.update(types)
+                self._file_counts = {path: sum(types.values()) for path, types in file_types.items()}
+        finally:
+            if not nested:
+                with self._lock:
+                    self._rebuild_dirty = None
+        self._notify_stats()
@@ -7,10 +7,12 @@ Uses AST for Python, OutlineParser for other languages
 
 import ast
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from ide.core.ParseCache import get_parse_cache, ParseResult
 from ide.core.OutlineParser import OutlineParser
 
-from .SymbolInfo import SymbolInfo
+from .SymbolInfo import SymbolInfo, ImportInfo
+from .DependencyGraph import extract_path_imports
 
 
 class SymbolIndexer:
@@ -19,123 +21,177 @@ class SymbolIndexer:
     Uses AST for detailed Python parsing, OutlineParser for other languages
     """
     
+    # Bump whenever the extracted symbols change, so the manifest
+    # re-indexes files that were parsed by an older indexer
+    VERSION = 3
+    
+    # Extensions that are indexed: every OutlineParser language
+    EXTENSIONS = frozenset(OutlineParser.PARSERS)
+    
     def __init__(self):
-        self.parsers = {
-            '.py' : self.parse_python_ast,
-            '.php': self.parse_with_outline_parser,
-            '.go': self.parse_with_outline_parser,
-        }
+        # Extension -> parse method; Python gets the detailed AST parser
+        self.parsers = {ext: self.parse_with_outline_parser for ext in self.EXTENSIONS}
+        self.parsers['.py'] = self.parse_python_ast
     
-    def index_file(self, file_path: str) -> List[SymbolInfo]:
+    def index_file(self, file_path: str, content: Optional[str] = None) -> List[SymbolInfo]:
         """
         Parse a file and return all symbols
         
         Args:
             file_path: Path to file to index
+            content: Current text of the file; read from disk if None
             
         Returns:
             List of SymbolInfo objects
         """
-        path = Path(file_path)
-        ext = path.suffix.lower()
+        return self.parse_file(file_path, content)[0]
+    
+    def parse_file(self, file_path: str, content: Optional[str] = None) -> Tuple[List[SymbolInfo], List[ImportInfo]]:
+        """
+        Parse a file and return its symbols and imports
+        
+        Args:
+            file_path: Path to file to index
+            content: Current text of the file; read from disk if None
+            
+        Returns:
+            Tuple of (SymbolInfo list, ImportInfo list); import targets
+            are not resolved (see DependencyGraph.resolve_dependencies)
+        """
+        parse = self.parsers.get(Path(file_path).suffix.lower())
+        if parse is None:
+            return [], []
         
         try:
-            if ext == '.py':
-                return self.parse_python_ast(file_path)
-            else:
-                return self.parse_with_outline_parser(file_path)
+            return parse(file_path, content)
         except Exception as e:
             print(f"[SymbolIndexer] Error indexing {file_path}: {e}")
-            return []
+            return [], []
     
-    def parse_python_ast(self, file_path: str) -> List[SymbolInfo]:
+    def _parse_result(self, file_path: str, content: Optional[str]) -> ParseResult:
+        """
+        Get the shared parse result for a file.
+        
+        A file that is open in an editor has usually been parsed already
+        (outline, folding), so this is a cache hit. Files that are only
+        indexed are not stored, to keep open buffers in the cache.
+        """
+        if content is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        return get_parse_cache().lookup(file_path, content, store=False)
+    
+    def parse_python_ast(self, file_path: str, content: Optional[str] = None) -> Tuple[List[SymbolInfo], List[ImportInfo]]:
         """
         Parse Python using AST for maximum detail
         
         Extracts:
-        - Classes (with base classes)
-        - Functions (with parameters, decorators)
-        - Methods (with self/cls detection)
-        - Module-level variables
+        - Classes (with base classes), also nested ones
+        - Functions (with parameters, decorators), also nested ones
+        - Methods (functions defined directly in a class body)
+        - Imports, with the name each one binds
+        
+        Every symbol gets its end line, and nested symbols the qualified
+        name of their enclosing class or function as parent, so scopes
+        can be rebuilt from the index (see PositionIndex).
         """
         symbols = []
+        imports = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            result = self._parse_result(file_path, content)
+            tree = result.tree
+            if tree is None:
+                raise result.syntax_error
             
-            tree = ast.parse(content)
-            
-            # Track class context for methods
-            current_class = None
+            self._collect_scope(tree, None, False, file_path, symbols)
             
             for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    # Class definition
-                    symbols.append(SymbolInfo(
-                        name=node.name,
-                        symbol_type='class',
-                        file_path=file_path,
-                        line=node.lineno,
-                        column=node.col_offset,
-                        bases=[self._get_name(b) for b in node.bases],
-                        decorators=[self._get_name(d) for d in node.decorator_list],
-                        docstring=ast.get_docstring(node)
-                    ))
-                    
-                    # Process methods inside class
-                    for item in node.body:
-                        if isinstance(item, ast.FunctionDef):
-                            symbols.append(SymbolInfo(
-                                name=item.name,
-                                symbol_type='method',
-                                file_path=file_path,
-                                line=item.lineno,
-                                column=item.col_offset,
-                                parent=node.name,
-                                parameters=self._get_parameters(item.args),
-                                decorators=[self._get_name(d) for d in item.decorator_list],
-                                docstring=ast.get_docstring(item)
-                            ))
-                
-                elif isinstance(node, ast.FunctionDef):
-                    # Check if this is a top-level function (not inside a class)
-                    if not self._is_inside_class(node, tree):
-                        symbols.append(SymbolInfo(
-                            name=node.name,
-                            symbol_type='function',
-                            file_path=file_path,
-                            line=node.lineno,
-                            column=node.col_offset,
-                            parameters=self._get_parameters(node.args),
-                            decorators=[self._get_name(d) for d in node.decorator_list],
-                            docstring=ast.get_docstring(node)
-                        ))
+                if isinstance(node, ast.Import):
+                    for alias in node.names:
+                        imports.append(ImportInfo(
+                            alias.asname or alias.name.split('.')[0], alias.name, None, node.lineno))
+                elif isinstance(node, ast.ImportFrom):
+                    module = '.' * node.level + (node.module or '')
+                    for alias in node.names:
+                        imports.append(ImportInfo(
+                            alias.asname or alias.name, module, alias.name, node.lineno))
             
-            return sorted(symbols, key=lambda s: s.line)
+            return sorted(symbols, key=lambda s: s.line), sorted(imports, key=lambda i: i.line)
         
         except SyntaxError as e:
             print(f"[SymbolIndexer] Syntax error in {file_path}: {e}")
-            return []
+            return [], []
         except Exception as e:
             print(f"[SymbolIndexer] Error parsing Python {file_path}: {e}")
-            return []
+            return [], []
     
-    def parse_with_outline_parser(self, file_path: str) -> List[SymbolInfo]:
+    def _collect_scope(self, node, parent: Optional[str], in_class: bool, file_path: str,
+                       symbols: List[SymbolInfo]):
+        """
+        Add the classes and functions defined in a scope, recursively
+        
+        Args:
+            node: Module, class or function node
+            parent: Qualified name of the scope, None at module level
+            in_class: The scope is a class body (functions are methods)
+            file_path: File being parsed
+            symbols: Output list
+        """
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                symbol = SymbolInfo(
+                    name=child.name,
+                    symbol_type='class',
+                    file_path=file_path,
+                    line=child.lineno,
+                    column=child.col_offset,
+                    end_line=child.end_lineno,
+                    parent=parent,
+                    bases=[self._get_name(b) for b in child.bases],
+                    decorators=[self._get_name(d) for d in child.decorator_list],
+                    docstring=ast.get_docstring(child)
+                )
+                symbols.append(symbol)
+                self._collect_scope(child, symbol.qualified_name, True, file_path, symbols)
+            
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                symbol = SymbolInfo(
+                    name=child.name,
+                    symbol_type='method' if in_class else 'function',
+                    file_path=file_path,
+                    line=child.lineno,
+                    column=child.col_offset,
+                    end_line=child.end_lineno,
+                    parent=parent,
+                    parameters=self._get_parameters(child.args),
+                    decorators=[self._get_name(d) for d in child.decorator_list],
+                    docstring=ast.get_docstring(child)
+                )
+                symbols.append(symbol)
+                self._collect_scope(child, symbol.qualified_name, False, file_path, symbols)
+            
+            elif not isinstance(child, ast.expr):
+                # Definitions inside if / try / with / for blocks belong
+                # to the enclosing scope
+                self._collect_scope(child, parent, in_class, file_path, symbols)
+    
+    def parse_with_outline_parser(self, file_path: str, content: Optional[str] = None) -> Tuple[List[SymbolInfo], List[ImportInfo]]:
         """
         Use existing OutlineParser for non-Python files
         
         Args:
             file_path: Path to file
+            content: Current text of the file; read from disk if None
             
         Returns:
-            List of SymbolInfo objects
+            Tuple of (SymbolInfo list, path imports)
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            outline_symbols = OutlineParser.parse(file_path, content)
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            outline_symbols = self._parse_result(file_path, content).outline
             
             # Convert OutlineParser symbols to SymbolInfo
             symbols = []
@@ -163,11 +219,11 @@ class SymbolIndexer:
                     )
                     symbols.append(child_info)
             
-            return symbols
+            return symbols, extract_path_imports(file_path, content)
         
         except Exception as e:
             print(f"[SymbolIndexer] Error with OutlineParser for {file_path}: {e}")
-            return []
+            return [], []
     
     # Helper methods
     
@@ -198,15 +254,3 @@ class SymbolIndexer:
             params.append(f"**{args.kwarg.arg}")
         
         return params
-
-    def _is_inside_class(self, func_node, tree) -> bool:
-        """
-        Check if a function node is inside a class
-        
-        This is a simplified check - walks the tree to see if
-        function is nested inside a ClassDef
-        """
-        # For now, use a simpler approach - check if any ClassDef contains this function
-        # This is good enough for most cases
-        return False  # Will improve this in next iteration
-
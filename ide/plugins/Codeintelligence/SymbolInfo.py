@@ -4,37 +4,82 @@
 SymbolInfo - Complete information about a code symbol
 """
 
-from typing import List, Optional, Dict, Tuple
+import sys
+from typing import Callable, List, NamedTuple, Optional, Dict, Tuple
 from pathlib import Path
 
+# Shared value for every empty list attribute
+_EMPTY = ()
+
+# Docstring not loaded yet (see SymbolInfo.defer_docstring)
+_DEFERRED = object()
+
+
 class SymbolInfo:
-    """Complete information about a code symbol"""
+    """
+    Complete information about a code symbol
+
+    Compact layout: __slots__ instead of a __dict__, interned file path /
+    parent / type strings, tuples for the list attributes (one shared
+    empty tuple when there are none) and a qualified name computed on
+    access. Symbols read back from the SymbolDatabase do not carry their
+    docstring; it is fetched from the store the first time it is used.
+    """
+
+    __slots__ = (
+        'name', 'type', 'file_path', 'line', 'column', 'end_line', 'parent',
+        'children', 'parameters', 'decorators', 'bases', 'references',
+        '_docstring', '_docstring_loader',
+    )
     
     def __init__(self, name: str, symbol_type: str, file_path: str, 
                  line: int, column: int = 0, **kwargs):
-        self.name = name
-        self.type = symbol_type  # 'class', 'function', 'method', etc.
-        self.file_path = file_path
+        self.name = sys.intern(name)
+        self.type = sys.intern(symbol_type)  # 'class', 'function', 'method', etc.
+        self.file_path = sys.intern(file_path)
         self.line = line
         self.column = column
         
         # Optional attributes
-        self.parent = kwargs.get('parent')
-        self.children = kwargs.get('children', [])
-        self.parameters = kwargs.get('parameters', [])
-        self.decorators = kwargs.get('decorators', [])
-        self.docstring = kwargs.get('docstring')
-        self.bases = kwargs.get('bases', [])
-        
-        # For reference tracking
-        self.references: List[Tuple[str, int, int]] = []  # (file, line, col)
+        self.end_line: Optional[int] = kwargs.get('end_line')  # Last line of the body, if known
+        parent = kwargs.get('parent')
+        self.parent = sys.intern(parent) if parent else None
+        self.children = tuple(kwargs.get('children') or _EMPTY)
+        self.parameters = tuple(kwargs.get('parameters') or _EMPTY)
+        self.decorators = tuple(kwargs.get('decorators') or _EMPTY)
+        self.bases = tuple(kwargs.get('bases') or _EMPTY)
+        self._docstring = kwargs.get('docstring')
+        self._docstring_loader = None
         
-        # Computed properties
-        self.qualified_name = self._compute_qualified_name()
-    
-    def _compute_qualified_name(self) -> str:
+        # For reference tracking: (file, line, col)
+        self.references: Tuple[Tuple[str, int, int], ...] = _EMPTY
+
+    def defer_docstring(self, loader: Callable[[], Optional[str]]):
+        """
+        Load the docstring on first access instead of holding it
+
+        Args:
+            loader: Returns the docstring (e.g. from the symbol database)
+        """
+        self._docstring = _DEFERRED
+        self._docstring_loader = loader
+
+    @property
+    def docstring(self) -> Optional[str]:
+        if self._docstring is _DEFERRED:
+            loader, self._docstring_loader = self._docstring_loader, None
+            self._docstring = loader()
+        return self._docstring
+
+    @docstring.setter
+    def docstring(self, value: Optional[str]):
+        self._docstring = value
+        self._docstring_loader = None
+
+    @property
+    def qualified_name(self) -> str:
         """
-        Compute fully qualified name
+        Fully qualified name
         Example: 'MyClass.my_method' or 'module.function'
         """
         if self.parent:
@@ -73,13 +118,14 @@ class SymbolInfo:
             'file_path': self.file_path,
             'line': self.line,
             'column': self.column,
+            'end_line': self.end_line,
             'parent': self.parent,
-            'children': self.children,
-            'parameters': self.parameters,
-            'decorators': self.decorators,
+            'children': list(self.children),
+            'parameters': list(self.parameters),
+            'decorators': list(self.decorators),
             'docstring': self.docstring,
-            'bases': self.bases,
-            'references': self.references,
+            'bases': list(self.bases),
+            'references': [list(ref) for ref in self.references],
         }
     
     @classmethod
@@ -91,6 +137,7 @@ class SymbolInfo:
             file_path=data['file_path'],
             line=data['line'],
             column=data.get('column', 0),
+            end_line=data.get('end_line'),
             parent=data.get('parent'),
             children=data.get('children', []),
             parameters=data.get('parameters', []),
@@ -98,7 +145,7 @@ class SymbolInfo:
             docstring=data.get('docstring'),
             bases=data.get('bases', []),
         )
-        symbol.references = data.get('references', [])
+        symbol.references = tuple(tuple(ref) for ref in data.get('references', ())) or _EMPTY
         return symbol
     
     def __repr__(self):
@@ -145,3 +192,32 @@ class Reference:
             column=data['column'],
             context=data['context']
         )
+
+
+class ImportInfo(NamedTuple):
+    """
+    A name bound by an import statement, with the file it loads
+
+    import a.b        -> ImportInfo('a', 'a.b', None, line)
+    import a.b as c   -> ImportInfo('c', 'a.b', None, line)
+    from .m import x  -> ImportInfo('x', '.m', 'x', line)
+    from m import *   -> ImportInfo('*', 'm', '*', line)
+
+    Other languages record path imports (see DependencyGraph) with the
+    path as written in alias and module.
+    """
+    alias: str             # Name bound in the importing file
+    module: str            # Imported module, relative ones keep their dots
+    name: Optional[str]    # Imported attribute, None for module imports
+    line: int
+    target: Optional[str] = None   # Resolved file, None if outside the tree
+
+    @property
+    def bound_module(self) -> Optional[str]:
+        """Module the alias refers to, for module imports"""
+        if self.name is not None:
+            return None
+        if self.alias == self.module.split('.')[0]:
+            # import a.b binds a
+            return self.alias
+        return self.module
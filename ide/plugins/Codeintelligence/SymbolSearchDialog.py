@@ -81,6 +81,7 @@ class SymbolSearchDialog(QDialog):
         self.info_label = QLabel(
             f"{stats['total_symbols']:,} symbols indexed "
             f"({stats['classes']} classes, {stats['functions']} functions)"
+            + self._loading_note()
         )
         self.info_label.setStyleSheet("color: #999; font-size: 11px;")
         layout.addWidget(self.info_label)
@@ -106,7 +107,8 @@ class SymbolSearchDialog(QDialog):
             self.info_label.setText("Type to search symbols...")
             return
         
-        # Fuzzy search
+        # Fuzzy search (never waits: the symbols loaded so far while the
+        # index is loading, refreshed by the plugin once it is loaded)
         matches = self.db.fuzzy_search(text, limit=100)
         
         for symbol in matches:
@@ -130,10 +132,17 @@ class SymbolSearchDialog(QDialog):
             self.results_list.addItem(item)
         
         if matches:
-            self.info_label.setText(f"Found {len(matches):,} matches")
+            self.info_label.setText(f"Found {len(matches):,} matches" + self._loading_note())
             self.results_list.setCurrentRow(0)
         else:
-            self.info_label.setText("No matches found")
+            self.info_label.setText("No matches found" + self._loading_note())
+    
+    def refresh(self):
+        """Search again (e.g. once more symbols are loaded)"""
+        self.on_search_changed(self.search_input.text())
+    
+    def _loading_note(self) -> str:
+        return "" if self.db.is_ready() else " - index still loading…"
     
     def accept_selection(self):
         """Jump to selected symbol"""
@@ -0,0 +1,369 @@
+# ide/plugins/Codeintelligence/SymbolSearchIndex.py
+
+"""
+SymbolSearchIndex - Fast ranked symbol search over the symbol slots
+
+Symbol names are deduplicated into terms (many symbols share a name such
+as __init__ or run). Over the terms the index keeps:
+
+- a sorted-name array, searched with bisect for prefix matches
+- a sorted acronym array (camelCase / snake_case initials), so "gsap"
+  finds get_symbol_at_position and "gr" finds GutterRenderer
+- trigram postings, to find substring matches without scanning every name
+
+Matches are ranked in tiers (exact > prefix > acronym > substring > fuzzy
+subsequence) and reduced with a bounded top-k heap. Every tier stops at
+the time budget; the fuzzy fallback, the only full scan, runs only when
+no other tier found anything.
+
+New terms go to a small unsorted delta that is merged into the sorted
+arrays once it grows; removed symbols are the tombstones in SymbolSlots.
+"""
+
+import heapq
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from .SymbolSlots import sampled_size
+
+
+_WORD = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+
+def acronym(name: str) -> str:
+    """
+    Lowercase initials of the words in a name
+
+    Examples: get_symbol_at_position -> gsap, GutterRenderer -> gr,
+    HTMLParser -> hp, parse2D -> p2
+    """
+    return ''.join(word[0] for word in _WORD.findall(name)).lower()
+
+
+def fuzzy_score(pattern: str, text: str) -> int:
+    """
+    Subsequence score (same as QuickOpen)
+
+    Args:
+        pattern: Search pattern (lowercase)
+        text: Text to match against (lowercase)
+
+    Returns:
+        Score (higher = better match), 0 if no match
+    """
+    score = 0
+    pattern_idx = 0
+    last_match_idx = -1
+
+    for i, char in enumerate(text):
+        if pattern_idx < len(pattern) and char == pattern[pattern_idx]:
+            score += 10
+            # Bonus for consecutive characters
+            if i == last_match_idx + 1:
+                score += 5
+            # Bonus for matching at word boundaries
+            if i == 0 or text[i-1] in '._':
+                score += 3
+            last_match_idx = i
+            pattern_idx += 1
+
+    # Only return score if all pattern characters matched
+    return score if pattern_idx == len(pattern) else 0
+
+
+class SymbolSearchIndex:
+    """
+    Ranked prefix / acronym / substring / fuzzy search over SymbolSlots
+
+    Writers (holding the database lock) call add() after slots are
+    appended and swap in rebuilt() after the slots were compacted. Readers call
+    search() without a lock: every structure is either append-only or
+    replaced as a whole.
+    """
+
+    MERGE_THRESHOLD = 8192     # Delta terms before merging into sorted arrays
+    CANDIDATE_CAP = 2000       # Terms examined per tier
+    SHORT_PREFIX_CAP = 500     # ... for 1-2 character prefixes (most terms match)
+    DEFAULT_BUDGET = 0.004     # Seconds of scanning per query
+
+    # Tier bases, added to a per-tier tie breaker below 1000
+    EXACT = 5000
+    PREFIX = 4000
+    ACRONYM = 3000
+    SUBSTRING = 2000
+
+    def __init__(self, slots):
+        self.slots = slots
+        self._reset()
+
+    def _reset(self):
+        self.terms: List[str] = []                  # term id -> lowercase name
+        self.acronyms: List[str] = []               # term id -> acronym
+        self.term_ids: Dict[str, int] = {}          # lowercase name -> term id
+        self.term_slots: List[List[int]] = []       # term id -> slots
+        self.trigrams: Dict[str, array] = {}        # trigram -> term ids
+        self._by_name = array('i')                  # term ids sorted by name
+        self._by_acronym = array('i')               # term ids sorted by acronym
+        self._delta: List[int] = []                 # term ids not merged yet
+
+    # ========================================================================
+    # Maintenance
+    # ========================================================================
+
+    def add(self, start: int, names: List[str], merge: bool = True):
+        """
+        Index newly appended slots
+
+        Args:
+            start: First slot of the new range
+            names: Original-case names of the slots start, start + 1, ...
+            merge: Merge a full delta now; bulk loads pass False and call
+                merge() once at the end
+        """
+        for offset, name in enumerate(names):
+            lower = name.lower()
+            term = self.term_ids.get(lower)
+            if term is None:
+                term = self._new_term(lower, acronym(name))
+                self._delta.append(term)
+            self.term_slots[term].append(start + offset)
+
+        if merge and len(self._delta) >= self.MERGE_THRESHOLD:
+            self.merge()
+
+    def _new_term(self, lower: str, term_acronym: str) -> int:
+        term = len(self.terms)
+        self.terms.append(lower)
+        self.acronyms.append(term_acronym)
+        self.term_slots.append([])
+        self.term_ids[lower] = term
+        for i in range(len(lower) - 2):
+            postings = self.trigrams.get(lower[i:i + 3])
+            if postings is None:
+                self.trigrams[lower[i:i + 3]] = array('i', (term,))
+            elif postings[-1] != term:
+                postings.append(term)
+        return term
+
+    def merge(self):
+        """Fold the delta into the sorted arrays (timsort keeps this ~O(n))"""
+        terms, acronyms = self.terms, self.acronyms
+        by_name = list(self._by_name) + self._delta
+        by_name.sort(key=terms.__getitem__)
+        by_acronym = list(self._by_acronym) + self._delta
+        by_acronym.sort(key=acronyms.__getitem__)
+        self._by_name = array('i', by_name)
+        self._by_acronym = array('i', by_acronym)
+        self._delta = []
+
+    @classmethod
+    def rebuilt(cls, slots, previous: Optional['SymbolSearchIndex'] = None) -> 'SymbolSearchIndex':
+        """
+        Build a new index over all live slots (after SymbolSlots.compact
+        renumbered them). Readers keep using the old index until the
+        caller swaps the new one in.
+
+        Args:
+            slots: SymbolSlots to index
+            previous: Old index, whose acronyms are reused since the slots
+                only keep lowercase names
+
+        Returns:
+            New SymbolSearchIndex; terms without live symbols are dropped
+        """
+        old_acronyms = dict(zip(previous.terms, previous.acronyms)) if previous else {}
+        index = cls(slots)
+        for slot, lower in enumerate(slots.names):
+            if lower is None:
+                continue
+            term = index.term_ids.get(lower)
+            if term is None:
+                term = index._new_term(lower, old_acronyms.get(lower) or acronym(lower))
+                index._delta.append(term)
+            index.term_slots[term].append(slot)
+        index.merge()
+        return index
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the index (sampled)"""
+        trigram_postings = list(self.trigrams.values())
+        return (
+            sys.getsizeof(self.terms) + sampled_size(self.terms)
+            + sys.getsizeof(self.acronyms) + sampled_size(self.acronyms)
+            + sys.getsizeof(self.term_ids)
+            + sys.getsizeof(self.term_slots) + sampled_size(self.term_slots)
+            + sys.getsizeof(self.trigrams) + sampled_size(trigram_postings)
+            + sys.getsizeof(self._by_name) + sys.getsizeof(self._by_acronym)
+        )
+
+    # ========================================================================
+    # Query
+    # ========================================================================
+
+    def search(self, pattern: str, limit: int = 50,
+               budget: Optional[float] = None) -> List[Tuple[int, int]]:
+        """
+        Find the best matching symbols
+
+        Args:
+            pattern: Search text (any case)
+            limit: Maximum results
+            budget: Time budget in seconds for the substring check and
+                the fuzzy fallback scan
+
+        Returns:
+            List of (score, symbol id), best first
+        """
+        pattern = pattern.lower()
+        if not pattern:
+            return []
+
+        deadline = time.perf_counter() + (self.DEFAULT_BUDGET if budget is None else budget)
+        scores: Dict[int, int] = {}   # term id -> best score
+
+        def offer(term: int, score: int):
+            if score > scores.get(term, 0):
+                scores[term] = score
+
+        terms = self.terms
+
+        # Tiers in rank order. Every score of a tier beats every score of
+        # the next one, so once `limit` terms are found the rest is skipped.
+
+        # Exact
+        term = self.term_ids.get(pattern)
+        if term is not None:
+            offer(term, self.EXACT)
+
+        # Prefix (shorter names first); the biggest tier, so scored inline
+        # (only the exact term can already have a score, a higher one)
+        base = self.PREFIX + 999
+        for term in self._prefix_terms(self._by_name, terms, pattern, deadline):
+            if term not in scores:
+                scores[term] = base - min(len(terms[term]), 999)
+
+        # Acronym prefix (exact acronym first, then shorter names)
+        if len(scores) < limit and pattern.isalnum():
+            acronyms = self.acronyms
+            for term in self._prefix_terms(self._by_acronym, acronyms, pattern, deadline):
+                extra = 500 if len(acronyms[term]) == len(pattern) else 0
+                offer(term, self.ACRONYM + extra + 499 - min(len(terms[term]), 499))
+
+        # Substring (earlier match first), via trigram postings
+        if len(scores) < limit:
+            for term, index in self._substring_terms(pattern, deadline, (limit - len(scores)) * 20):
+                if index > 0:
+                    offer(term, self.SUBSTRING + 999 - min(index, 999))
+
+        # Fuzzy subsequence fallback, only when nothing better matched
+        if not scores:
+            self._fuzzy_scan(pattern, offer, deadline, limit - len(scores))
+
+        return self._top_symbols(scores, limit)
+
+    def _prefix_terms(self, order: array, keys: List[str], prefix: str, deadline: float):
+        """
+        Terms whose key starts with prefix: bisect + the unsorted delta,
+        up to the cap or the deadline
+        """
+        cap = self.SHORT_PREFIX_CAP if len(prefix) <= 2 else self.CANDIDATE_CAP
+        i = bisect_left(order, prefix, key=keys.__getitem__)
+        end = min(len(order), i + cap)
+        while i < end:
+            term = order[i]
+            if not keys[term].startswith(prefix):
+                break
+            yield term
+            i += 1
+            if i & 255 == 0 and time.perf_counter() > deadline:
+                return
+        for n, term in enumerate(self._delta):
+            if n & 255 == 255 and time.perf_counter() > deadline:
+                return
+            if keys[term].startswith(prefix):
+                yield term
+
+    def _substring_terms(self, pattern: str, deadline: float, wanted: int) -> List[Tuple[int, int]]:
+        """
+        (term, match index) of terms containing pattern (len >= 3)
+
+        Only the terms in the shortest posting list of the pattern's
+        trigrams are checked; that list is usually far shorter than the
+        term table. The check stops after `wanted` matches (at most the
+        cap) or at the deadline.
+        """
+        if len(pattern) < 3:
+            return []
+        shortest = None
+        for i in range(len(pattern) - 2):
+            postings = self.trigrams.get(pattern[i:i + 3])
+            if postings is None:
+                return []
+            if shortest is None or len(postings) < len(shortest):
+                shortest = postings
+
+        terms = self.terms
+        found = []
+        for n, term in enumerate(shortest):
+            if n & 1023 == 1023 and time.perf_counter() > deadline:
+                break
+            index = terms[term].find(pattern)
+            if index >= 0:
+                found.append((term, index))
+                if len(found) >= min(wanted, self.CANDIDATE_CAP):
+                    break
+        return found
+
+    def _fuzzy_scan(self, pattern: str, offer, deadline: float, wanted: int):
+        """Subsequence scan over all terms, best effort within the deadline"""
+        first = pattern[0]
+        found = 0
+        terms = self.terms
+        for term, text in enumerate(terms):
+            if term & 1023 == 0 and time.perf_counter() > deadline:
+                break
+            if first not in text:
+                continue
+            score = fuzzy_score(pattern, text)
+            if score:
+                offer(term, score)
+                found += 1
+                if found >= wanted * 20:
+                    break
+
+    def _top_symbols(self, scores: Dict[int, int], limit: int) -> List[Tuple[int, int]]:
+        """Expand terms to live symbols and keep the best `limit`"""
+        terms = self.terms
+
+        def rank(item):
+            return (item[1], -len(terms[item[0]]))
+
+        # Terms whose symbols were all removed yield nothing, so take some
+        # spare terms and only sort everything if that was not enough
+        ranked = heapq.nlargest(limit * 2, scores.items(), key=rank)
+        results = self._expand(ranked, limit)
+        if len(results) < limit and len(ranked) < len(scores):
+            results = self._expand(sorted(scores.items(), key=rank, reverse=True), limit)
+        return results
+
+    def _expand(self, ranked: List[Tuple[int, int]], limit: int) -> List[Tuple[int, int]]:
+        names = self.slots.names
+        ids = self.slots.ids
+        terms = self.terms
+        term_slots = self.term_slots
+
+        results = []
+        for term, score in ranked:
+            text = terms[term]
+            for slot in term_slots[term]:
+                # Skip tombstones (and slots renumbered by a compaction
+                # the index has not been rebuilt for yet)
+                if slot < len(names) and names[slot] == text:
+                    results.append((score, ids[slot]))
+                    if len(results) >= limit:
+                        return results
+        return results
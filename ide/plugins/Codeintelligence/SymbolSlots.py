@@ -0,0 +1,138 @@
+# ide/plugins/Codeintelligence/SymbolSlots.py
+
+"""
+SymbolSlots - In-memory slot table for per-symbol search data
+
+Every symbol in the database occupies one slot: its lowercase name and its
+integer symbol id, stored in two parallel arrays. The symbols of a file
+are appended together, so a file owns one (or a few) contiguous slot
+ranges. Removing a file tombstones its ranges in O(symbols in that file);
+the arrays are compacted once tombstones make up a large share of them.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+def sampled_size(items: Sequence, samples: int = 512) -> int:
+    """
+    Approximate total sys.getsizeof of the items of a sequence, from an
+    evenly spaced sample (containers share many objects, so this is an
+    upper bound)
+    """
+    count = len(items)
+    if not count:
+        return 0
+    step = max(1, count // samples)
+    sample = [sys.getsizeof(items[i]) for i in range(0, count, step)]
+    return sum(sample) * count // len(sample)
+
+
+class SymbolSlots:
+    """
+    Parallel slot arrays with per-file ranges and tombstones
+
+    Readers may iterate names/ids without a lock: writers only append or
+    overwrite a slot with a tombstone, and compaction swaps in new arrays
+    instead of mutating the ones a reader may be walking.
+    """
+
+    TOMBSTONE = None
+
+    # Compact when at least this many slots are dead and they make up at
+    # least this share of the table
+    COMPACT_MIN_DEAD = 4096
+    COMPACT_RATIO = 0.25
+
+    def __init__(self):
+        self.names: List[str] = []          # lowercase name, or TOMBSTONE
+        self.ids = array('q')               # database symbol id per slot
+        self.file_ranges: Dict[str, List[Tuple[int, int]]] = {}
+        self.dead = 0
+        # Bumped whenever slots are renumbered
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.names) - self.dead
+
+    def add_file(self, file_path: str, entries: List[Tuple[str, int]]) -> int:
+        """
+        Append the symbols of a file
+
+        Args:
+            file_path: File the symbols belong to
+            entries: (name, symbol id) pairs
+
+        Returns:
+            Slot of the first entry
+        """
+        start = len(self.names)
+        if not entries:
+            return start
+        self.names.extend(name.lower() for name, _ in entries)
+        self.ids.extend(symbol_id for _, symbol_id in entries)
+        self.file_ranges.setdefault(file_path, []).append((start, len(self.names)))
+        return start
+
+    def remove_file(self, file_path: str) -> List[int]:
+        """
+        Tombstone the slots of a file
+
+        Args:
+            file_path: File to remove
+
+        Returns:
+            Symbol ids that were removed
+        """
+        ranges = self.file_ranges.pop(file_path, None)
+        if not ranges:
+            return []
+
+        names = self.names
+        removed = []
+        for start, end in ranges:
+            removed.extend(self.ids[start:end])
+            names[start:end] = [self.TOMBSTONE] * (end - start)
+            self.dead += end - start
+
+        if self.dead >= self.COMPACT_MIN_DEAD and self.dead >= len(names) * self.COMPACT_RATIO:
+            self.compact()
+        return removed
+
+    def compact(self):
+        """Drop tombstones and renumber the file ranges (O(total slots))"""
+        old_names, old_ids = self.names, self.ids
+        names: List[str] = []
+        ids = array('q')
+        file_ranges: Dict[str, List[Tuple[int, int]]] = {}
+
+        for file_path, ranges in self.file_ranges.items():
+            start = len(names)
+            for begin, end in ranges:
+                names.extend(old_names[begin:end])
+                ids.extend(old_ids[begin:end])
+            file_ranges[file_path] = [(start, len(names))]
+
+        self.names, self.ids, self.file_ranges = names, ids, file_ranges
+        self.dead = 0
+        self.version += 1
+
+    def clear(self):
+        """Remove every slot"""
+        self.names = []
+        self.ids = array('q')
+        self.file_ranges = {}
+        self.dead = 0
+        self.version += 1
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the slots"""
+        return (sys.getsizeof(self.names) + sampled_size(self.names)
+                + self.ids.itemsize * len(self.ids) + sys.getsizeof(self.file_ranges))
+
+    def live(self) -> Iterator[Tuple[str, int]]:
+        """Iterate (lowercase name, symbol id) of all live slots"""
+        for name, symbol_id in zip(self.names, self.ids):
+            if name is not None:
+                yield name, symbol_id
@@ -0,0 +1,72 @@
+# ide/plugins/Codeintelligence/WorkspaceWalker.py
+
+"""
+WorkspaceWalker - One pass over the project trees for indexing
+
+Walks each project with os.scandir, pruning ignored and hidden directories
+before descending (the FileScanner ignore rules), and yields the files
+whose extension has a parser as they are found, together with their stat
+result, so the indexer can classify them against the manifest and start
+parsing while the walk continues.
+"""
+
+import os
+from typing import Iterable, Iterator, Tuple
+
+from ide.core.FileScanner import IGNORE_DIRS
+
+
+# Larger files are generated or minified code, not worth parsing
+MAX_FILE_SIZE = 10_000_000
+
+
+def walk_source_files(roots: Iterable, extensions: Iterable[str],
+                      ignore_dirs: Iterable[str] = IGNORE_DIRS) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Stream the source files below some directories
+
+    Args:
+        roots: Project directories
+        extensions: Lowercase extensions to yield (e.g. SymbolIndexer.EXTENSIONS)
+        ignore_dirs: Directory names that are not descended into
+
+    Yields:
+        (file path, stat result); symlinked directories are not followed
+    """
+    extensions = frozenset(extensions)
+    ignore_dirs = frozenset(ignore_dirs)
+
+    for root in roots:
+        root = os.path.normpath(str(root))
+        if not os.path.isdir(root):
+            continue
+
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError as e:
+                print(f"[WorkspaceWalker] Cannot read {directory}: {e}")
+                continue
+
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in ignore_dirs:
+                            subdirs.append(entry.path)
+                        continue
+                    if os.path.splitext(name)[1].lower() not in extensions:
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if stat.st_size <= MAX_FILE_SIZE:
+                    yield entry.path, stat
+
+            # Reversed so subdirectories are popped in name order
+            stack.extend(reversed(subdirs))
@@ -14,12 +14,16 @@ from PyQt6.QtWidgets import (
     QComboBox, QMessageBox, QFileDialog, QTreeWidget, QTreeWidgetItem,
     QSplitter, QCheckBox, QSpinBox
 )
-from PyQt6.QtCore import QThread, pyqtSignal, QTimer, Qt
+from PyQt6.QtCore import QThread, pyqtSignal, QTimer, Qt, QFileSystemWatcher
 from PyQt6.QtGui import QFont
+import heapq
 import subprocess
 import re
 from datetime import datetime
 import os
+from typing import Dict, List, Tuple
+
+from ide.core.StatsPublisher import StatsPublisher
 
 
 # ============================================================================
@@ -180,48 +184,127 @@ class CronManager:
 
 
 class DataDirectoryMonitor:
-    """Monitors ~/workspace/data directory"""
+    """
+    Monitors ~/workspace/data directory
+    
+    The directory is scanned once; afterwards only a directory reported as
+    changed is read again (rescan), and the totals are adjusted by the
+    difference, so keeping the statistics current costs nothing while the
+    data directory does not change.
+    """
     
     def __init__(self, data_path: Path):
         self.data_path = data_path
+        # Directory -> ({file name: (size, mtime)}, subdirectory names)
+        self.file_stats: Dict[str, Tuple[Dict[str, Tuple[int, float]], set]] = {}
+        self.total_files = 0
+        self.total_size = 0
+        self.file_types: Dict[str, int] = {}
+    
+    def scan_directory(self) -> List[str]:
+        """
+        Scan the whole data directory and reset the counters
+        
+        Returns:
+            Every directory found (to be watched for changes)
+        """
         self.file_stats = {}
-    
-    def scan_directory(self) -> dict:
-        """Scan data directory and return statistics"""
-        if not self.data_path.exists():
-            return {
-                'total_files': 0,
-                'total_size': 0,
-                'file_types': {},
-                'recent_files': []
-            }
-        
-        files = []
-        total_size = 0
-        file_types = {}
-        
-        for file_path in self.data_path.rglob('*'):
-            if file_path.is_file():
-                size = file_path.stat().st_size
-                total_size += size
-                
-                ext = file_path.suffix or 'no extension'
-                file_types[ext] = file_types.get(ext, 0) + 1
-                
-                files.append({
-                    'path': file_path,
-                    'size': size,
-                    'modified': datetime.fromtimestamp(file_path.stat().st_mtime)
-                })
-        
-        # Sort by modified time
-        files.sort(key=lambda x: x['modified'], reverse=True)
+        self.total_files = 0
+        self.total_size = 0
+        self.file_types = {}
         
+        if not self.data_path.exists():
+            return []
+        
+        found = []
+        pending = [str(self.data_path)]
+        while pending:
+            directory = pending.pop()
+            found.append(directory)
+            added, _ = self.rescan(directory)
+            pending.extend(added)
+        return found
+    
+    def rescan(self, directory: str) -> Tuple[List[str], List[str]]:
+        """
+        Read one directory again and update the counters by the difference
+        
+        Args:
+            directory: Directory reported as changed
+            
+        Returns:
+            Tuple of (subdirectories that appeared, directories that are
+            gone, including everything below them)
+        """
+        old_files, old_dirs = self.file_stats.get(directory, ({}, set()))
+        files, dirs = {}, set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.add(entry.name)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[entry.name] = (stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            # The directory itself is gone
+            return [], self._forget(directory)
+        
+        for name, (size, _) in old_files.items():
+            self._count(name, size, -1)
+        for name, (size, _) in files.items():
+            self._count(name, size, 1)
+        self.file_stats[directory] = (files, dirs)
+        
+        removed = []
+        for name in old_dirs - dirs:
+            removed.extend(self._forget(os.path.join(directory, name)))
+        added = [os.path.join(directory, name) for name in sorted(dirs - old_dirs)]
+        return added, removed
+    
+    def _count(self, name: str, size: int, sign: int):
+        ext = os.path.splitext(name)[1] or 'no extension'
+        self.total_files += sign
+        self.total_size += sign * size
+        count = self.file_types.get(ext, 0) + sign
+        if count:
+            self.file_types[ext] = count
+        else:
+            self.file_types.pop(ext, None)
+    
+    def _forget(self, directory: str) -> List[str]:
+        """Drop a directory and everything below it from the counters"""
+        prefix = directory + os.sep
+        gone = [d for d in self.file_stats if d == directory or d.startswith(prefix)]
+        for d in gone:
+            files, _ = self.file_stats.pop(d)
+            for name, (size, _) in files.items():
+                self._count(name, size, -1)
+        return gone
+    
+    def get_statistics(self) -> dict:
+        """Statistics of the data directory from the counters"""
+        recent = heapq.nlargest(
+            10,
+            ((mtime, directory, name, size)
+             for directory, (files, _) in self.file_stats.items()
+             for name, (size, mtime) in files.items())
+        )
         return {
-            'total_files': len(files),
-            'total_size': total_size,
-            'file_types': file_types,
-            'recent_files': files[:10]
+            'total_files': self.total_files,
+            'total_size': self.total_size,
+            'file_types': dict(self.file_types),
+            'recent_files': [
+                {
+                    'path': Path(directory) / name,
+                    'size': size,
+                    'modified': datetime.fromtimestamp(mtime)
+                }
+                for mtime, directory, name, size in recent
+            ]
         }
 
 
@@ -249,6 +332,8 @@ class CronManagerPlugin:
         self.api = api
         self.cron_manager = CronManager()
         self.data_monitor = None
+        self.data_watcher = None
+        self.stats = None
         self.data_path = Path.home() / "workspace" / "data"
         self.initialized = False
         
@@ -263,8 +348,16 @@ class CronManagerPlugin:
         # Create data directory if it doesn't exist
         self.data_path.mkdir(parents=True, exist_ok=True)
         
-        # Initialize data monitor
+        # Statistics for the panel, published when they change
+        self.stats = StatsPublisher(self.get_statistics)
+        
+        # Initialize data monitor: one scan, then only changed directories
         self.data_monitor = DataDirectoryMonitor(self.data_path)
+        self.data_watcher = QFileSystemWatcher()
+        self.data_watcher.directoryChanged.connect(self.on_data_directory_changed)
+        directories = self.data_monitor.scan_directory()
+        if directories:
+            self.data_watcher.addPaths(directories)
         
         # Load crontab
         self.cron_manager.load_crontab()
@@ -284,6 +377,10 @@ class CronManagerPlugin:
         """Cleanup plugin resources"""
         print(f"[{self.PLUGIN_NAME}] Cleaning up...")
         
+        if self.data_watcher:
+            self.data_watcher.directoryChanged.disconnect(self.on_data_directory_changed)
+            self.data_watcher = None
+        
         if self.api:
             self.api.unregister_all_plugin_hooks('cron_manager')
         
@@ -294,6 +391,26 @@ class CronManagerPlugin:
         """Show cron task editor dialog"""
         dialog = CronEditorDialog(self.cron_manager, parent=self.api.ide)
         dialog.exec()
+        self.notify_stats()
+    
+    def on_data_directory_changed(self, directory: str):
+        """Update the data statistics for one changed directory"""
+        added, removed = self.data_monitor.rescan(directory)
+        if removed:
+            self.data_watcher.removePaths([d for d in removed if d in self.data_watcher.directories()])
+        if added:
+            # New directories may already hold files: count them too
+            pending = list(added)
+            while pending:
+                subdir = pending.pop()
+                self.data_watcher.addPath(subdir)
+                pending.extend(self.data_monitor.rescan(subdir)[0])
+        self.notify_stats()
+    
+    def notify_stats(self):
+        """Report that the cron tasks or the data directory changed"""
+        if self.stats:
+            self.stats.notify()
     
     def get_statistics(self) -> dict:
         """Get statistics about cron tasks and data"""
@@ -304,8 +421,7 @@ class CronManagerPlugin:
         }
         
         if self.data_monitor:
-            data_stats = self.data_monitor.scan_directory()
-            stats.update(data_stats)
+            stats.update(self.data_monitor.get_statistics())
         
         return stats
 
@@ -325,10 +441,9 @@ class CronManagerWidget(QWidget):
         
         self.init_ui()
         
-        # Update stats every 5 seconds
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_statistics)
-        self.update_timer.start(5000)
+        # Redrawn when tasks or data change, not on a timer
+        if self.plugin.stats:
+            self.plugin.stats.stats_changed.connect(self.update_statistics)
     
     def init_ui(self):
         """Initialize UI"""
@@ -392,9 +507,15 @@ class CronManagerWidget(QWidget):
         layout.addLayout(actions_layout)
         layout.addStretch()
     
-    def update_statistics(self):
-        """Update statistics display"""
-        stats = self.plugin.get_statistics()
+    def update_statistics(self, stats=None):
+        """
+        Update statistics display
+        
+        Args:
+            stats: Published statistics; the latest ones if None
+        """
+        if stats is None:
+            stats = self.plugin.stats.current() if self.plugin.stats else self.plugin.get_statistics()
         
         # Cron stats
         stats_text = (
@@ -425,7 +546,7 @@ class CronManagerWidget(QWidget):
         """Reload crontab"""
         if self.plugin.cron_manager.load_crontab():
             self.plugin.api.show_status_message("Crontab reloaded", 2000)
-            self.update_statistics()
+            self.plugin.notify_stats()
         else:
             self.plugin.api.show_status_message("Failed to reload crontab", 3000)
     
@@ -449,7 +570,7 @@ class CronManagerWidget(QWidget):
         """Show quick task templates"""
         dialog = TaskTemplatesDialog(self.plugin.cron_manager, parent=self)
         if dialog.exec():
-            self.update_statistics()
+            self.plugin.notify_stats()
 
 
 # ============================================================================
@@ -27,6 +27,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
 
+from ide.core.StatsPublisher import StatsPublisher
+
 
 # ============================================================================
 # Plugin Class
@@ -73,7 +75,9 @@ class ExamplePlugin:
         self.file_count = 0
         self.save_count = 0
         self.recent_files = []
+        self.active_projects = None  # Latest list from on_projects_changed
         self.widget = None  # Will hold reference to UI widget
+        self.stats = None  # Publishes get_workspace_stats() when it changes
         
         # Settings (will be persisted)
         self.settings = {
@@ -103,6 +107,10 @@ class ExamplePlugin:
         # Load saved settings (if any)
         self._load_settings()
         
+        # Statistics are pushed to the UI when they change instead of
+        # being polled: call self.stats.notify() after changing a counter
+        self.stats = StatsPublisher(self.get_workspace_stats)
+        
         # Register event hooks
         # self.api.register_hook('on_file_saved', self.on_file_saved, 
                               # plugin_id='example_plugin')
@@ -112,6 +120,8 @@ class ExamplePlugin:
                               # plugin_id='example_plugin')
         # self.api.register_hook('on_editor_focus', self.on_editor_focus, 
                               # plugin_id='example_plugin')
+        self.api.register_hook('on_projects_changed', self.on_projects_changed,
+                               plugin_id='example_plugin')
         
         # Register keyboard shortcuts
         self.api.register_keyboard_shortcut(
@@ -177,9 +187,8 @@ class ExamplePlugin:
         self.save_count += 1
         self._log_event(f"File saved: {Path(file_path).name}")
         
-        # Update UI if visible
-        if self.widget:
-            self.widget.update_stats()
+        # Update UI (rate limited)
+        self.stats.notify()
     
     def on_file_opened(self, file_path: str):
         """
@@ -197,9 +206,9 @@ class ExamplePlugin:
         
         self._log_event(f"File opened: {Path(file_path).name}")
         
-        # Update UI if visible
+        # Update UI (rate limited)
+        self.stats.notify()
         if self.widget:
-            self.widget.update_stats()
             self.widget.update_recent_files()
     
     def on_file_closed(self, file_path: str):
@@ -221,6 +230,18 @@ class ExamplePlugin:
         if hasattr(editor, 'file_path') and editor.file_path:
             self._log_event(f"Editor focus: {Path(editor.file_path).name}")
     
+    def on_projects_changed(self, active_projects):
+        """
+        Called when projects are toggled active or inactive
+        
+        Args:
+            active_projects: Paths of the active projects
+        """
+        self.active_projects = list(active_projects)
+        self.stats.notify()
+        if self.widget:
+            self.widget.update_projects()
+    
     # ========================================================================
     # Actions (Keyboard Shortcuts)
     # ========================================================================
@@ -269,6 +290,8 @@ class ExamplePlugin:
     
     def get_active_projects(self):
         """Get list of active projects"""
+        if self.active_projects is not None:
+            return self.active_projects
         settings = self.api.get_settings()
         return settings.get('active_projects', [])
     
@@ -303,10 +326,9 @@ class ExamplePluginWidget(QWidget):
         
         self.init_ui()
         
-        # Auto-update timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_stats)
-        self.update_timer.start(2000)  # Update every 2 seconds
+        # Redrawn when the plugin publishes new statistics, not on a timer
+        if self.plugin.stats:
+            self.plugin.stats.stats_changed.connect(self.update_stats)
     
     def init_ui(self):
         """Initialize UI"""
@@ -658,9 +680,15 @@ class ExamplePluginWidget(QWidget):
     # Update Methods
     # ========================================================================
     
-    def update_stats(self):
-        """Update statistics display"""
-        stats = self.plugin.get_workspace_stats()
+    def update_stats(self, stats=None):
+        """
+        Update statistics display
+        
+        Args:
+            stats: Published statistics; collected now if None
+        """
+        if stats is None:
+            stats = self.plugin.get_workspace_stats()
         
         stats_html = f"""
 <b>Workspace Activity:</b><br>
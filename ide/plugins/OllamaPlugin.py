@@ -105,11 +105,17 @@ class OllamaPlugin(SettingsProvider):
         
         # Components
         self.widget = None
-        self.context_builder = OllamaContextBuilder()
+        self.context_builder = OllamaContextBuilder(self._get_dependents)
         
         # State
         self.panel_visible = False
         
+        # Local copies of settings, refreshed by _on_settings_changed
+        self.ollama_timeout = 240
+        self.context_level = 'smart'
+        self.show_context_dialog = True
+        self._settings_handle = None
+        
         print(f"[{self.PLUGIN_NAME}] Instance created")
     
     def initialize(self):
@@ -128,6 +134,13 @@ class OllamaPlugin(SettingsProvider):
         else:
             print(f"[{self.PLUGIN_NAME}] WARNING: Cannot register settings (API doesn't support it)")
         
+        # Keep local settings fields in sync
+        self._settings_handle = self.api.subscribe_settings(
+            self._on_settings_changed,
+            keys=[d.key for d in self.SETTINGS_DESCRIPTORS]
+        )
+        self._on_settings_changed(self.api.get_settings(), None)
+        
         # Register keyboard shortcuts
         self.api.register_keyboard_shortcut(
             'Ctrl+Shift+O',
@@ -169,6 +182,8 @@ class OllamaPlugin(SettingsProvider):
         
         if self.api:
             self.api.unregister_all_plugin_hooks('ollama_plugin')
+            self.api.unsubscribe_settings(self._settings_handle)
+            self._settings_handle = None
         
         self.initialized = False
         print(f"[{self.PLUGIN_NAME}] Cleaned up")
@@ -177,21 +192,29 @@ class OllamaPlugin(SettingsProvider):
     # Settings Access Helpers
     # ========================================================================
     
+    def _on_settings_changed(self, snapshot, changed):
+        """Refresh local settings fields from a settings snapshot"""
+        self.ollama_timeout = snapshot.get('ollama_timeout', 240)
+        self.context_level = snapshot.get('ollama_context_level', 'smart')
+        self.show_context_dialog = snapshot.get('ollama_show_context_dialog', True)
+    
     def get_ollama_timeout(self) -> int:
         """Get Ollama timeout from settings"""
-        settings = self.api.get_settings()
-        return settings.get('ollama_timeout', 240)
+        return self.ollama_timeout
     
     def get_context_level(self) -> str:
         """Get context level from settings"""
-        settings = self.api.get_settings()
-        return settings.get('ollama_context_level', 'smart')
+        return self.context_level
     
     def should_show_context_dialog(self) -> bool:
         """Check if context dialog should be shown"""
-        settings = self.api.get_settings()
-        return settings.get('ollama_show_context_dialog', True)
-    
+        return self.show_context_dialog
+
+    def _get_dependents(self, file_path: str) -> list:
+        """Files importing file_path, if Code Intelligence is loaded"""
+        lookup = self.api.get_cache('code_intelligence.dependents')
+        return lookup(file_path) if lookup else []
+
     # ========================================================================
     # Core AI Actions
     # ========================================================================
@@ -22,9 +22,11 @@ This builds intelligent context from code editors
 
 import ast
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from PyQt6.QtGui import QTextCursor
 
+from ide.core.ParseCache import get_parse_cache
+
 
 class OllamaContextBuilder:
     """
@@ -34,7 +36,7 @@ class OllamaContextBuilder:
     - File information (path, language)
     - Selection details (line numbers, size)
     - Function/class context (for Python)
-    - Imports and dependencies
+    - Imports and dependencies, and the files importing this one
     """
     
     # Language detection by file extension
@@ -66,8 +68,14 @@ class OllamaContextBuilder:
         '.yml': 'YAML',
     }
     
-    def __init__(self):
+    def __init__(self, dependents_lookup: Optional[Callable[[str], List[str]]] = None):
+        """
+        Args:
+            dependents_lookup: Returns the files importing a file, e.g. the
+                Code Intelligence import graph; None leaves it out
+        """
         self.context_levels = ['minimal', 'basic', 'smart']
+        self.dependents_lookup = dependents_lookup
     
     def build_context(self, editor, level='smart') -> Dict:
         """
@@ -97,6 +105,10 @@ class OllamaContextBuilder:
         if level == 'smart' and context['language'] == 'Python':
             context['python_context'] = self.get_python_context(editor, cursor)
         
+        # Files that may break when this one changes
+        if level == 'smart' and editor.file_path and self.dependents_lookup:
+            context['imported_by'] = self.dependents_lookup(editor.file_path)
+        
         return context
     
     def detect_language(self, editor) -> str:
@@ -145,8 +157,12 @@ class OllamaContextBuilder:
         }
         
         try:
-            source_code = editor.toPlainText()
-            tree = ast.parse(source_code)
+            # Shared with the outline and folding, so an unchanged buffer
+            # is never parsed twice
+            result = get_parse_cache().for_editor(editor)
+            tree = result.tree
+            if tree is None:
+                raise SyntaxError(result.syntax_error)
             
             # Get imports
             context['imports'] = self.extract_imports(tree)
@@ -289,6 +305,13 @@ class OllamaContextBuilder:
             if functions:
                 lines.append(f"Functions in file: {len(functions)}")
         
+        # Reverse dependencies (show first 5)
+        imported_by = context.get('imported_by', [])
+        if imported_by:
+            lines.append(f"Imported by: {', '.join(Path(p).name for p in imported_by[:5])}")
+            if len(imported_by) > 5:
+                lines.append(f"  ... and {len(imported_by) - 5} more")
+        
         lines.append("")  # Blank line before code
         
         # Add the actual code